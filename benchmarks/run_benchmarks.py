@@ -0,0 +1,293 @@
+"""Measures the throughput (tokens per second) and peak memory of the main code paths of spacy_conll: the
+ConllFormatter, reading CoNLL-U into spaCy, and parsing text to CoNLL-U (in Python and through the CLI). All data is
+synthetic, so no model needs to be downloaded. Results can be saved as a baseline, and later runs can be compared
+against it to catch performance regressions.
+
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --output baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --baseline baseline.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import spacy
+from spacy.tokens import Doc
+from spacy.vocab import Vocab
+from spacy_conll import ConllFormatter, __version__, init_parser
+from spacy_conll.cli.parse import create_argument_parser, parse
+from spacy_conll.parser import ConllParser
+from spacy_conll.utils import PD_AVAILABLE
+
+
+# (word, lemma, UPOS, XPOS, morphological features) of the synthetic vocabulary
+WORDS = [
+    ("the", "the", "DET", "DT", "Definite=Def|PronType=Art"),
+    ("a", "a", "DET", "DT", "Definite=Ind|PronType=Art"),
+    ("cat", "cat", "NOUN", "NN", "Number=Sing"),
+    ("dogs", "dog", "NOUN", "NNS", "Number=Plur"),
+    ("house", "house", "NOUN", "NN", "Number=Sing"),
+    ("sees", "see", "VERB", "VBZ", "Mood=Ind|Number=Sing|Person=3|Tense=Pres|VerbForm=Fin"),
+    ("walked", "walk", "VERB", "VBD", "Mood=Ind|Tense=Past|VerbForm=Fin"),
+    ("is", "be", "AUX", "VBZ", "Mood=Ind|Number=Sing|Person=3|Tense=Pres|VerbForm=Fin"),
+    ("quickly", "quickly", "ADV", "RB", ""),
+    ("big", "big", "ADJ", "JJ", "Degree=Pos"),
+    ("in", "in", "ADP", "IN", ""),
+    ("and", "and", "CCONJ", "CC", ""),
+    ("she", "she", "PRON", "PRP", "Case=Nom|Gender=Fem|Number=Sing|Person=3|PronType=Prs"),
+    ("Amsterdam", "Amsterdam", "PROPN", "NNP", "Number=Sing"),
+    ("3", "3", "NUM", "CD", "NumType=Card"),
+]
+DEPS = ["nsubj", "obj", "det", "amod", "advmod", "case", "obl", "cc", "conj"]
+CONVERSION_MAPS = {"UPOS": {"NOUN": "N", "VERB": "V", "DET": "D"}, "DEPREL": {"nsubj": "subj", "obj": "dobj"}}
+# Tokens per synthetic Doc
+DOC_SIZE = 1_000
+
+
+def make_synthetic_docs(vocab: Vocab, n_tokens: int, seed: int = 42) -> List[Doc]:
+    """Creates annotated Docs of `DOC_SIZE` tokens (the last one may be smaller) with sentences of 5 to 30 tokens.
+    Every sentence is a flat tree whose root is its first token, which is enough for the formatter.
+    :param vocab: the vocab for the Docs
+    :param n_tokens: total number of tokens
+    :param seed: seed for the random generator
+    :return: a list of Docs
+    """
+    rng = random.Random(seed)
+    docs = []
+    for doc_start in range(0, n_tokens, DOC_SIZE):
+        doc_size = min(DOC_SIZE, n_tokens - doc_start)
+        words, lemmas, pos, tags, morphs, heads, deps, sent_starts = [], [], [], [], [], [], [], []
+        while len(words) < doc_size:
+            sent_size = min(rng.randint(5, 30), doc_size - len(words))
+            sent_start = len(words)
+            for idx in range(sent_size):
+                word, lemma, upos, xpos, morph = rng.choice(WORDS)
+                words.append(word)
+                lemmas.append(lemma)
+                pos.append(upos)
+                tags.append(xpos)
+                morphs.append(morph)
+                heads.append(sent_start)
+                deps.append("ROOT" if idx == 0 else rng.choice(DEPS))
+                sent_starts.append(idx == 0)
+
+        spaces = [rng.random() > 0.1 for _ in words]
+        docs.append(
+            Doc(
+                vocab,
+                words=words,
+                spaces=spaces,
+                lemmas=lemmas,
+                pos=pos,
+                tags=tags,
+                morphs=morphs,
+                heads=heads,
+                deps=deps,
+                sent_starts=sent_starts,
+            )
+        )
+
+    return docs
+
+
+def make_synthetic_conll(docs: List[Doc]) -> str:
+    """Creates a CoNLL-U string (with headers) of the given Docs.
+    :param docs: annotated Docs
+    :return: the CoNLL-U string
+    """
+    formatter = ConllFormatter(include_headers=True, disable_pandas=True)
+    return "\n".join(formatter(doc)._.conll_str for doc in docs)
+
+
+def make_synthetic_text(docs: List[Doc]) -> str:
+    """Creates a text with one sentence per line of the given Docs.
+    :param docs: Docs with sentence boundaries
+    :return: the text
+    """
+    return "\n".join(sent.text for doc in docs for sent in doc.sents)
+
+
+def get_cases(n_tokens: int, seed: int, tmpdir: Path) -> Dict[str, Callable[[], None]]:
+    """Prepares the data of all benchmarks for a given number of tokens.
+    :param n_tokens: the number of tokens to process in every benchmark
+    :param seed: seed for the random generator
+    :param tmpdir: directory for the input and output files of the CLI benchmark
+    :return: a dictionary of the name of every benchmark and a function that runs it once
+    """
+    docs = make_synthetic_docs(Vocab(), n_tokens, seed=seed)
+    conll_text = make_synthetic_conll(docs)
+    conll_lines = conll_text.splitlines()
+    text = make_synthetic_text(docs)
+    input_file = tmpdir.joinpath(f"input-{n_tokens}.txt")
+    input_file.write_text(text, encoding="utf-8")
+
+    cases = {}
+    for pandas in ([False, True] if PD_AVAILABLE else [False]):
+        for headers in (False, True):
+            for maps in (False, True):
+                formatter = ConllFormatter(
+                    include_headers=headers,
+                    disable_pandas=not pandas,
+                    conversion_maps=CONVERSION_MAPS if maps else None,
+                )
+                name = f"formatter[pandas={pandas},headers={headers},maps={maps}]"
+                cases[name] = lambda formatter=formatter: [formatter(doc) for doc in docs]
+
+    formatter = ConllFormatter(disable_pandas=True, levels=["doc"], representations=["conll_str"])
+    cases["formatter[levels=doc,representations=conll_str]"] = lambda: [formatter(doc) for doc in docs]
+    fields_formatter = ConllFormatter(disable_pandas=True, fields=["FORM", "UPOS", "HEAD", "DEPREL"])
+    cases["formatter[fields=FORM,UPOS,HEAD,DEPREL]"] = lambda: [fields_formatter(doc) for doc in docs]
+
+    reader = ConllParser(init_parser("blank:en", "spacy", disable_pandas=True))
+    cases["reader[parse_conll_text_as_spacy]"] = lambda: reader.parse_conll_text_as_spacy(conll_text)
+    cases["reader[iter_conll_lines_as_spacy]"] = lambda: list(reader.iter_conll_lines_as_spacy(conll_lines))
+
+    for headers in (False, True):
+        parser = ConllParser(
+            init_parser("blank:en", "spacy", disable_sbd=True, disable_pandas=True, include_headers=headers)
+        )
+        cases[f"parse_text_as_conll[headers={headers}]"] = lambda parser=parser: parser.parse_text_as_conll(text)
+
+    output_file = tmpdir.joinpath(f"output-{n_tokens}.conllu")
+    cli_argv = ["blank:en", "spacy", "--input_file", str(input_file), "--output_file", str(output_file)]
+    cli_argv += ["--input_encoding", "utf-8", "--output_encoding", "utf-8", "--disable_sbd", "--include_headers"]
+    cli_args = create_argument_parser().parse_args(cli_argv)
+    # Includes loading the (blank) pipeline, like a real CLI call
+    cases["cli[input_file]"] = lambda: parse(cli_args)
+
+    return cases
+
+
+def measure(run: Callable[[], None], repeat: int, memory: bool) -> Tuple[float, Optional[float]]:
+    """Runs a benchmark.
+    :param run: function that runs the benchmark once
+    :param repeat: number of timed runs, of which the fastest is used
+    :param memory: whether to measure the peak memory in an additional run. tracemalloc slows down the code, so this
+     run is not timed
+    :return: a tuple of the fastest time in seconds and the peak memory in MiB (or None)
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    peak_memory = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        run()
+        peak_memory = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+    return min(timings), peak_memory
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Compares results with a baseline.
+    :param results: the results of this run
+    :param baseline: the results of an earlier run
+    :param tolerance: the fraction by which the throughput may be lower, and the peak memory higher, than the baseline
+    :return: a list of descriptions of regressions
+    """
+    regressions = []
+    for name, result in results["results"].items():
+        if name not in baseline["results"]:
+            continue
+
+        base = baseline["results"][name]
+        if result["tokens_per_sec"] < base["tokens_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['tokens_per_sec']:,.0f} tokens/sec, baseline {base['tokens_per_sec']:,.0f}"
+            )
+        if (
+            result.get("peak_memory_mib") is not None
+            and base.get("peak_memory_mib") is not None
+            and result["peak_memory_mib"] > base["peak_memory_mib"] * (1 + tolerance)
+        ):
+            regressions.append(
+                f"{name}: peak memory {result['peak_memory_mib']:,.1f} MiB, baseline {base['peak_memory_mib']:,.1f} MiB"
+            )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    cparser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Benchmark the throughput and peak memory of spacy_conll on synthetic data.",
+    )
+    cparser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[1_000, 100_000],
+        help="Numbers of tokens to benchmark with, e.g. '1000 100000 10000000'.",
+    )
+    cparser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per benchmark.")
+    cparser.add_argument("--cases", default=None, help="Only run benchmarks whose name contains this string.")
+    cparser.add_argument("--no_memory", action="store_true", help="Do not measure the peak memory.")
+    cparser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic data.")
+    cparser.add_argument("--output", default=None, help="Path to write the results to as JSON, e.g. as a baseline.")
+    cparser.add_argument("--baseline", default=None, help="Path to earlier results to compare with.")
+    cparser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Fraction by which results may be worse than the baseline before they count as a regression.",
+    )
+    args = cparser.parse_args(argv)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "spacy": spacy.__version__,
+            "spacy_conll": __version__,
+        },
+        "results": {},
+    }
+
+    print(f"{'benchmark':<60} {'tokens':>10} {'tokens/sec':>14} {'peak MiB':>10}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_tokens in args.sizes:
+            for name, run in get_cases(n_tokens, args.seed, Path(tmpdir)).items():
+                if args.cases and args.cases not in name:
+                    continue
+
+                duration, peak_memory = measure(run, args.repeat, memory=not args.no_memory)
+                result = {"n_tokens": n_tokens, "tokens_per_sec": n_tokens / duration, "peak_memory_mib": peak_memory}
+                results["results"][f"{name}@{n_tokens}"] = result
+                peak_str = f"{peak_memory:,.1f}" if peak_memory is not None else "-"
+                print(f"{name:<60} {n_tokens:>10,} {result['tokens_per_sec']:>14,.0f} {peak_str:>10}", flush=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        n_compared = len(results["results"].keys() & baseline["results"].keys())
+        print(f"\nCompared {n_compared} of {len(results['results'])} benchmarks with the baseline")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions compared to the baseline:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+
+        print("No regressions compared to the baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Tuple, Union
+
+from spacy_conll.parser import ConllParser
+
+
+@dataclass(eq=False, repr=False)
+class AsyncConllParser:
+    """Asyncio front-end for a ConllParser. Concurrent calls to `parse` are put in a bounded queue and coalesced into
+    micro-batches, which are parsed together with :py:meth:`ConllParser.parse_texts_as_conll` on a worker thread so
+    that the event loop is never blocked. A batch is parsed as soon as it contains 'max_batch_size' texts, or when
+    'max_wait' seconds have passed since its first text was queued. When the queue is full, `parse` waits until
+    there is room again (backpressure). Use it as an async context manager, or call `aclose` when done.
+
+    Constructor arguments:
+    :param parser: the ConllParser to parse texts with
+    :param max_batch_size: maximal number of texts in a batch
+    :param max_wait: maximal time in seconds to wait for more texts before a batch is parsed
+    :param max_queue_size: maximal number of texts that are waiting to be parsed
+    :param no_force_counting: see :py:meth:`ConllParser.parse_texts_as_conll`
+    :param no_split_on_newline: see :py:meth:`ConllParser.parse_texts_as_conll`
+    """
+
+    parser: ConllParser
+    max_batch_size: int = 32
+    max_wait: float = 0.005
+    max_queue_size: int = 1024
+    no_force_counting: bool = False
+    no_split_on_newline: bool = False
+
+    def __post_init__(self):
+        if self.max_batch_size < 1:
+            raise ValueError("'max_batch_size' must be at least 1")
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spacy_conll")
+        self._queue = None
+        self._batcher = None
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(parser={self.parser}, max_batch_size={self.max_batch_size},"
+            f" max_wait={self.max_wait}, max_queue_size={self.max_queue_size})"
+        )
+
+    async def __aenter__(self) -> "AsyncConllParser":
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def parse(self, text: str) -> str:
+        """Parses a text and returns its CoNLL output, like :py:meth:`ConllParser.parse_text_as_conll`.
+        :param text: input text (string) to process
+        :return: the CoNLL output of the text
+        """
+        if self._closed:
+            raise RuntimeError(f"Cannot parse with a closed {self.__class__.__name__}")
+
+        if self._batcher is None:
+            # The queue and the task must be created in the running event loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._batcher = asyncio.ensure_future(self._run_batches())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def iter_parse(self, texts: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+        """Parses texts concurrently and yields their CoNLL output in the order of 'texts'. At most
+        'max_queue_size' texts are in flight at the same time.
+        :param texts: an iterable or async iterable of input texts (strings) to process
+        """
+        pending = deque()
+        if isinstance(texts, AsyncIterable):
+            async for text in texts:
+                pending.append(asyncio.ensure_future(self.parse(text)))
+                if len(pending) >= self.max_queue_size:
+                    yield await pending.popleft()
+        else:
+            for text in texts:
+                pending.append(asyncio.ensure_future(self.parse(text)))
+                if len(pending) >= self.max_queue_size:
+                    yield await pending.popleft()
+
+        while pending:
+            yield await pending.popleft()
+
+    async def aclose(self):
+        """Stops the batching task and the worker thread. Texts that are still queued are cancelled. Waits until a
+        batch that is being parsed is finished, without blocking the event loop."""
+        if self._closed:
+            return
+
+        self._closed = True
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                future.cancel()
+
+        # Shutting down waits for the worker thread, so it is done in another thread
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch(loop)
+            # Requests whose caller has given up do not need to be parsed
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            parse_texts = partial(
+                self.parser.parse_texts_as_conll,
+                [text for text, _ in batch],
+                no_force_counting=self.no_force_counting,
+                no_split_on_newline=self.no_split_on_newline,
+            )
+            try:
+                results = await loop.run_in_executor(self._executor, parse_texts)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+
+    async def _collect_batch(self, loop: asyncio.AbstractEventLoop) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+
+        return batch
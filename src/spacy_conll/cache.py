@@ -0,0 +1,110 @@
+import json
+import sqlite3
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from os import PathLike
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+
+# A cached value is the list of sentences of a line, as tuples of the sentence text and its CoNLL-U lines
+CachedSents = List[Tuple[str, str]]
+
+
+@dataclass(eq=False, repr=False)
+class ConllCache:
+    """Cache for the CoNLL-U output of input lines, so that repeated lines do not need to be parsed again. It consists
+    of an in-memory LRU tier and an optional on-disk tier in an SQLite database, which persists across runs. Keys are
+    created by the ConllParser and include the model, the pipeline configuration and the text of a line, so that a
+    single database can safely be shared between different pipelines.
+
+    Constructor arguments:
+    :param maxsize: maximal number of lines to keep in memory. When the cache is full, the least recently used line is
+     removed from memory (but not from the database). 0 disables the in-memory tier
+    :param path: path to an SQLite database to use as on-disk tier. It is created if it does not exist yet
+    :param commit_every: number of new entries after which they are committed to the database
+    """
+
+    maxsize: int = 100_000
+    path: Optional[Union[PathLike, Path, str]] = None
+    commit_every: int = 1_000
+    hits: int = field(init=False, default=0)
+    misses: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self._lru = OrderedDict()
+        self._n_uncommitted = 0
+        self._db = None
+        if self.path is not None:
+            self.path = Path(self.path)
+            self._db = sqlite3.connect(self.path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS conll_cache (key BLOB PRIMARY KEY, sents TEXT NOT NULL)")
+            self._db.commit()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(maxsize={self.maxsize}, path={self.path})"
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def __enter__(self) -> "ConllCache":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get(self, key: bytes) -> Optional[CachedSents]:
+        """Gets the cached sentences of a line.
+        :param key: the key of the line
+        :return: the cached sentences, or None if the line is not in the cache
+        """
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return self._lru[key]
+
+        if self._db is not None:
+            row = self._db.execute("SELECT sents FROM conll_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                sents = [tuple(sent) for sent in json.loads(row[0])]
+                self._set_lru(key, sents)
+                self.hits += 1
+                return sents
+
+        self.misses += 1
+        return None
+
+    def set(self, key: bytes, sents: CachedSents):
+        """Adds the sentences of a line to the cache.
+        :param key: the key of the line
+        :param sents: the sentences of the line, as tuples of the sentence text and its CoNLL-U lines
+        """
+        self._set_lru(key, sents)
+
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO conll_cache VALUES (?, ?)", (key, json.dumps(sents)))
+            self._n_uncommitted += 1
+            if self._n_uncommitted >= self.commit_every:
+                self.commit()
+
+    def commit(self):
+        """Writes new entries to the database, if any."""
+        if self._db is not None and self._n_uncommitted:
+            self._db.commit()
+            self._n_uncommitted = 0
+
+    def close(self):
+        """Commits new entries and closes the database, if any."""
+        if self._db is not None:
+            self.commit()
+            self._db.close()
+            self._db = None
+
+    def _set_lru(self, key: bytes, sents: CachedSents):
+        if self.maxsize <= 0:
+            return
+
+        self._lru[key] = sents
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
@@ -0,0 +1,87 @@
+from argparse import Namespace
+from locale import getpreferredencoding
+
+from spacy_conll.convert import convert_conll_file_to_docbin
+
+
+def convert(args: Namespace):
+    group_by = int(args.group_by) if args.group_by.isdigit() else args.group_by
+    n_docs = convert_conll_file_to_docbin(
+        args.input_file,
+        args.output_file,
+        input_encoding=args.input_encoding,
+        group_by=group_by,
+        n_process=args.n_process,
+        n_shards=args.n_shards,
+        merge_shards=not args.no_merge,
+    )
+
+    if args.verbose:
+        print(f"Wrote {n_docs:,} Docs to {args.output_file}")
+
+
+def main():
+    import argparse
+
+    cparser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Convert a CoNLL-U file into a spaCy DocBin. The file is split into shards at sentence boundaries,"
+        " which are converted in parallel. The CoNLL-U MISC and DEPS fields and the sentence metadata are stored in the"
+        " user data of the Docs.",
+    )
+
+    cparser.add_argument("input_file", help="Path to the CoNLL-U file to convert.")
+    cparser.add_argument(
+        "output_file",
+        help="Path to write the DocBin (.spacy) to or, with 'no_merge', the directory to write the DocBins of the"
+        " shards to.",
+    )
+    cparser.add_argument(
+        "-a",
+        "--input_encoding",
+        default=getpreferredencoding(),
+        help="Encoding of the input file. Must encode a newline as a single byte, like UTF-8. Default value is system"
+        " default.",
+    )
+    cparser.add_argument(
+        "-g",
+        "--group_by",
+        default="sentence",
+        help="How to group sentences into Docs: 'sentence' (one Doc per sentence), 'newdoc' (a new Doc at every"
+        " '# newdoc' comment) or a positive integer (a Doc per that many sentences).",
+    )
+    cparser.add_argument(
+        "-j",
+        "--n_process",
+        type=int,
+        default=1,
+        help="Number of processes to use. -1 will use as many cores as available.",
+    )
+    cparser.add_argument(
+        "--n_shards",
+        type=int,
+        default=None,
+        help="Number of shards to split the input file into. By default, one per process.",
+    )
+    cparser.add_argument(
+        "--no_merge",
+        default=False,
+        action="store_true",
+        help="Write the DocBin of every shard to the directory 'output_file' (as numbered .spacy files) instead of"
+        " merging them into a single file, which needs all Docs in memory at once. spaCy's training can read such a"
+        " directory directly.",
+    )
+    cparser.add_argument(
+        "-v",
+        "--verbose",
+        default=False,
+        action="store_true",
+        help="Whether to print the number of converted Docs.",
+    )
+
+    cargs = cparser.parse_args()
+    convert(cargs)
+
+
+if __name__ == "__main__":
+    main()
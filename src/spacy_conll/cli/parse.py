@@ -1,54 +1,232 @@
-from argparse import Namespace
+import os
+from argparse import ArgumentParser, Namespace
+from contextlib import nullcontext
+from glob import glob
 from locale import getpreferredencoding
 from pathlib import Path
-from sys import stdout
+from sys import stderr, stdout
+from typing import Any, Dict, List, Optional, Tuple
 
 from spacy_conll import init_parser
+from spacy_conll.cache import ConllCache
+from spacy_conll.compression import open_file, open_file_atomic, strip_compression_suffix
+from spacy_conll.formatter import CONLL_FIELD_NAMES
 from spacy_conll.parser import ConllParser
+from spacy_conll.profiling import STAGES, ConllStats, no_measure
+from spacy_conll.server import DEFAULT_SERVER_TIMEOUT, PARSE_OPTIONS, parse_with_server
 
 
 def parse(args: Namespace):
-    if not args.input_str and not args.input_file:
-        raise ValueError("'input_str' or 'input_file' must be given")
-
-    nlp = init_parser(
-        args.model_or_lang,
-        args.parser,
-        is_tokenized=args.is_tokenized,
-        disable_sbd=args.disable_sbd,
-        disable_pandas=True,
-        include_headers=args.include_headers,
-    )
-
-    parser = ConllParser(nlp, is_tokenized=args.is_tokenized)
-
-    if args.input_file:
-        conll_str = parser.parse_file_as_conll(
-            args.input_file,
-            args.input_encoding,
-            n_process=args.n_process,
-            no_force_counting=args.no_force_counting,
-            ignore_pipe_errors=args.ignore_pipe_errors,
-            no_split_on_newline=args.no_split_on_newline,
-        )
+    batch_mode = bool(args.inputs or args.manifest)
+    if not args.input_str and not args.input_file and not batch_mode:
+        raise ValueError("'input_str', 'input_file', 'inputs' or 'manifest' must be given")
+
+    init_kwargs = {
+        "model_or_lang": args.model_or_lang,
+        "parser": args.parser,
+        "is_tokenized": args.is_tokenized,
+        "disable_sbd": args.disable_sbd,
+        "disable_pandas": True,
+        "include_headers": args.include_headers,
+        # Only the CoNLL strings of the sentences are written
+        "levels": ["sent"],
+        "representations": ["conll_str"],
+        "fields": args.fields,
+        "torch_threads": args.torch_threads,
+        "torch_interop_threads": args.torch_interop_threads,
+    }
+    parse_kwargs = {
+        "n_process": args.n_process,
+        "no_force_counting": args.no_force_counting,
+        "ignore_pipe_errors": args.ignore_pipe_errors,
+        "no_split_on_newline": args.no_split_on_newline,
+        "batch_size": args.batch_size,
+        "bucket_window": args.bucket_window,
+        "backend": args.backend,
+    }
+
+    if batch_mode:
+        parse_batch(args, init_kwargs, parse_kwargs)
+        return
+
+    conll_sents = None
+    if args.server:
+        if args.input_file:
+            with open_file(args.input_file, encoding=args.input_encoding) as fhin:
+                text = fhin.read()
+        else:
+            text = args.input_str
+        options = {option: getattr(args, option) for option in PARSE_OPTIONS}
+        conll = parse_with_server(args.server, text, init_kwargs, options, timeout=args.server_timeout)
+        if conll is not None:
+            conll_sents = [conll]
+        elif args.verbose:
+            print(f"No server responded at {args.server}. Parsing in-process instead.", file=stderr)
+
+    cache = None
+    stats = None
+    if conll_sents is None:
+        if args.cache_size or args.cache_file:
+            cache = ConllCache(maxsize=args.cache_size, path=args.cache_file)
+
+        stats = create_stats(args)
+        parser = ConllParser(init_parser(**init_kwargs), cache=cache, init_kwargs=init_kwargs, stats=stats)
+        if args.input_file:
+            # The input file is read line by line, and every sentence is written as soon as it has been parsed
+            # so that we never need to keep the whole corpus in memory
+            conll_sents = parser.iter_file_as_conll(args.input_file, args.input_encoding, **parse_kwargs)
+        else:
+            conll_sents = parser.iter_text_as_conll(args.input_str, **parse_kwargs)
+
+    measure = stats.measure if stats is not None else no_measure
+    if args.output_file is None:
+        output = nullcontext(stdout)
+    elif args.atomic_output:
+        output = open_file_atomic(args.output_file, args.output_encoding)
     else:
-        conll_str = parser.parse_text_as_conll(
-            args.input_str,
-            n_process=args.n_process,
-            no_force_counting=args.no_force_counting,
-            ignore_pipe_errors=args.ignore_pipe_errors,
-            no_split_on_newline=args.no_split_on_newline,
-        )
+        output = open_file(args.output_file, "w", args.output_encoding)
+    try:
+        with output as fhout:
+            for sent_idx, conll_str in enumerate(conll_sents):
+                with measure("write"):
+                    # Sentences are separated by an empty line
+                    if sent_idx > 0:
+                        conll_str = "\n" + conll_str
 
-    fhout = Path(args.output_file).open("w", encoding=args.output_encoding) if args.output_file is not None else stdout
-    fhout.write(conll_str)
+                    fhout.write(conll_str)
 
-    if fhout is not stdout and args.verbose:
-        # end='' to avoid adding yet another newline
-        print(conll_str, end="")
+                    if fhout is not stdout and args.verbose:
+                        # end='' to avoid adding yet another newline
+                        print(conll_str, end="")
+    finally:
+        if cache is not None:
+            cache.close()
 
+    if stats is not None:
+        print_stats(stats)
 
-def main():
+
+def parse_batch(args: Namespace, init_kwargs: Dict[str, Any], parse_kwargs: Dict[str, Any]):
+    """Parses all files of 'args.inputs' and 'args.manifest' with a single pipeline (or a single pool of workers) and
+    writes their output to a mirrored tree in 'args.output_dir'. Files whose output is up to date are skipped.
+    :param args: the parsed command-line arguments
+    :param init_kwargs: keyword arguments for `init_parser`
+    :param parse_kwargs: keyword arguments for `ConllParser.parse_files_as_conll`
+    """
+    if not args.output_dir:
+        raise ValueError("'output_dir' must be given together with 'inputs' or 'manifest'")
+
+    files = []
+    output_files = set()
+    n_skipped = 0
+    for input_file, rel_path in find_input_files(args.inputs or [], args.input_pattern, args.manifest):
+        # The output of 'corpus.txt.gz' is 'corpus.conllu' (or 'corpus.conllu.gz' with output_suffix='.conllu.gz')
+        output_file = Path(args.output_dir, strip_compression_suffix(rel_path)).with_suffix(args.output_suffix)
+        if output_file in output_files:
+            raise ValueError(f"Multiple input files would be written to {output_file}")
+        output_files.add(output_file)
+
+        if not args.force and is_up_to_date(input_file, output_file):
+            n_skipped += 1
+        else:
+            files.append((input_file, output_file))
+
+    cache = None
+    if files and (args.cache_size or args.cache_file):
+        cache = ConllCache(maxsize=args.cache_size, path=args.cache_file)
+
+    stats = create_stats(args)
+    try:
+        if files:
+            parser = ConllParser(init_parser(**init_kwargs), cache=cache, init_kwargs=init_kwargs, stats=stats)
+            parser.parse_files_as_conll(files, args.input_encoding, args.output_encoding, **parse_kwargs)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    if args.verbose:
+        print(f"Parsed {len(files):,} files, skipped {n_skipped:,} files whose output is up to date")
+
+    if stats is not None:
+        print_stats(stats)
+
+
+def create_stats(args: Namespace) -> Optional[ConllStats]:
+    """Creates the instrumentation of the parser if 'args.profile' or 'args.cprofile_stages' is given.
+    :param args: the parsed command-line arguments
+    :return: a ConllStats object, or None if no statistics were requested
+    """
+    if not args.profile and not args.cprofile_stages:
+        return None
+
+    return ConllStats(profile_stages=args.cprofile_stages or ())
+
+
+def print_stats(stats: ConllStats):
+    """Prints the per-stage statistics and, if any, the cProfile statistics to stderr.
+    :param stats: the statistics of the parser
+    """
+    print(stats.get_report(), file=stderr)
+    profile_report = stats.get_profile_report()
+    if profile_report:
+        print(profile_report, file=stderr)
+
+
+def find_input_files(
+    inputs: List[str], pattern: str = "*.txt", manifest: Optional[str] = None
+) -> List[Tuple[Path, Path]]:
+    """Finds the input files of batch mode, together with their path in the output tree.
+    :param inputs: input files, directories or glob patterns. Directories are searched recursively for files that
+     match 'pattern', and their output tree mirrors the directory. Files that match a glob pattern mirror the part of
+     the pattern after its last directory without wildcards. Files are placed in the root of the output tree
+    :param pattern: glob pattern for the files in directories
+    :param manifest: a file that contains the path of an input file on every line. Relative paths are relative to the
+     directory of the manifest. The output tree mirrors the deepest directory that contains all of them
+    :return: a list of tuples of an input file and its relative path in the output tree
+    """
+    files = []
+    for inp in inputs:
+        path = Path(inp)
+        if path.is_dir():
+            files.extend((file, file.relative_to(path)) for file in sorted(path.rglob(pattern)) if file.is_file())
+        elif _has_magic(inp):
+            parts = path.parts
+            root = Path(*parts[: next(idx for idx, part in enumerate(parts) if _has_magic(part))] or ".")
+            matches = sorted(Path(match) for match in glob(inp, recursive=True))
+            files.extend((file, file.relative_to(root)) for file in matches if file.is_file())
+        elif path.is_file():
+            files.append((path, Path(path.name)))
+        else:
+            raise FileNotFoundError(f"Input {inp} is not a file, a directory or a glob pattern")
+
+    if manifest is not None:
+        manifest = Path(manifest)
+        lines = manifest.read_text(encoding="utf-8").splitlines()
+        manifest_files = [manifest.parent.joinpath(line.strip()) for line in lines if line.strip()]
+        if manifest_files:
+            root = Path(os.path.commonpath([file.resolve().parent for file in manifest_files]))
+            files.extend((file, file.resolve().relative_to(root)) for file in manifest_files)
+
+    return files
+
+
+def is_up_to_date(input_file: Path, output_file: Path) -> bool:
+    """Checks whether an output file exists and is newer than its input file.
+    :param input_file: the input file
+    :param output_file: the output file
+    :return: whether the output file is up to date
+    """
+    return output_file.exists() and output_file.stat().st_mtime_ns >= input_file.stat().st_mtime_ns
+
+
+def _has_magic(pattern: str) -> bool:
+    return any(char in pattern for char in "*?[")
+
+
+def create_argument_parser() -> ArgumentParser:
+    """Creates the argument parser of the `parse-as-conll` script.
+    :return: the argument parser
+    """
     import argparse
 
     cparser = argparse.ArgumentParser(
@@ -62,7 +240,10 @@ def main():
         "-f",
         "--input_file",
         default=None,
-        help="Path to file with sentences to parse. Has precedence over 'input_str'.",
+        help="Path to file with sentences to parse. Has precedence over 'input_str'. Unless 'no_split_on_newline'"
+        " is given, the file is read and parsed line by line, and the output is written as soon as a sentence has"
+        " been parsed, so that large files can be processed in constant memory. Compressed files (.gz, .bz2, .xz and,"
+        " if 'zstandard' is installed, .zst) are decompressed on the fly.",
     )
     cparser.add_argument(
         "-a",
@@ -71,13 +252,36 @@ def main():
         help="Encoding of the input file. Default value is system default.",
     )
     cparser.add_argument("-b", "--input_str", default=None, help="Input string to parse.")
+    cparser.add_argument(
+        "-i",
+        "--inputs",
+        nargs="+",
+        default=None,
+        help="Batch mode: input files, directories or glob patterns (in quotes, e.g. 'corpus/**/*.txt'). All files"
+        " are parsed with a single pipeline, and the output of every file is written to its own file in"
+        " 'output_dir', which mirrors the input directories. Sentence IDs restart in every file. Directories are"
+        " searched recursively for files that match 'input_pattern'.",
+    )
+    cparser.add_argument(
+        "--manifest",
+        default=None,
+        help="Batch mode: a file with the path of an input file on every line. Relative paths are relative to the"
+        " manifest's directory.",
+    )
+    cparser.add_argument(
+        "--input_pattern",
+        default="*.txt",
+        help="Batch mode: glob pattern of the files to parse in input directories, e.g. '*.txt.gz' for compressed"
+        " files.",
+    )
 
     # Output arguments
     cparser.add_argument(
         "-o",
         "--output_file",
         default=None,
-        help="Path to output file. If not specified, the output will be printed on standard output.",
+        help="Path to output file. If not specified, the output will be printed on standard output. The output is"
+        " compressed on the fly if the file has the extension of a compression format (e.g. '.conllu.gz').",
     )
     cparser.add_argument(
         "-c",
@@ -85,6 +289,31 @@ def main():
         default=getpreferredencoding(),
         help="Encoding of the output file. Default value is system default.",
     )
+    cparser.add_argument(
+        "--atomic_output",
+        default=False,
+        action="store_true",
+        help="Write the output to a temporary file that only replaces 'output_file' when all sentences have been"
+        " parsed, rather than writing every sentence to 'output_file' right away. An interrupted run then never"
+        " leaves a partial output file behind. The output files of batch mode are always written like this.",
+    )
+    cparser.add_argument(
+        "--output_dir",
+        default=None,
+        help="Batch mode: directory to write the output files to.",
+    )
+    cparser.add_argument(
+        "--output_suffix",
+        default=".conllu",
+        help="Batch mode: the suffix of the output files, which replaces the suffix of the input files (after the"
+        " extension of a compression format, if any). Use e.g. '.conllu.gz' to compress the output files.",
+    )
+    cparser.add_argument(
+        "--force",
+        default=False,
+        action="store_true",
+        help="Batch mode: parse all files, also those whose output file is newer than the input file.",
+    )
 
     # Model/pipeline arguments
     cparser.add_argument(
@@ -138,6 +367,14 @@ def main():
         " sentence. Instead, 'sent_id' will depend on how spaCy returns the sentences."
         " Must have 'include_headers' enabled.",
     )
+    cparser.add_argument(
+        "--fields",
+        nargs="+",
+        choices=CONLL_FIELD_NAMES,
+        default=None,
+        help="CoNLL-U fields to compute, e.g. 'FORM UPOS HEAD DEPREL'. The other fields are '_' in the output, and"
+        " are not computed at all, which is faster. ID is always included. By default, all fields are computed.",
+    )
 
     cparser.add_argument(
         "-j",
@@ -147,6 +384,59 @@ def main():
         help="Number of processes to use in nlp.pipe(). -1 will use as many cores as available. Might not work for a"
         " 'parser' other than 'spacy' depending on your environment.",
     )
+    cparser.add_argument(
+        "--backend",
+        choices=["pipe", "pool"],
+        default="pipe",
+        help="How to use multiple processes when 'n_process' > 1. 'pipe' uses spaCy's nlp.pipe(n_process=...)."
+        " 'pool' starts worker processes that each load their own model and only exchange text and CoNLL output"
+        " with the main process, which also works for 'stanza' and 'udpipe'. In batch mode, 'pool' distributes whole"
+        " files over the worker processes.",
+    )
+    cparser.add_argument(
+        "--torch_threads",
+        type=lambda value: value if value == "auto" else int(value),
+        default=None,
+        help="Number of threads that torch uses within an operation, or 'auto' to divide all cores over the processes."
+        " Only has an effect for parsers that use torch, like 'stanza'. By default, torch decides in a single"
+        " process, and multiple processes divide the cores among them. With the 'pipe' backend and 'n_process' > 1,"
+        " stanza always uses a single thread.",
+    )
+    cparser.add_argument(
+        "--torch_interop_threads",
+        type=int,
+        default=None,
+        help="Number of threads that torch uses to run independent operations in parallel. Only has an effect for"
+        " parsers that use torch, like 'stanza'. By default, torch decides.",
+    )
+    cparser.add_argument(
+        "--batch_size",
+        type=int,
+        default=None,
+        help="Number of lines to process together in nlp.pipe(). By default, the default batch size of the"
+        " pipeline is used.",
+    )
+    cparser.add_argument(
+        "--bucket_window",
+        type=int,
+        default=None,
+        help="If given, windows of this many lines are sorted by length before they are parsed, so that lines of"
+        " similar length are batched together. This speeds up parsers that pad their batches (e.g. transformers,"
+        " stanza). The output keeps the original order. Has no effect with 'no_split_on_newline'.",
+    )
+    cparser.add_argument(
+        "--cache_size",
+        type=int,
+        default=0,
+        help="Number of input lines whose output is kept in memory, so that repeated lines do not need to be parsed"
+        " again. 0 disables the in-memory cache.",
+    )
+    cparser.add_argument(
+        "--cache_file",
+        default=None,
+        help="Path to an SQLite database to cache the output of input lines on disk, also across runs. It is"
+        " created if it does not exist yet.",
+    )
     cparser.add_argument(
         "-v",
         "--verbose",
@@ -170,8 +460,42 @@ def main():
         help="By default, the input file or string is split on newlines for faster processing of the split up parts."
         " If you want to disable that behavior, you can use this flag.",
     )
+    cparser.add_argument(
+        "--server",
+        default=None,
+        help="Address of a running 'parse-as-conll-server' ('host:port' or the path to a Unix socket) that parses"
+        " the input with an already loaded model. If no server is running at this address, the input is parsed"
+        " in-process. The whole input is sent at once, and 'n_process' and the cache options are ignored.",
+    )
+    cparser.add_argument(
+        "--server_timeout",
+        type=float,
+        default=DEFAULT_SERVER_TIMEOUT,
+        help="Time in seconds to wait for the server to accept the connection and to respond. The server only"
+        " responds when it has parsed the whole input. If it does not respond in time, the input is parsed"
+        " in-process.",
+    )
+    cparser.add_argument(
+        "--profile",
+        default=False,
+        action="store_true",
+        help="Whether to print the time spent in every stage of parsing (splitting, the model, formatting, writing),"
+        " and the number of lines, sentences and tokens, to stderr when done. Work that is done in worker"
+        " processes is only included in the time of the stage that waits for it.",
+    )
+    cparser.add_argument(
+        "--cprofile_stages",
+        nargs="+",
+        choices=STAGES,
+        default=None,
+        help="Stages to run under cProfile. Their profile is printed to stderr when done. Implies 'profile'.",
+    )
+
+    return cparser
 
-    cargs = cparser.parse_args()
+
+def main():
+    cargs = create_argument_parser().parse_args()
     parse(cargs)
 
 
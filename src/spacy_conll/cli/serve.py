@@ -0,0 +1,46 @@
+from argparse import Namespace
+
+from spacy_conll.server import create_conll_server
+
+
+def serve(args: Namespace):
+    server = create_conll_server(args.address)
+    if args.verbose:
+        print(f"Serving on {args.address}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    import argparse
+
+    cparser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Start a server that keeps parsers in memory, so that 'parse-as-conll --server' does not need to"
+        " load a model on every call. A model is loaded on the first request that uses it and then kept in memory."
+        " There is no authentication, so only listen on localhost or on a Unix socket with suitable permissions.",
+    )
+
+    cparser.add_argument(
+        "address",
+        help="Address to listen on: 'host:port' for a TCP socket, or the path to a Unix socket.",
+    )
+    cparser.add_argument(
+        "-v",
+        "--verbose",
+        default=False,
+        action="store_true",
+        help="Whether to print the address when the server has started.",
+    )
+
+    cargs = cparser.parse_args()
+    serve(cargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+from contextlib import contextmanager
+from importlib.util import find_spec
+from os import PathLike
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+
+# zstd is only supported if the optional `zstandard` library is installed
+ZSTD_AVAILABLE = find_spec("zstandard") is not None
+
+# Compression formats by file extension, and the magic bytes that compressed files start with
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+COMPRESSION_MAGIC_BYTES = {b"\x1f\x8b": "gzip", b"BZh": "bz2", b"\xfd7zXZ\x00": "xz", b"\x28\xb5\x2f\xfd": "zstd"}
+
+
+def get_compression(path: Union[PathLike, Path, str], sniff: bool = False) -> Optional[str]:
+    """Detects the compression format of a file from its extension and, optionally, from its first bytes.
+    :param path: path to the file
+    :param sniff: whether to look at the magic bytes at the start of the file if its extension is not that of a
+     compression format. The file must exist
+    :return: "gzip", "bz2", "xz", "zstd", or None if the file is not compressed
+    """
+    path = Path(path)
+    compression = COMPRESSION_EXTENSIONS.get(path.suffix.lower())
+    if compression is not None or not sniff:
+        return compression
+
+    with path.open("rb") as fhin:
+        head = fhin.read(max(len(magic) for magic in COMPRESSION_MAGIC_BYTES))
+
+    return next(
+        (compression for magic, compression in COMPRESSION_MAGIC_BYTES.items() if head.startswith(magic)), None
+    )
+
+
+def strip_compression_suffix(path: Union[PathLike, Path, str]) -> Path:
+    """Removes the extension of a compression format from a path, e.g. 'corpus.txt.gz' becomes 'corpus.txt'.
+    :param path: the path
+    :return: the path without the extension of a compression format, if any
+    """
+    path = Path(path)
+    return path.with_suffix("") if path.suffix.lower() in COMPRESSION_EXTENSIONS else path
+
+
+def open_file(
+    path: Union[PathLike, Path, str],
+    mode: str = "r",
+    encoding: Optional[str] = None,
+    compression: Optional[str] = "infer",
+) -> IO:
+    """Opens a plain or compressed file. Compressed files are (de)compressed on the fly in small chunks while they
+    are read or written, so they never need to be in memory or on disk uncompressed.
+    :param path: path to the file
+    :param mode: "r" or "w" for text, "rb" or "wb" for bytes
+    :param encoding: encoding of a file in text mode
+    :param compression: "gzip", "bz2", "xz", "zstd", None for an uncompressed file, or "infer" to detect it from the
+     extension of 'path' and, when reading, from the first bytes of the file (see :py:func:`get_compression`)
+    :return: a file object
+    """
+    if mode not in ("r", "w", "rb", "wb"):
+        raise ValueError(f"Unsupported mode {mode!r}. Options are: 'r', 'w', 'rb', 'wb'")
+
+    path = Path(path)
+    if compression == "infer":
+        compression = get_compression(path, sniff=mode.startswith("r"))
+
+    # Compressed files are opened in text mode explicitly, the built-in open does so by default
+    cmode = mode if "b" in mode else f"{mode}t"
+    if compression is None:
+        return path.open(mode, encoding=encoding)
+    elif compression == "gzip":
+        # The default level of gzip's command line tool, which is much faster than the maximal level
+        return gzip.open(path, cmode, compresslevel=6, encoding=encoding)
+    elif compression == "bz2":
+        return bz2.open(path, cmode, encoding=encoding)
+    elif compression == "xz":
+        return lzma.open(path, cmode, encoding=encoding)
+    elif compression == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise ImportError("Reading and writing zstd files requires the 'zstandard' library")
+
+        import zstandard
+
+        return zstandard.open(path, cmode, encoding=encoding)
+    else:
+        raise ValueError(
+            f"Unexpected value {compression!r} for 'compression'. Options are: 'gzip', 'bz2', 'xz', 'zstd', None,"
+            " 'infer'"
+        )
+
+
+@contextmanager
+def open_file_atomic(path: Union[PathLike, Path, str], encoding: Optional[str] = None) -> Iterator[IO]:
+    """Opens a plain or compressed file for writing text (see :py:func:`open_file`). The text is written to a
+    uniquely named temporary file next to 'path', which only replaces 'path' when the context is exited without an
+    error, so that a failure never leaves a partial or truncated file behind. Targets that exist but are not regular
+    files, such as '/dev/stdout' or named pipes, cannot be replaced and are written to directly.
+    :param path: path to the file
+    :param encoding: encoding of the file
+    :return: a file object
+    """
+    path = Path(path)
+    if path.exists() and not path.is_file():
+        with open_file(path, "w", encoding) as fhout:
+            yield fhout
+        return
+
+    # The temporary file gets the permissions that the file would have had if it had been created directly
+    mode = path.stat().st_mode if path.exists() else 0o666 & ~_get_umask()
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False) as fh:
+        tmp_file = Path(fh.name)
+    try:
+        os.chmod(tmp_file, mode)
+        # The temporary file does not have the extension that the compression format is derived from
+        with open_file(tmp_file, "w", encoding, compression=get_compression(path)) as fhout:
+            yield fhout
+        os.replace(tmp_file, path)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+def _get_umask() -> int:
+    """Returns the file mode creation mask of the process, which can only be read by setting it."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
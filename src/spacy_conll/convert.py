@@ -0,0 +1,235 @@
+import os
+import tempfile
+from locale import getpreferredencoding
+from multiprocessing import Pool
+from os import PathLike
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from spacy.tokens import Doc, DocBin
+from spacy.vocab import Vocab
+from spacy_conll.compression import get_compression, open_file
+from spacy_conll.parser import conll_chunk_to_doc, group_conll_chunks, iter_conll_chunks, set_conll_parse_extensions
+
+
+def convert_conll_file_to_docbin(
+    input_file: Union[PathLike, Path, str],
+    output_file: Union[PathLike, Path, str],
+    input_encoding: str = getpreferredencoding(),
+    group_by: Union[str, int] = "sentence",
+    n_process: int = 1,
+    n_shards: Optional[int] = None,
+    ner_tag_pattern: str = "^((?:name|NE)=)?([BILU])-([A-Z_]+)|O$",
+    ner_map: Optional[Dict[str, str]] = None,
+    merge_shards: bool = True,
+) -> int:
+    """Converts a CoNLL-U file into a spaCy DocBin. The file is split at sentence boundaries into shards of roughly
+    equal size in bytes, which are converted in parallel. Every worker only needs a Vocab (no pipeline is loaded) and
+    writes its own DocBin to disk. By default, they are merged into 'output_file' at the end, which requires all Docs
+    to fit in memory at once. For large files, disable 'merge_shards' to keep the DocBin of every shard. The user data,
+    and therefore Token._.conll_misc_field, Token._.conll_deps_graphs_field and Span._.conll_metadata, is stored in
+    the DocBin. Note that the resulting Docs do not contain the formatter's extensions (such as conll_str); those are
+    added when the Docs are passed through a pipeline with a ConllFormatter.
+
+    Because shards are determined on the byte level, the encoding must encode a newline as a single byte, like
+    UTF-8 does. Groups of sentences (see 'group_by') never cross shard boundaries. When grouping by "newdoc", shards
+    are only split at "# newdoc" boundaries. Compressed files (see :py:func:`spacy_conll.compression.open_file`)
+    cannot be split into byte ranges, so they are decompressed on the fly and converted in a single process.
+
+    :param input_file: path to the CoNLL-U file to convert
+    :param output_file: path to write the DocBin to or, if 'merge_shards' is disabled, the directory to write the
+     DocBins of the shards to
+    :param input_encoding: encoding of 'input_file'
+    :param group_by: how to group sentences into Docs: "sentence" (one Doc per sentence), "newdoc" (a new Doc
+     at every "# newdoc" comment) or a positive integer (a Doc per that many sentences)
+    :param n_process: number of processes to use. -1 will use as many cores as available
+    :param n_shards: number of shards to split 'input_file' into. By default, one per process
+    :param ner_tag_pattern: Regex pattern for entity tag in the MISC field
+    :param ner_map: Map old NER tag names to new ones, '' maps to O
+    :param merge_shards: whether to merge the DocBins of the shards into a single file. If disabled, they are written
+     to the directory 'output_file' as numbered .spacy files in the order of the input file, and only one shard per
+     process is in memory at a time. spaCy's training can read such a directory directly
+    :return: the number of Docs that were written
+    """
+    if n_process == -1:
+        n_process = os.cpu_count() or 1
+    n_shards = n_shards or n_process
+
+    input_file = Path(input_file).resolve()
+    output_file = Path(output_file).resolve()
+    args = (input_file, input_encoding, group_by, n_process, n_shards, ner_tag_pattern, ner_map)
+    if merge_shards:
+        # Write the shards next to the output file so that we do not fill up a (possibly small) tmp partition
+        with tempfile.TemporaryDirectory(dir=output_file.parent) as tmpdir:
+            shards = _convert_conll_shards(Path(tmpdir), *args)
+            docbin = DocBin(store_user_data=True)
+            for shard_file, _ in shards:
+                docbin.merge(DocBin(store_user_data=True).from_disk(shard_file))
+        docbin.to_disk(output_file)
+    else:
+        # DocBins of an earlier conversion would be mixed up with the new ones
+        if output_file.is_dir() and any(output_file.glob("*.spacy")):
+            raise FileExistsError(f"Output directory {output_file} already contains .spacy files")
+        output_file.mkdir(parents=True, exist_ok=True)
+        shards = _convert_conll_shards(output_file, *args)
+
+    # Make sure that the extensions are available to read the user data of the converted Docs
+    set_conll_parse_extensions()
+
+    return sum(n_docs for _, n_docs in shards)
+
+
+def _convert_conll_shards(
+    shard_dir: Path,
+    input_file: Path,
+    input_encoding: str,
+    group_by: Union[str, int],
+    n_process: int,
+    n_shards: int,
+    ner_tag_pattern: str,
+    ner_map: Optional[Dict[str, str]],
+) -> List[Tuple[Path, int]]:
+    """Splits a CoNLL-U file into shards, converts them in parallel and writes the DocBin of every shard to
+    'shard_dir'. A compressed file is converted as a single shard. See :py:func:`convert_conll_file_to_docbin`.
+    :return: a list of the DocBin file and the number of Docs of every shard, in the order of the input file
+    """
+    if get_compression(input_file, sniff=True) is not None:
+        # Compressed files cannot be split into byte ranges, so they are converted as a whole
+        shard_file = shard_dir.joinpath("0.spacy")
+        with open_file(input_file, encoding=input_encoding) as fhin:
+            docbin = _convert_conll_lines(fhin, group_by, ner_tag_pattern, ner_map)
+        docbin.to_disk(shard_file)
+        return [(shard_file, len(docbin))]
+
+    if "\n".encode(input_encoding) != b"\n":
+        raise ValueError(f"Cannot split files with encoding {input_encoding} into shards. Use UTF-8 instead.")
+
+    shard_offsets = find_conll_shard_offsets(input_file, n_shards, newdoc=group_by == "newdoc")
+    # Zero-padded, so that the files sort in the order of the input file
+    width = len(str(len(shard_offsets) - 1))
+    tasks = []
+    for idx, (start, end) in enumerate(shard_offsets):
+        shard_file = shard_dir.joinpath(f"{idx:0{width}}.spacy")
+        tasks.append((input_file, start, end, input_encoding, group_by, ner_tag_pattern, ner_map, shard_file))
+
+    if n_process > 1 and len(tasks) > 1:
+        with Pool(min(n_process, len(tasks))) as pool:
+            return pool.map(_convert_conll_shard, tasks, chunksize=1)
+    else:
+        return [_convert_conll_shard(task) for task in tasks]
+
+
+def find_conll_shard_offsets(
+    input_file: Union[PathLike, Path, str], n_shards: int, newdoc: bool = False
+) -> List[Tuple[int, int]]:
+    """Splits a CoNLL-U file into at most 'n_shards' byte ranges of roughly the same size. Every range starts at the
+    beginning of a sentence (or at the start of the file), so that no sentence is split across ranges.
+    :param input_file: path to the CoNLL-U file
+    :param n_shards: the (maximal) number of ranges
+    :param newdoc: whether ranges may only start at sentences with a "# newdoc" comment
+    :return: a list of (start, end) byte offsets
+    """
+    size = os.path.getsize(input_file)
+    boundaries = [0]
+    with open(input_file, "rb") as fhin:
+        for shard_idx in range(1, n_shards):
+            target = max(size * shard_idx // n_shards, boundaries[-1])
+            boundaries.append(_find_next_chunk_start(fhin, target, size, newdoc=newdoc))
+    boundaries.append(size)
+
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+def _find_next_chunk_start(fhin: BinaryIO, offset: int, size: int, newdoc: bool = False) -> int:
+    """Finds the first sentence that starts after 'offset' in a binary file handle.
+    :param fhin: binary file handle of a CoNLL-U file
+    :param offset: byte offset to start looking from
+    :param size: size of the file in bytes, which is returned when no sentence start is found
+    :param newdoc: whether to only consider sentences that have a "# newdoc" comment
+    :return: byte offset of the first line of the sentence
+    """
+    if offset >= size:
+        return size
+
+    # Move to the beginning of the next line, unless we are already at the start of a line
+    fhin.seek(max(offset - 1, 0))
+    if offset > 0:
+        fhin.readline()
+
+    prev_is_empty = False
+    chunk_start = None
+    while True:
+        pos = fhin.tell()
+        line = fhin.readline()
+        if not line:
+            return size
+
+        line = line.rstrip(b"\r\n")
+        if line and prev_is_empty:
+            if not newdoc:
+                return pos
+            chunk_start = pos
+
+        if chunk_start is not None and line:
+            if line.startswith(b"# newdoc"):
+                return chunk_start
+            elif not line.startswith(b"#"):
+                # Reached the tokens of this sentence without having seen "# newdoc"
+                chunk_start = None
+
+        prev_is_empty = not line
+
+
+def _convert_conll_shard(task: Tuple) -> Tuple[Path, int]:
+    """Converts a byte range of a CoNLL-U file into a DocBin and writes it to disk. Used by the worker processes
+    of :py:func:`convert_conll_file_to_docbin`.
+    :param task: tuple of the input file, start and end offset, encoding, group_by, ner_tag_pattern, ner_map and
+     the file to write the DocBin to
+    :return: the file that the DocBin was written to and the number of Docs in it
+    """
+    input_file, start, end, input_encoding, group_by, ner_tag_pattern, ner_map, shard_file = task
+    docbin = _convert_conll_lines(
+        _iter_shard_lines(input_file, start, end, input_encoding), group_by, ner_tag_pattern, ner_map
+    )
+    docbin.to_disk(shard_file)
+
+    return shard_file, len(docbin)
+
+
+def _iter_shard_lines(
+    input_file: Union[PathLike, Path, str], start: int, end: int, input_encoding: str
+) -> Iterator[str]:
+    """Reads the lines of a byte range of a file one by one, so that a shard never has to be in memory as a whole.
+    :param input_file: path to the file
+    :param start: offset of the first line
+    :param end: offset after the last line, which must be the start of a line or the end of the file
+    :param input_encoding: encoding of the file
+    :return: a generator of the lines, including their trailing newline
+    """
+    with open(input_file, "rb") as fhin:
+        fhin.seek(start)
+        while fhin.tell() < end:
+            line = fhin.readline()
+            if not line:
+                break
+            yield line.decode(input_encoding)
+
+
+def _convert_conll_lines(
+    lines: Iterable[str], group_by: Union[str, int], ner_tag_pattern: str, ner_map: Optional[Dict[str, str]]
+) -> DocBin:
+    """Converts CoNLL-U lines into a DocBin. See :py:func:`convert_conll_file_to_docbin`.
+    :param lines: iterable of CoNLL-U lines, with or without their trailing newline
+    :param group_by: how to group sentences into Docs
+    :param ner_tag_pattern: Regex pattern for entity tag in the MISC field
+    :param ner_map: Map old NER tag names to new ones, '' maps to O
+    :return: a DocBin with the Docs and their user data
+    """
+    set_conll_parse_extensions()
+    vocab = Vocab()
+    docbin = DocBin(store_user_data=True)
+    for chunks in group_conll_chunks(iter_conll_chunks(lines), group_by=group_by):
+        docs = [conll_chunk_to_doc(vocab, chunk, ner_tag_pattern, ner_map) for chunk in chunks]
+        docbin.add(docs[0] if len(docs) == 1 else Doc.from_docs(docs))
+
+    return docbin
@@ -1,13 +1,19 @@
+import warnings
 from collections import OrderedDict
-from dataclasses import dataclass, field
-from typing import Dict, Optional, Union
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+from uuid import uuid4
+from weakref import WeakValueDictionary
 
+import numpy as np
+from spacy.attrs import DEP, HEAD, IDX, LEMMA, MORPH, ORTH, POS, SPACY, TAG
 from spacy.language import Language
+from spacy.strings import StringStore, get_string_id
 from spacy.tokens import Doc, Span, Token
 from spacy_conll.utils import PD_AVAILABLE, merge_dicts_strict
 
 
-if PD_AVAILABLE:
+if TYPE_CHECKING:
     import pandas as pd
 
 CONLL_FIELD_NAMES = [
@@ -23,6 +29,211 @@ CONLL_FIELD_NAMES = [
     "MISC",
 ]
 
+# Objects and representations that the extensions can be added to, see the `levels` and `representations` options
+CONLL_LEVELS = ["doc", "sent", "token"]
+CONLL_REPRESENTATIONS = ["conll", "conll_str", "conll_pd"]
+
+# The universal POS tags of Universal Dependencies
+UD_UPOS_TAGS = [
+    "ADJ",
+    "ADP",
+    "ADV",
+    "AUX",
+    "CCONJ",
+    "DET",
+    "INTJ",
+    "NOUN",
+    "NUM",
+    "PART",
+    "PRON",
+    "PROPN",
+    "PUNCT",
+    "SCONJ",
+    "SYM",
+    "VERB",
+    "X",
+]
+# spaCy tags whitespace tokens as SPACE, and empty values are `_`
+_UPOS_CATEGORIES = UD_UPOS_TAGS + ["SPACE", "_"]
+# Presets for the `pd_dtypes` option. Closed-class columns become categorical and integer columns are downcast to
+# the smallest integer type that can hold their values. Lists are fixed categories, which are the same for every Doc
+# so that the DataFrames of different Docs can be concatenated without losing the category dtype
+_COMPACT_PD_DTYPES = {
+    "ID": "downcast",
+    "UPOS": _UPOS_CATEGORIES,
+    "XPOS": "category",
+    "FEATS": "category",
+    "HEAD": "downcast",
+    "DEPREL": "category",
+    "DEPS": "category",
+    "MISC": ["_", "SpaceAfter=No"],
+}
+PD_DTYPES_PRESETS = {
+    "compact": _COMPACT_PD_DTYPES,
+    "compact_string": {**_COMPACT_PD_DTYPES, "FORM": "string", "LEMMA": "string"},
+    "compact_arrow": {**_COMPACT_PD_DTYPES, "FORM": "string[pyarrow]", "LEMMA": "string[pyarrow]"},
+}
+
+# Token attributes that are needed to build the CoNLL-U fields. They are exported in bulk with `to_array`
+ARRAY_ATTRS = [IDX, ORTH, LEMMA, POS, TAG, MORPH, HEAD, DEP, SPACY]
+# The attributes that every field needs, so that only those of the selected fields (see `fields`) are exported
+FIELD_ATTRS = {
+    "ID": [],
+    "FORM": [ORTH],
+    "LEMMA": [LEMMA],
+    "UPOS": [POS],
+    "XPOS": [TAG],
+    "FEATS": [MORPH],
+    "HEAD": [HEAD, DEP],
+    "DEPREL": [DEP],
+    "DEPS": [IDX],
+    "MISC": [SPACY],
+}
+# Key in Doc.user_data of the sentence ID of the Doc's first sentence minus one (see ConllFormatter.__call__)
+SENT_ID_OFFSET_KEY = ("spacy_conll", "sent_id_offset", None, None)
+# Key in Doc.user_data of the Doc's DataFrame when Token-level but no Doc-level `conll_pd` extensions are set
+DOC_CONLL_PD_KEY = ("spacy_conll", "doc_conll_pd", None, None)
+# Key in Doc.user_data of the ID and the configuration of the lazy ConllFormatter that processed the Doc (see `lazy`)
+LAZY_FORMATTER_KEY = ("spacy_conll", "lazy_formatter", None, None)
+# Representations that lazy formatters memoize in Doc.user_data
+_LAZY_EXTS = ("conll", "conll_str", "conll_pd", "conll_array")
+
+# Lazy formatters by their ID, so that the getters can find the formatter that processed a Doc. Formatters are only
+# referenced weakly, so that they can still be garbage collected
+_LAZY_FORMATTERS: "WeakValueDictionary[str, ConllFormatter]" = WeakValueDictionary()
+# Lazy formatters that were recreated from the configuration in a Doc, e.g. when the Doc was created in a worker
+# process, by their ID. Only the most recently used ones are kept
+_RECREATED_LAZY_FORMATTERS: "OrderedDict[str, ConllFormatter]" = OrderedDict()
+_MAX_RECREATED_LAZY_FORMATTERS = 32
+# The getter and setter of every extension by its default and its custom name, which all formatters share
+_EXTENSION_ACCESSORS: Dict[Tuple[str, str], Tuple[Callable, Callable]] = {}
+
+
+def format_sent_header(sent_id: int, text: str) -> str:
+    """Creates the default CoNLL-U header of a sentence, consisting of its ID and its text.
+    :param sent_id: the ID of the sentence
+    :param text: the text of the sentence
+    :return: the header, ending in a newline
+    """
+    return f"# sent_id = {sent_id}\n# text = {text}\n"
+
+
+def get_conll_array_row(doc: Doc, idx: int, ext_name: str = "conll_array") -> Dict[str, Union[str, int]]:
+    """Decodes the CoNLL-U fields of a single token from a Doc's `conll_array` extension.
+    :param doc: a Doc that was processed by a ConllFormatter with `include_array=True`
+    :param idx: the index of the token in the Doc
+    :param ext_name: the name of the `conll_array` extension if it was renamed with `ext_names`
+    :return: the token's CoNLL-U fields as an (ordered) dictionary, like `token._.conll`
+    """
+    return _decode_conll_array_rows(doc, ext_name, idx, idx + 1)[0]
+
+
+def get_conll_array_sent(doc: Doc, sent_idx: int, ext_name: str = "conll_array") -> List[Dict[str, Union[str, int]]]:
+    """Decodes the CoNLL-U fields of all tokens in a sentence from a Doc's `conll_array` extension.
+    :param doc: a Doc that was processed by a ConllFormatter with `include_array=True`
+    :param sent_idx: the index of the sentence in the Doc, starting from 0
+    :param ext_name: the name of the `conll_array` extension if it was renamed with `ext_names`
+    :return: a list of the tokens' CoNLL-U fields as (ordered) dictionaries, like `sent._.conll`
+    """
+    # The first column contains the IDs, which restart from 1 for every sentence
+    ids = next(iter(doc._.get(ext_name).values()))
+    sent_starts = np.flatnonzero(ids == 1).tolist() + [len(ids)]
+    return _decode_conll_array_rows(doc, ext_name, sent_starts[sent_idx], sent_starts[sent_idx + 1])
+
+
+def _decode_conll_array_rows(doc: Doc, ext_name: str, start: int, end: int) -> List[Dict[str, Union[str, int]]]:
+    strings = doc.vocab.strings
+    columns = []
+    for values in doc._.get(ext_name).values():
+        values = values[start:end]
+        # Integer fields (ID and HEAD) are stored as is, others as IDs in the StringStore
+        if values.dtype == np.uint64:
+            columns.append([strings[value] for value in values.tolist()])
+        else:
+            columns.append(values.tolist())
+
+    field_names = list(doc._.get(ext_name).keys())
+    return [OrderedDict(zip(field_names, row)) for row in zip(*columns)]
+
+
+def _get_underscore_key(obj: Union[Doc, Span, Token], ext_name: str) -> Tuple[str, str, Optional[int], Optional[int]]:
+    """Returns the key in Doc.user_data where Underscore stores the value of an extension without getter."""
+    if isinstance(obj, Token):
+        return "._.", ext_name, obj.idx, None
+    elif isinstance(obj, Span):
+        return "._.", ext_name, obj.start_char, obj.end_char
+    else:
+        return "._.", ext_name, None, None
+
+
+def _get_lazy_formatter(doc: Doc) -> Optional["ConllFormatter"]:
+    """Returns the lazy formatter that processed a Doc, if any. If it does not exist in this process, e.g. when the
+    Doc was created in a worker process, an identical formatter is created from the configuration in the Doc once."""
+    lazy_formatter = doc.user_data.get(LAZY_FORMATTER_KEY)
+    if lazy_formatter is None:
+        return None
+
+    formatter_id, config = lazy_formatter
+    formatter = _LAZY_FORMATTERS.get(formatter_id)
+    if formatter is not None:
+        return formatter
+
+    formatter = _RECREATED_LAZY_FORMATTERS.pop(formatter_id, None)
+    if formatter is None:
+        formatter = ConllFormatter(**config)
+    _RECREATED_LAZY_FORMATTERS[formatter_id] = formatter
+    if len(_RECREATED_LAZY_FORMATTERS) > _MAX_RECREATED_LAZY_FORMATTERS:
+        _RECREATED_LAZY_FORMATTERS.popitem(last=False)
+
+    return formatter
+
+
+def _get_token_conll_pd(token: Token) -> Optional["pd.Series"]:
+    """Returns the token's row in the Doc's DataFrame, which an eager formatter stores in the Doc."""
+    doc_conll_pd = token.doc.user_data.get(DOC_CONLL_PD_KEY)
+    if doc_conll_pd is None:
+        return None
+
+    token_conll_pd = doc_conll_pd.iloc[token.i]
+    token_conll_pd.name = None
+    return token_conll_pd
+
+
+def _get_extension_accessors(ext: str, ext_name: str) -> Tuple[Callable, Callable]:
+    """Returns the getter and setter of an extension. Extensions are registered globally, but every Doc may have been
+    processed by a different formatter, so they are not bound to a formatter: Docs that were processed by a lazy
+    formatter are handed to it, and the values that an eager formatter set are read from the Doc's user_data.
+    :param ext: the default name of the extension: 'conll', 'conll_str', 'conll_pd', or 'conll_array'
+    :param ext_name: the name under which the extension is registered
+    :return: the getter and the setter
+    """
+    if (ext, ext_name) in _EXTENSION_ACCESSORS:
+        return _EXTENSION_ACCESSORS[(ext, ext_name)]
+
+    def getter(obj: Union[Doc, Span, Token]) -> Any:
+        doc = obj if isinstance(obj, Doc) else obj.doc
+        formatter = _get_lazy_formatter(doc)
+        if formatter is not None:
+            return formatter._get_lazy_conll(obj, ext, ext_name)
+
+        value = doc.user_data.get(_get_underscore_key(obj, ext_name))
+        if value is None and ext == "conll_pd" and isinstance(obj, Token):
+            return _get_token_conll_pd(obj)
+
+        return value
+
+    def setter(obj: Union[Doc, Span, Token], value: Any):
+        doc = obj if isinstance(obj, Doc) else obj.doc
+        doc.user_data[_get_underscore_key(obj, ext_name)] = value
+
+    _EXTENSION_ACCESSORS[(ext, ext_name)] = getter, setter
+    return getter, setter
+
+
+def _is_extension_getter(getter: Optional[Callable]) -> bool:
+    """Whether a getter is one of the getters that formatters register (see `_get_extension_accessors`)."""
+    return any(getter is accessors[0] for accessors in _EXTENSION_ACCESSORS.values())
+
 
 @Language.factory(
     "conll_formatter",
@@ -32,6 +243,14 @@ CONLL_FIELD_NAMES = [
         "field_names": None,
         "include_headers": False,
         "disable_pandas": False,
+        "lazy": False,
+        "memoize": True,
+        "include_array": False,
+        "pd_dtypes": None,
+        "levels": None,
+        "representations": None,
+        "fields": None,
+        "drop_unselected_fields": False,
     },
 )
 def create_conll_formatter(
@@ -39,9 +258,17 @@ def create_conll_formatter(
     name: str,  # qa: ignore
     conversion_maps: Optional[Dict[str, Dict[str, str]]] = None,
     ext_names: Optional[Dict[str, str]] = None,
-    field_names: Dict[str, str] = None,
+    field_names: Optional[Dict[str, str]] = None,
     include_headers: bool = False,
     disable_pandas: bool = False,
+    lazy: bool = False,
+    memoize: bool = True,
+    include_array: bool = False,
+    pd_dtypes: Optional[Union[str, Dict[str, Union[str, List[str]]]]] = None,
+    levels: Optional[List[str]] = None,
+    representations: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
+    drop_unselected_fields: bool = False,
 ):
     return ConllFormatter(
         conversion_maps=conversion_maps,
@@ -49,6 +276,14 @@ def create_conll_formatter(
         field_names=field_names if field_names else {},
         include_headers=include_headers,
         disable_pandas=disable_pandas,
+        lazy=lazy,
+        memoize=memoize,
+        include_array=include_array,
+        pd_dtypes=pd_dtypes,
+        levels=levels,
+        representations=representations,
+        fields=fields,
+        drop_unselected_fields=drop_unselected_fields,
     )
 
 
@@ -70,11 +305,11 @@ class ConllFormatter:
           `CoNLL format`_.
         - in `Doc`: all its sentences' `conll_str` combined and separated by new lines.
     - `conll_pd`: `pandas` representation of the CoNLL format
-        - in `Token`: a `Series` representation of this token's CoNLL properties.
+        - in `Token`: a `Series` representation of this token's CoNLL properties. It is only created when accessed.
         - in sentence `Span`: a `DataFrame` representation of this sentence, with the CoNLL names as column
           headers.
-        - in `Doc`: a concatenation of its sentences' `DataFrame`'s, leading to a new a `DataFrame` whose
-          index is reset.
+        - in `Doc`: a `DataFrame` representation of all tokens in the Doc. The sentences' `DataFrame`'s are slices
+          of it with a reset index.
 
     Multi-word tokens and empty nodes are not supported. See: https://universaldependencies.org/format.html#words-tokens-and-empty-nodes
 
@@ -83,9 +318,12 @@ class ConllFormatter:
     :param name: a string, as reauired by spaCy
     :param conversion_maps: two-level dictionary that contains a field_name (e.g. 'lemma', 'upostag')
     on the first level, and the conversion map on the second.
-    E.g. {'lemma': {'-PRON-': 'PRON'}} will map the lemma '-PRON-' to 'PRON'
+    E.g. {'lemma': {'-PRON-': 'PRON'}} will map the lemma '-PRON-' to 'PRON'. Fields can be given by their default
+    CoNLL-U name or by their custom name (see `field_names`), case-insensitively. Maps of unknown fields are ignored
+    with a warning. The maps are compiled into lookup tables when the component is created, so applying them is
+    cheap
     :param ext_names: dictionary containing names for the custom spaCy extensions. You can rename the following
-    extensions (use as keys): 'conll', 'conll_pd', 'conll_str'. E.g. {'conll': 'conll_dict', 'conll_pd': 'conll_pandas'}
+    extensions (use as keys): 'conll', 'conll_pd', 'conll_str', 'conll_array'. E.g. {'conll': 'conll_dict', 'conll_pd': 'conll_pandas'}
      will rename the properties accordingly
     :param field_names: dictionary containing names for custom field names in case you do not want to use default
      CoNLL-U field names. You can rename the following fields (use as keys): 'ID', 'FORM', 'LEMMA', 'UPOS', 'XPOS',
@@ -95,6 +333,42 @@ class ConllFormatter:
     https://universaldependencies.org/format.html#sentence-boundaries-and-comments.
     :param disable_pandas: whether to disable pandas integration even if it is installed. This is particularly
     useful to avoid issues when using multiprocessing.
+    :param lazy: whether to register the extensions as getters that only compute their value when they are first
+    accessed, rather than computing all of them when the component is called. This is much faster when you only
+    need some of the extensions, e.g. only `doc._.conll_str`. Note that in lazy mode, the `conll_misc_field` and
+    `conll_metadata` extensions are not modified by the formatter. A Doc stores the configuration of the lazy
+    formatter that processed it, so formatters with different settings can be used side by side.
+    :param memoize: in lazy mode, whether to store the computed values in the Doc's `user_data` so that they
+    only need to be computed once. Disable this to save memory when values are accessed only once.
+    :param include_array: whether to add the `conll_array` extension to the Doc. It contains the CoNLL-U fields of
+    all tokens as a dictionary of NumPy arrays with the field names as keys. ID and HEAD are int32, the other fields
+    are uint64 IDs of the string values in the Doc's StringStore (`doc.vocab.strings`). Only the selected fields are
+    included (see `fields`), but ID always is: it can be used to find sentence boundaries. This is a compact representation that can be consumed directly, or decoded with
+    `get_conll_array_row` and `get_conll_array_sent`. Conversion maps for ID and HEAD are not applied to it.
+    :param pd_dtypes: the dtypes of the columns in the `conll_pd` DataFrames. By default, pandas infers them. This
+    can be a dictionary with default CoNLL-U field names as keys (e.g. 'UPOS') and any dtype that pandas accepts as
+    values, or the name of a preset: 'compact' uses the category dtype for all fields except FORM and LEMMA and the
+    smallest possible integer type for ID and HEAD; 'compact_string' additionally uses the string dtype for FORM and
+    LEMMA, and 'compact_arrow' the Arrow-backed string dtype (requires `pyarrow`). The special value 'downcast' uses
+    the smallest integer type that can hold the values of the column, and a list of values uses the category dtype
+    with those categories (values that are not in the list are added to it). Unlike inferred categories, such fixed
+    categories are the same for every Doc, so that the DataFrames of different Docs can be concatenated without
+    falling back to the object dtype. The presets use the UD tags (see `UD_UPOS_TAGS`) for UPOS. This can
+    considerably reduce memory usage.
+    :param levels: the objects to add the extensions to: 'doc', 'sent' (sentence Spans) and/or 'token'. By default,
+    all of them. Extensions of the other levels are not registered, computed or stored. E.g. ['doc'] only stores a
+    handful of values per Doc instead of some for every token, which is faster and makes Docs much smaller when they
+    are pickled (e.g. between the processes of `nlp.pipe`). Without the 'token' level, the `conll_misc_field`
+    extension is not modified, and without the 'sent' level, the `conll_metadata` extension is not modified.
+    :param representations: the representations to add: 'conll' (dictionaries), 'conll_str' and/or 'conll_pd'. By
+    default, all of them. 'conll_pd' is only added when pandas is installed and not disabled (see `disable_pandas`).
+    :param fields: the CoNLL-U fields to compute, by their default or custom name (see `field_names`),
+    case-insensitively. E.g. ['FORM', 'UPOS', 'HEAD', 'DEPREL']. By default, all fields. The token attributes that
+    other fields need (e.g. the morphological features for FEATS) are not even read. The other fields are `_` in the
+    output, so that it is still valid CoNLL-U, unless `drop_unselected_fields` is enabled. ID is then always
+    included
+    :param drop_unselected_fields: whether to leave the fields that are not in `fields` out of all representations,
+    rather than filling them with `_`. Note that the `conll_str` output is then no longer valid CoNLL-U.
     """
 
     conversion_maps: Optional[Dict[str, Dict[str, str]]] = None
@@ -102,22 +376,78 @@ class ConllFormatter:
     field_names: Dict[str, str] = field(default_factory=dict)
     include_headers: bool = False
     disable_pandas: bool = False
+    lazy: bool = False
+    memoize: bool = True
+    include_array: bool = False
+    pd_dtypes: Optional[Union[str, Dict[str, Union[str, List[str]]]]] = None
+    levels: Optional[List[str]] = None
+    representations: Optional[List[str]] = None
+    fields: Optional[List[str]] = None
+    drop_unselected_fields: bool = False
 
     def __post_init__(self):
         # Set custom attribute names so that users can access them with their own preference
-        default_ext_names = {"conll_str": "conll_str", "conll": "conll", "conll_pd": "conll_pd"}
+        default_ext_names = {
+            "conll_str": "conll_str",
+            "conll": "conll",
+            "conll_pd": "conll_pd",
+            "conll_array": "conll_array",
+        }
         self.ext_names = merge_dicts_strict(default_ext_names, self.ext_names)
         default_field_names = {fname: fname for fname in CONLL_FIELD_NAMES}
         self.field_names = merge_dicts_strict(default_field_names, self.field_names)
 
+        if isinstance(self.pd_dtypes, str):
+            if self.pd_dtypes not in PD_DTYPES_PRESETS:
+                raise ValueError(
+                    f"Unknown 'pd_dtypes' preset {self.pd_dtypes}. Valid options are {list(PD_DTYPES_PRESETS.keys())}"
+                )
+            self._pd_dtypes = PD_DTYPES_PRESETS[self.pd_dtypes]
+        else:
+            self._pd_dtypes = merge_dicts_strict(dict.fromkeys(CONLL_FIELD_NAMES), self.pd_dtypes or {})
+
+        self.levels = self._check_options("levels", self.levels, CONLL_LEVELS)
+        self.representations = self._check_options("representations", self.representations, CONLL_REPRESENTATIONS)
+        self._use_pd = PD_AVAILABLE and not self.disable_pandas and "conll_pd" in self.representations
+
+        # Default names of the selected fields and of the fields in the output, in the order of CONLL_FIELD_NAMES
+        if self.fields is None:
+            self._fields = list(CONLL_FIELD_NAMES)
+        else:
+            selected = {self._resolve_field_name(name, "fields") for name in self.fields}
+            # ID is needed for valid CoNLL-U and costs next to nothing, so it is only left out when it is dropped
+            if not self.drop_unselected_fields:
+                selected.add("ID")
+            self._fields = [field_name for field_name in CONLL_FIELD_NAMES if field_name in selected]
+        self._output_fields = self._fields if self.drop_unselected_fields else list(CONLL_FIELD_NAMES)
+        self._output_field_names = [self.field_names[field_name] for field_name in self._output_fields]
+        # ID is always computed, it is needed to find sentence boundaries in `conll_array`
+        self._array_fields = [
+            field_name for field_name in CONLL_FIELD_NAMES if field_name == "ID" or field_name in self._fields
+        ]
+        self._array_attrs = [
+            attr for attr in ARRAY_ATTRS if any(attr in FIELD_ATTRS[field_name] for field_name in self._fields)
+        ]
+
+        self._conversion_maps, self._conversion_tables = self._compile_conversion_maps()
+
+        # Lazy Docs refer to their formatter by its ID. They also store its configuration, so that the formatter can
+        # be recreated when the Doc is unpickled in another process
+        if self.lazy:
+            self._id = uuid4().hex
+            self._config = asdict(self)
+            _LAZY_FORMATTERS[self._id] = self
+
         # Initialize extensions
         self._set_extensions()
 
-    def __call__(self, doc: Doc) -> Doc:
+    def __call__(self, doc: Doc, sent_id_offset: int = 0) -> Doc:
         """Runs the pipeline component, adding the extensions to Underscore ._.. Adds a string representation,
         string representation containing a header, and a tuple representation of the CoNLL format to the
         given Doc and its sentences.
         :param doc: the input Doc
+        :param sent_id_offset: number that is added to the sentence IDs in the headers, so that the first sentence
+         of the Doc gets ID sent_id_offset + 1. Useful to number sentences consecutively across multiple Docs
         :return: the modified Doc containing the newly added extensions
         """
         # We need to hook the extensions again when using
@@ -125,118 +455,555 @@ class ConllFormatter:
         # see: https://github.com/explosion/spaCy/issues/4903
         self._set_extensions()
 
-        for sent_idx, sent in enumerate(doc.sents, 1):
-            self._set_span_conll(sent, sent_idx)
+        # Store the offset in the Doc, so that it is also available to the getters in lazy mode
+        if sent_id_offset:
+            doc.user_data[SENT_ID_OFFSET_KEY] = sent_id_offset
+        else:
+            doc.user_data.pop(SENT_ID_OFFSET_KEY, None)
 
-        doc._.set(self.ext_names["conll"], [s._.get(self.ext_names["conll"]) for s in doc.sents])
-        doc._.set(
-            self.ext_names["conll_str"],
-            "\n".join([s._.get(self.ext_names["conll_str"]) for s in doc.sents]),
-        )
+        # In lazy mode, the extensions are computed by their getters upon access. Values that were memoized for
+        # another formatter are outdated
+        if self.lazy:
+            for key in [key for key in doc.user_data if key[0] == "spacy_conll" and key[1] in _LAZY_EXTS]:
+                del doc.user_data[key]
+            doc.user_data[LAZY_FORMATTER_KEY] = (self._id, self._config)
+            return doc
+
+        doc.user_data.pop(LAZY_FORMATTER_KEY, None)
+
+        sents = list(doc.sents)
+        conll_array = self._get_conll_array(sents)
+        if self.include_array:
+            doc._.set(self.ext_names["conll_array"], self._rename_conll_array(conll_array))
+
+        # Only the representations and levels that were asked for are computed and stored
+        use_dicts = "conll" in self.representations
+        use_str = "conll_str" in self.representations
+        use_pd = self._use_pd
+        use_doc = "doc" in self.levels
+        use_sents = "sent" in self.levels
+        use_tokens = "token" in self.levels
+        if not (use_dicts or use_str or use_pd) or not (use_doc or use_sents or use_tokens):
+            return doc
 
-        if PD_AVAILABLE and not self.disable_pandas:
-            doc._.set(
-                self.ext_names["conll_pd"],
-                pd.concat([s._.get(self.ext_names["conll_pd"]) for s in doc.sents]).reset_index(drop=True),
-            )
+        columns = self._decode_conll_array(conll_array, doc.vocab.strings)
+        lines = self._get_conll_lines(columns) if use_str else None
+        field_names = self._output_field_names
+        tokens_conll = [OrderedDict(zip(field_names, row)) for row in zip(*columns)] if use_dicts else None
+
+        if use_tokens:
+            # Setting the token extensions through `token._` is slow for large documents, so we write the values
+            # directly to where Underscore would store them: the Doc's user_data
+            user_data = doc.user_data
+            tokens_info = doc.to_array([IDX, SPACY]).tolist()
+            if use_dicts:
+                for (token_idx, _), token_conll in zip(tokens_info, tokens_conll):
+                    user_data[("._.", self.ext_names["conll"], token_idx, None)] = token_conll
+            if use_str:
+                for (token_idx, _), line in zip(tokens_info, lines):
+                    user_data[("._.", self.ext_names["conll_str"], token_idx, None)] = line + "\n"
+            for token_idx, space in tokens_info:
+                user_data[("._.", "conll_misc_field", token_idx, None)] = "_" if space else "SpaceAfter=No"
+
+        # The DataFrame is built once for the whole Doc. Sentence DataFrames are slices of it, and Token Series
+        # are only created when they are accessed
+        doc_conll_pd = self._get_conll_pd(columns) if use_pd else None
+        if use_pd and use_tokens:
+            doc.user_data[DOC_CONLL_PD_KEY] = doc_conll_pd
+
+        if not (use_doc or use_sents):
+            return doc
+
+        sents_conll = []
+        sents_conll_str = []
+        for sent_idx, sent in enumerate(sents, 1):
+            if use_dicts:
+                sent_conll = tokens_conll[sent.start : sent.end]
+                sents_conll.append(sent_conll)
+                if use_sents:
+                    sent._.set(self.ext_names["conll"], sent_conll)
+
+            if use_str:
+                sent_conll_str = ""
+                if self.include_headers:
+                    sent_conll_str = self._get_sent_header(sent, sent_idx, set_metadata=use_sents)
+                sent_conll_str += "\n".join(lines[sent.start : sent.end]) + "\n"
+                sents_conll_str.append(sent_conll_str)
+                if use_sents:
+                    sent._.set(self.ext_names["conll_str"], sent_conll_str)
+
+            if use_pd and use_sents:
+                sent._.set(self.ext_names["conll_pd"], doc_conll_pd.iloc[sent.start : sent.end].reset_index(drop=True))
+
+        if use_doc:
+            if use_dicts:
+                doc._.set(self.ext_names["conll"], sents_conll)
+            if use_str:
+                doc._.set(self.ext_names["conll_str"], "\n".join(sents_conll_str))
+            if use_pd:
+                doc._.set(self.ext_names["conll_pd"], doc_conll_pd)
 
         return doc
 
+    @staticmethod
+    def _check_options(name: str, values: Optional[Sequence[str]], options: List[str]) -> List[str]:
+        """Checks the values of the `levels` or `representations` option.
+        :param name: the name of the option
+        :param values: the given values, or None for all options
+        :param options: the valid values
+        :return: the values as a list
+        """
+        if values is None:
+            return list(options)
+
+        unknown = [value for value in values if value not in options]
+        if unknown:
+            raise ValueError(f"Unknown value(s) {unknown} for '{name}'. Valid options are {options}")
+
+        return list(values)
+
+    def _get_conll_array(self, sents: List[Span]) -> Dict[str, np.ndarray]:
+        """Gets the CoNLL-U fields of all tokens in the given sentences as NumPy arrays, one for each field. ID and
+        HEAD are stored as int32, all other fields as the ID (hash) of their string value in the Doc's StringStore.
+        Those string values are exactly those of the other representations, i.e. including the conversion maps and
+        `_` for empty values. Rather than accessing the properties of every token separately, the attributes that
+        the selected fields need are exported at once with `to_array`, and sentence-relative IDs and heads are
+        computed with NumPy.
+        :param sents: consecutive sentence Spans, e.g. all sentences of a Doc
+        :return: a dictionary with the default CoNLL-U field names of ID and the selected fields as keys and the
+         arrays as values
+        """
+        array_fields = self._array_fields
+        if not sents:
+            return {
+                field_name: np.zeros(0, dtype=np.int32 if field_name in ("ID", "HEAD") else np.uint64)
+                for field_name in array_fields
+            }
+
+        doc = sents[0].doc
+        start = sents[0].start
+        attrs = self._array_attrs
+        # Span.to_array iterates over the tokens in Python, so for more than one sentence it is much faster to
+        # export the whole Doc and slice it
+        if not attrs:
+            arr = np.zeros((sents[-1].end - start, 0), dtype=np.uint64)
+        elif len(sents) == 1:
+            arr = sents[0].to_array(attrs)
+        else:
+            arr = doc.to_array(attrs)[start : sents[-1].end]
+        # A single attribute is exported as a 1D array
+        arr = arr.reshape(len(arr), len(attrs))
+        attr_values = dict(zip(attrs, arr.T))
+
+        # Sentence-relative token IDs and heads, based on the offset of the sentence that each token belongs to
+        sent_starts = np.array([sent.start - start for sent in sents])
+        sent_lens = np.array([len(sent) for sent in sents])
+        token_sent_starts = np.repeat(sent_starts, sent_lens)
+        positions = np.arange(len(arr))
+        strings = doc.vocab.strings
+
+        conll_array = {}
+        for field_name in array_fields:
+            if field_name == "ID":
+                values = (positions - token_sent_starts + 1).astype(np.int32)
+            elif field_name == "HEAD":
+                # Heads are exported as offsets relative to the token, wrapped around as unsigned integers
+                heads = positions + attr_values[HEAD].view(np.int64) - token_sent_starts + 1
+                deps = attr_values[DEP]
+                root_deps = [dep for dep in np.unique(deps).tolist() if strings[dep].lower().strip() == "root"]
+                heads[np.isin(deps, root_deps)] = 0
+                values = heads.astype(np.int32)
+            elif field_name == "DEPS":
+                deps_default = Token.get_extension("conll_deps_graphs_field")[0]
+                user_data = doc.user_data
+                deps_graphs = [
+                    user_data.get(("._.", "conll_deps_graphs_field", idx, None), deps_default)
+                    for idx in attr_values[IDX].tolist()
+                ]
+                deps_graphs_ids = {deps_graph: strings.add(str(deps_graph)) for deps_graph in set(deps_graphs)}
+                values = np.array([deps_graphs_ids[deps_graph] for deps_graph in deps_graphs], dtype=np.uint64)
+            elif field_name == "MISC":
+                values = np.where(attr_values[SPACY], strings.add("_"), strings.add("SpaceAfter=No")).astype(np.uint64)
+            else:
+                values = attr_values[FIELD_ATTRS[field_name][0]]
+                # Replace empty values (which have ID 0) by an underscore
+                values = np.where(values == 0, strings.add("_"), values)
+
+            conll_array[field_name] = values
+
+        # Convert the labels if needed. This only has to be done once for every unique value in a column, and only
+        # for the values that are actually in the conversion table
+        for field_name, conversion_table in self._conversion_tables.items():
+            if field_name not in conll_array:
+                continue
+
+            values = np.unique(conll_array[field_name])
+            new_values = values.copy()
+            is_converted = False
+            for value_idx, value in enumerate(values.tolist()):
+                if value in conversion_table:
+                    new_values[value_idx] = strings.add(conversion_table[value])
+                    is_converted = True
+            if is_converted:
+                conll_array[field_name] = new_values[np.searchsorted(values, conll_array[field_name])]
+
+        return conll_array
+
+    def _get_conll_columns(self, sents: List[Span]) -> List[List[Any]]:
+        """Gets the CoNLL-U fields of all tokens in the given sentences as columns (one list of values per field in
+        the output, in the order of `CONLL_FIELD_NAMES`). See `_get_conll_array`.
+        :param sents: consecutive sentence Spans, e.g. all sentences of a Doc
+        :return: a list of columns, one for each CoNLL-U field in the output
+        """
+        if not sents:
+            return [[] for _ in self._output_fields]
+
+        return self._decode_conll_array(self._get_conll_array(sents), sents[0].doc.vocab.strings)
+
+    def _decode_conll_array(self, conll_array: Dict[str, np.ndarray], strings: StringStore) -> List[List[Any]]:
+        """Decodes the arrays that are created by `_get_conll_array` into columns of values. String values are
+        only looked up once for every unique value in a column. Fields that are not selected are filled with `_`.
+        :param conll_array: a dictionary with the default CoNLL-U field names as keys and the arrays as values
+        :param strings: the StringStore to look up the strings in
+        :return: a list of columns, one for each CoNLL-U field in the output
+        """
+        columns = []
+        for field_name in self._output_fields:
+            if field_name not in self._fields:
+                columns.append(["_"] * len(conll_array["ID"]))
+                continue
+
+            values = conll_array[field_name]
+            if field_name in ("ID", "HEAD"):
+                column = values.tolist()
+                # convert properties if needed. Conversion maps for ID and HEAD are not reflected in the array
+                conversion_map = self._conversion_maps.get(field_name)
+                if conversion_map:
+                    column = [conversion_map.get(value, value) for value in column]
+            else:
+                unique_strings = {value: strings[value] for value in np.unique(values).tolist()}
+                column = [unique_strings[value] for value in values.tolist()]
+
+            columns.append(column)
+
+        return columns
+
+    def _compile_conversion_maps(self) -> Tuple[Dict[str, Dict[Any, Any]], Dict[str, Dict[int, str]]]:
+        """Resolves the field names in `self.conversion_maps` and compiles the maps into lookup tables. A field can
+        be given by its custom name (see `field_names`) or its default CoNLL-U name, case-insensitively. For string
+        fields, the tables are keyed by the StringStore ID of the original value, which is independent of the
+        vocabulary, so that they can be applied directly to the arrays created by `Doc.to_array`.
+        :return: a tuple of the conversion maps and the lookup tables of the string fields, with the default
+         CoNLL-U field names as keys
+        """
+        if not self.conversion_maps:
+            return {}, {}
+
+        conversion_maps = {}
+        conversion_tables = {}
+        for name, conversion_map in self.conversion_maps.items():
+            # Maps of unknown fields used to be ignored silently, so existing configurations only lead to a warning
+            field_name = self._resolve_field_name(name, "conversion_maps", strict=False)
+            if field_name is None:
+                continue
+            elif field_name in ("ID", "HEAD"):
+                conversion_maps[field_name] = dict(conversion_map)
+            else:
+                conversion_maps[field_name] = {str(k): str(v) for k, v in conversion_map.items()}
+                conversion_tables[field_name] = {get_string_id(k): v for k, v in conversion_maps[field_name].items()}
+
+        return conversion_maps, conversion_tables
+
+    def _resolve_field_name(self, name: str, option: str, strict: bool = True) -> Optional[str]:
+        """Gets the default CoNLL-U name of a field that is given by its custom name (see `field_names`) or its default
+        name, case-insensitively. Exact matches have precedence over case-insensitive ones.
+        :param name: the name of the field
+        :param option: the option that the name was given in, for the error message
+        :param strict: whether to raise a KeyError for an unknown field, rather than to warn and return None
+        :return: the default CoNLL-U name of the field, or None if it is unknown and 'strict' is disabled
+        """
+        for field_name, custom_name in self.field_names.items():
+            if name == custom_name:
+                return field_name
+
+        for field_name, custom_name in self.field_names.items():
+            if name.lower() in (field_name.lower(), custom_name.lower()):
+                return field_name
+
+        msg = (
+            f"Unknown field name {name} in '{option}'. Valid keys are {list(self.field_names.values())}"
+            f" or {CONLL_FIELD_NAMES}"
+        )
+        if strict:
+            raise KeyError(msg)
+
+        warnings.warn(f"{msg}. It is ignored.")
+        return None
+
+    def _get_conll_pd(self, columns: List[List[Any]]) -> "pd.DataFrame":
+        """Builds a DataFrame from columns of CoNLL-U fields, with the field names as column headers.
+        :param columns: a list of columns, one for each CoNLL-U field, as returned by `_get_conll_columns`
+        :return: a DataFrame with a row for every token
+        """
+        import pandas as pd
+
+        conll_pd = {}
+        for field_name, column in zip(self._output_fields, columns):
+            # Fields that are not selected only contain `_`
+            dtype = self._pd_dtypes.get(field_name) if field_name in self._fields else None
+            if isinstance(dtype, (list, tuple)):
+                dtype = pd.CategoricalDtype(dtype)
+            if isinstance(dtype, str) and dtype == "downcast":
+                column = pd.to_numeric(pd.Series(column), downcast="integer")
+            elif isinstance(dtype, pd.CategoricalDtype) and dtype.categories is not None:
+                # Values that are not in the given categories are added to them rather than becoming NaN
+                unknown = sorted(set(column).difference(dtype.categories))
+                if unknown:
+                    dtype = pd.CategoricalDtype([*dtype.categories, *unknown], ordered=dtype.ordered)
+                column = pd.Series(column, dtype=dtype)
+            else:
+                column = pd.Series(column, dtype=dtype)
+            conll_pd[self.field_names[field_name]] = column
+
+        return pd.DataFrame(conll_pd)
+
+    def _rename_conll_array(self, conll_array: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Renames the keys of the arrays created by `_get_conll_array` to the user-defined field names.
+        :param conll_array: a dictionary with the default CoNLL-U field names as keys and the arrays as values
+        :return: a dictionary with `self.field_names` as keys and the arrays as values
+        """
+        return {self.field_names[field_name]: values for field_name, values in conll_array.items()}
+
+    def _get_conll_lines(self, columns: List[List[Any]]) -> List[str]:
+        """Joins columns of CoNLL-U fields into tab-separated lines, one line per token (without trailing newline).
+        :param columns: a list of columns, one for each CoNLL-U field, as returned by `_get_conll_columns`
+        :return: a list of CoNLL-U formatted lines
+        """
+        return ["\t".join(row) for row in zip(*[list(map(str, column)) for column in columns])]
+
+    def _get_sent_header(self, sent: Span, sent_idx: Optional[int] = None, set_metadata: bool = False) -> str:
+        """Gets the CoNLL-U header of a sentence. If the `conll_metadata` extension of the sentence is set (e.g.
+        when it was read from a CoNLL-U file), it is used. Otherwise, a header with the sentence ID and the text
+        is created.
+        :param sent: a sentence Span
+        :param sent_idx: the index of the sentence in its Doc, starting from 1. If not given, it is looked up. The
+         sentence ID offset of the Doc (see `__call__`) is added to it
+        :param set_metadata: whether to save a newly created header in the sentence's `conll_metadata` extension
+        :return: the header of the sentence
+        """
+        if sent.has_extension("conll_metadata") and sent._.conll_metadata:
+            return sent._.conll_metadata
+
+        if sent_idx is None:
+            sent_idx = next(idx for idx, s in enumerate(sent.doc.sents, 1) if s.start == sent.start)
+
+        header = format_sent_header(sent_idx + sent.doc.user_data.get(SENT_ID_OFFSET_KEY, 0), sent.text)
+        if set_metadata:
+            sent._.conll_metadata = header
+
+        return header
+
     def _map_conll(self, token_conll_d: Dict[str, Union[str, int]]) -> Dict[str, Union[str, int]]:
-        """Maps labels according to a given `self._conversion_maps`.
+        """Maps labels according to the compiled `self.conversion_maps`.
         This can be useful when users want to change the output labels of a
         model to their own tagset.
 
         :param token_conll_d: a token's conll representation as dict (field_name: value)
         :return: the modified dict where the labels have been replaced according to the converison maps
         """
-        for k, v in token_conll_d.items():
-            try:
-                token_conll_d[k] = self.conversion_maps[k][v]
-            except KeyError:
+        for field_name, conversion_map in self._conversion_maps.items():
+            # Fields that are not selected only contain `_`
+            if field_name not in self._fields:
                 continue
 
+            custom_name = self.field_names[field_name]
+            value = token_conll_d[custom_name]
+            if value in conversion_map:
+                token_conll_d[custom_name] = conversion_map[value]
+
         return token_conll_d
 
-    def _set_span_conll(self, span: Span, span_idx: int = 1):
-        """Sets a span's properties according to the CoNLL-U format.
-        :param span: a spaCy Span
-        :param span_idx: optional index, corresponding to the n-th sentence
-                         in the parent Doc
+    def _set_token_conll(self, token: Token, token_idx: int = 1) -> Token:
+        """Sets a token's properties according to the CoNLL-U format.
+        :param token: a spaCy Token
+        :param token_idx: optional index, corresponding to the n-th token in the sentence Span
         """
-        span_conll_str = ""
-        if self.include_headers:
-            # Get metadata from custom extension or create it ourselves
-            if not (span.has_extension("conll_metadata") and span._.conll_metadata):
-                span._.conll_metadata = f"# sent_id = {span_idx}\n# text = {span.text}\n"
-
-            span_conll_str += span._.conll_metadata
+        token._.conll_misc_field = "_" if token.whitespace_ else "SpaceAfter=No"
 
-        for token_idx, token in enumerate(span, 1):
-            self._set_token_conll(token, token_idx)
+        token_conll_d = self._get_token_conll(token, token_idx)
 
-        span._.set(self.ext_names["conll"], [t._.get(self.ext_names["conll"]) for t in span])
-        span_conll_str += "".join([t._.get(self.ext_names["conll_str"]) for t in span])
-        span._.set(self.ext_names["conll_str"], span_conll_str)
+        token._.set(self.ext_names["conll"], token_conll_d)
+        token_conll_str = "\t".join(map(str, token_conll_d.values())) + "\n"
+        token._.set(self.ext_names["conll_str"], token_conll_str)
 
-        if PD_AVAILABLE and not self.disable_pandas:
-            span._.set(
-                self.ext_names["conll_pd"],
-                pd.DataFrame([t._.get(self.ext_names["conll"]) for t in span]),
-            )
+        return token
 
-    def _set_token_conll(self, token: Token, token_idx: int = 1) -> Token:
-        """Sets a token's properties according to the CoNLL-U format.
+    def _get_token_conll(self, token: Token, token_idx: int = 1, misc: Optional[str] = None) -> Dict[str, Any]:
+        """Gets a token's properties according to the CoNLL-U format as a dictionary with the field names as keys.
         :param token: a spaCy Token
         :param token_idx: optional index, corresponding to the n-th token in the sentence Span
+        :param misc: the value of the MISC field. If not given, the `conll_misc_field` extension is used
+        :return: the token's CoNLL-U properties as an (ordered) dictionary
         """
-        if token.dep_.lower().strip() == "root":
-            head_idx = 0
+        # Only the selected fields are computed, the others are `_`
+        token_conll = [
+            self._get_token_field(token, field_name, token_idx, misc) if field_name in self._fields else "_"
+            for field_name in self._output_fields
+        ]
+
+        # turn field name values (keys) and token values (values) into dict
+        token_conll_d = OrderedDict(zip(self._output_field_names, token_conll))
+
+        # convert properties if needed
+        if self._conversion_maps:
+            token_conll_d = self._map_conll(token_conll_d)
+
+        return token_conll_d
+
+    @staticmethod
+    def _get_token_field(token: Token, field_name: str, token_idx: int, misc: Optional[str]) -> Union[str, int]:
+        """Gets the value of a single CoNLL-U field of a token. See `_get_token_conll`.
+        :param token: a spaCy Token
+        :param field_name: the default CoNLL-U name of the field
+        :param token_idx: index, corresponding to the n-th token in the sentence Span
+        :param misc: the value of the MISC field. If not given, the `conll_misc_field` extension is used
+        :return: the value of the field
+        """
+        if field_name == "ID":
+            return token_idx
+        elif field_name == "FORM":
+            return token.text
+        elif field_name == "LEMMA":
+            return token.lemma_ if token.lemma_ else "_"
+        elif field_name == "UPOS":
+            return token.pos_ if token.pos_ else "_"
+        elif field_name == "XPOS":
+            return token.tag_ if token.tag_ else "_"
+        elif field_name == "FEATS":
+            return str(token.morph) if token.has_morph and str(token.morph) else "_"
+        elif field_name == "HEAD":
+            return 0 if token.dep_.lower().strip() == "root" else token.head.i + 1 - token.sent[0].i
+        elif field_name == "DEPREL":
+            return token.dep_ if token.dep_ else "_"
+        elif field_name == "DEPS":
+            return token._.conll_deps_graphs_field
         else:
-            head_idx = token.head.i + 1 - token.sent[0].i
+            return token._.conll_misc_field if misc is None else misc
 
-        token._.conll_misc_field = "_" if token.whitespace_ else "SpaceAfter=No"
+    def _get_lazy_conll(self, obj: Union[Doc, Span, Token], ext: str, ext_name: str) -> Any:
+        """Getter for the extensions in lazy mode. Computes the requested CoNLL representation of a Doc, a
+        sentence Span or a Token and memoizes it in the Doc's `user_data` if `self.memoize` is enabled.
+        :param obj: the Doc, Span or Token whose extension was accessed
+        :param ext: the (default) name of the extension: 'conll', 'conll_str', 'conll_pd', or 'conll_array'
+        :param ext_name: the name of the extension that was accessed
+        :return: the requested CoNLL representation, or None if this formatter does not provide the extension
+        """
+        if isinstance(obj, Token):
+            level, key = "token", ("spacy_conll", ext, obj.idx, None)
+        elif isinstance(obj, Span):
+            level, key = "sent", ("spacy_conll", ext, obj.start_char, obj.end_char)
+        else:
+            level, key = "doc", ("spacy_conll", ext, None, None)
+
+        if self.ext_names[ext] != ext_name or not self._has_extension(level, ext):
+            return None
+
+        user_data = obj.doc.user_data
+        if self.memoize and key in user_data:
+            return user_data[key]
 
-        token_conll = (
-            token_idx,
-            token.text,
-            token.lemma_ if token.lemma_ else "_",
-            token.pos_ if token.pos_ else "_",
-            token.tag_ if token.tag_ else "_",
-            str(token.morph) if token.has_morph and str(token.morph) else "_",
-            head_idx,
-            token.dep_ if token.dep_ else "_",
-            token._.conll_deps_graphs_field,
-            token._.conll_misc_field,
+        if isinstance(obj, Token):
+            value = self._compute_lazy_token_conll(obj, ext)
+        elif isinstance(obj, Span):
+            value = self._compute_lazy_span_conll(obj, ext)
+        else:
+            value = self._compute_lazy_doc_conll(obj, ext)
+
+        if self.memoize:
+            user_data[key] = value
+
+        return value
+
+    def _compute_lazy_token_conll(self, token: Token, ext: str) -> Any:
+        token_conll_d = self._get_token_conll(
+            token, token.i - token.sent.start + 1, misc="_" if token.whitespace_ else "SpaceAfter=No"
         )
+        if ext == "conll":
+            return token_conll_d
+        elif ext == "conll_str":
+            return "\t".join(map(str, token_conll_d.values())) + "\n"
+        else:
+            import pandas as pd
 
-        # turn field name values (keys) and token values (values) into dict
-        token_conll_d = OrderedDict(zip(list(self.field_names.values()), token_conll))
+            return pd.Series(token_conll_d)
 
-        # convert properties if needed
-        if self.conversion_maps:
-            token_conll_d = self._map_conll(token_conll_d)
+    def _compute_lazy_span_conll(self, span: Span, ext: str) -> Any:
+        # Like in non-lazy mode, only sentences get CoNLL properties
+        sent = span.sent
+        if sent.start != span.start or sent.end != span.end:
+            return None
 
-        token._.set(self.ext_names["conll"], token_conll_d)
-        token_conll_str = "\t".join(map(str, token_conll_d.values())) + "\n"
-        token._.set(self.ext_names["conll_str"], token_conll_str)
+        return self._compute_lazy_sents_conll([span], ext)[0]
 
-        if PD_AVAILABLE and not self.disable_pandas:
-            token._.set(self.ext_names["conll_pd"], pd.Series(token_conll_d))
+    def _compute_lazy_doc_conll(self, doc: Doc, ext: str) -> Any:
+        sents = list(doc.sents)
+        if ext == "conll_array":
+            return self._rename_conll_array(self._get_conll_array(sents))
 
-        return token
+        elif ext == "conll_pd":
+            return self._get_conll_pd(self._get_conll_columns(sents))
 
-    def _set_extensions(self):
-        """Sets the default extensions if they do not exist yet."""
-        for obj in Doc, Span, Token:
-            if not obj.has_extension(self.ext_names["conll_str"]):
-                obj.set_extension(self.ext_names["conll_str"], default=None)
-            if not obj.has_extension(self.ext_names["conll"]):
-                obj.set_extension(self.ext_names["conll"], default=None)
+        sents_conll = self._compute_lazy_sents_conll(sents, ext, sent_idxs=range(1, len(sents) + 1))
+        if ext == "conll":
+            return sents_conll
+        else:
+            return "\n".join(sents_conll)
 
-            if PD_AVAILABLE and not self.disable_pandas:
-                if not obj.has_extension(self.ext_names["conll_pd"]):
-                    obj.set_extension(self.ext_names["conll_pd"], default=None)
+    def _compute_lazy_sents_conll(
+        self, sents: List[Span], ext: str, sent_idxs: Optional[Sequence[int]] = None
+    ) -> List:
+        columns = self._get_conll_columns(sents)
+        sents_conll = []
+        offset = 0
+        if ext == "conll_str":
+            lines = self._get_conll_lines(columns)
+            for sent_pos, sent in enumerate(sents):
+                sent_conll_str = ""
+                if self.include_headers:
+                    sent_conll_str = self._get_sent_header(sent, sent_idxs[sent_pos] if sent_idxs else None)
+                sents_conll.append(sent_conll_str + "\n".join(lines[offset : offset + len(sent)]) + "\n")
+                offset += len(sent)
+        elif ext == "conll":
+            tokens_conll = [OrderedDict(zip(self._output_field_names, row)) for row in zip(*columns)]
+            for sent in sents:
+                sents_conll.append(tokens_conll[offset : offset + len(sent)])
+                offset += len(sent)
+        else:
+            conll_pd = self._get_conll_pd(columns)
+            for sent in sents:
+                sents_conll.append(conll_pd.iloc[offset : offset + len(sent)].reset_index(drop=True))
+                offset += len(sent)
+
+        return sents_conll
+
+    def _has_extension(self, level: str, ext: str) -> bool:
+        """Whether this formatter provides an extension on a level.
+        :param level: 'doc', 'sent' or 'token'
+        :param ext: the (default) name of the extension: 'conll', 'conll_str', 'conll_pd', or 'conll_array'
+        """
+        if ext == "conll_array":
+            return level == "doc" and self.include_array
+        elif ext == "conll_pd" and not self._use_pd:
+            return False
+
+        return level in self.levels and ext in self.representations
+
+    def _set_extensions(self):
+        """Sets the extensions of the selected levels and representations if they do not exist yet."""
+        for level, obj in (("doc", Doc), ("sent", Span), ("token", Token)):
+            for ext in _LAZY_EXTS:
+                if self._has_extension(level, ext):
+                    self._set_extension(obj, ext)
 
         # Adds fields from the CoNLL-U format that are not available in spaCy
         # However, ConllParser might set these fields when it has read CoNLL_str->spaCy
@@ -246,3 +1013,21 @@ class ConllFormatter:
             Token.set_extension("conll_misc_field", default="_")
         if not Span.has_extension("conll_metadata"):
             Span.set_extension("conll_metadata", default=None)
+
+    def _set_extension(self, obj: Union[Type[Doc], Type[Span], Type[Token]], ext: str):
+        """Registers a single extension on a Doc, Span or Token if it does not exist yet. All formatters register the
+        same getter and setter (see `_get_extension_accessors`), so that Docs keep their values when formatters with
+        other settings or another mode are created later. An extension with the same name that was registered by
+        the user or another component is left untouched.
+        :param obj: the class to register the extension on
+        :param ext: the (default) name of the extension: 'conll', 'conll_str', 'conll_pd', or 'conll_array'
+        """
+        ext_name = self.ext_names[ext]
+        getter, setter = _get_extension_accessors(ext, ext_name)
+        if obj.has_extension(ext_name):
+            registered_getter = obj.get_extension(ext_name)[2]
+            # Only extensions that a formatter registered for another representation may be replaced
+            if registered_getter is getter or not _is_extension_getter(registered_getter):
+                return
+
+        obj.set_extension(ext_name, getter=getter, setter=setter, force=True)
@@ -0,0 +1,244 @@
+import hashlib
+import mmap
+from dataclasses import dataclass, field
+from locale import getpreferredencoding
+from os import PathLike
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+from spacy.tokens import Doc
+from spacy_conll.compression import get_compression
+from spacy_conll.parser import ConllParser
+
+
+def get_conll_index_file(input_file: Union[PathLike, Path, str]) -> Path:
+    """Returns the default location of the index of a CoNLL-U file, which is a sidecar file next to it.
+    :param input_file: path to the CoNLL-U file
+    :return: path to the index file
+    """
+    input_file = Path(input_file)
+    return input_file.with_name(f"{input_file.name}.idx.npz")
+
+
+def build_conll_index(
+    input_file: Union[PathLike, Path, str],
+    index_file: Optional[Union[PathLike, Path, str]] = None,
+    input_encoding: str = getpreferredencoding(),
+) -> Path:
+    """Scans a CoNLL-U file once and writes an index with the byte offset, the length in bytes and a 64-bit hash of the
+    sent_id (or of an empty string if a sentence does not have one) of every sentence to a compressed NumPy file.
+    Storing hashes rather than the sent_ids themselves keeps the index small, the sent_ids can be read from the
+    CoNLL-U file. The index also contains the size and modification time of the CoNLL-U file so that an outdated index
+    can be detected.
+    :param input_file: path to the CoNLL-U file
+    :param index_file: path to write the index to. By default, see :py:func:`get_conll_index_file`
+    :param input_encoding: encoding of 'input_file', which must encode a newline as a single byte, like UTF-8 does
+    :return: path to the index file
+    """
+    if "\n".encode(input_encoding) != b"\n":
+        raise ValueError(f"Cannot index files with encoding {input_encoding}. Use UTF-8 instead.")
+
+    input_file = Path(input_file).resolve()
+    # Sentences are read from the file by their byte offset, which is not possible in a compressed stream
+    if get_compression(input_file, sniff=True) is not None:
+        raise ValueError(f"Cannot index compressed file {input_file}. Decompress it first.")
+    index_file = Path(index_file) if index_file is not None else get_conll_index_file(input_file)
+
+    offsets, lengths, sent_id_hashes = [], [], []
+    pos = 0
+    start = end = None
+    sent_id = b""
+    with input_file.open("rb") as fhin:
+        for line in fhin:
+            stripped = line.rstrip(b"\r\n")
+            if stripped:
+                if start is None:
+                    start = pos
+                    sent_id = b""
+                if stripped.startswith(b"# sent_id"):
+                    sent_id = _parse_sent_id(stripped)
+                end = pos + len(stripped)
+            elif start is not None:
+                offsets.append(start)
+                lengths.append(end - start)
+                sent_id_hashes.append(_hash_sent_id(sent_id))
+                start = None
+            pos += len(line)
+
+    if start is not None:
+        offsets.append(start)
+        lengths.append(end - start)
+        sent_id_hashes.append(_hash_sent_id(sent_id))
+
+    stat = input_file.stat()
+    # Do not use np.savez_compressed's automatic suffix, so that the index ends up exactly where we want it
+    with index_file.open("wb") as fhout:
+        np.savez_compressed(
+            fhout,
+            offsets=np.array(offsets, dtype=np.int64),
+            lengths=np.array(lengths, dtype=np.int64),
+            sent_id_hashes=np.array(sent_id_hashes, dtype=np.uint64),
+            file_size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+
+    return index_file
+
+
+@dataclass(eq=False, repr=False)
+class ConllIndex:
+    """Random access to the sentences of a (large) CoNLL-U file by position or by sent_id, by means of a sentence
+    offset index (see :py:func:`build_conll_index`). The CoNLL-U file is memory-mapped, and only the requested
+    sentences are parsed into a spaCy Doc with the given ConllParser (see
+    :py:meth:`ConllParser.parse_conll_text_as_spacy`). If the index does not exist yet, or if the CoNLL-U file has
+    changed since it was created, the index is (re)built.
+
+    Constructor arguments:
+    :param input_file: path to the CoNLL-U file
+    :param parser: ConllParser that is used to create Docs of the requested sentences
+    :param index_file: path to the index file. By default, see :py:func:`get_conll_index_file`
+    :param input_encoding: encoding of 'input_file', which must encode a newline as a single byte, like UTF-8 does
+    """
+
+    input_file: Union[PathLike, Path, str]
+    parser: ConllParser
+    index_file: Optional[Union[PathLike, Path, str]] = None
+    input_encoding: str = getpreferredencoding()
+    offsets: np.ndarray = field(init=False, default=None)
+    lengths: np.ndarray = field(init=False, default=None)
+    sent_id_hashes: np.ndarray = field(init=False, default=None)
+
+    def __post_init__(self):
+        self.input_file = Path(self.input_file).resolve()
+        self.index_file = (
+            Path(self.index_file) if self.index_file is not None else get_conll_index_file(self.input_file)
+        )
+
+        if not self.index_file.exists() or self._index_is_outdated():
+            build_conll_index(self.input_file, self.index_file, self.input_encoding)
+
+        with np.load(self.index_file) as index:
+            self.offsets = index["offsets"]
+            self.lengths = index["lengths"]
+            self.sent_id_hashes = index["sent_id_hashes"]
+
+        self._sent_id_order = None
+        self._sorted_sent_id_hashes = None
+        self._fhin = self.input_file.open("rb")
+        # An empty file cannot be memory-mapped, but then there are no sentences to look up anyway
+        self._mmap = mmap.mmap(self._fhin.fileno(), 0, access=mmap.ACCESS_READ) if len(self.offsets) else None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(input_file={self.input_file}, n_sents={len(self)})"
+
+    def __enter__(self) -> "ConllIndex":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes the memory-mapped CoNLL-U file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._fhin.close()
+
+    def get_conll_text(self, position: int) -> str:
+        """Returns the CoNLL-U text (metadata and token lines) of a single sentence.
+        :param position: the position of the sentence in the file, starting at 0
+        :return: the CoNLL-U text of the sentence
+        """
+        start = int(self.offsets[position])
+        return self._mmap[start : start + int(self.lengths[position])].decode(self.input_encoding)
+
+    def get_sent_id(self, position: int) -> str:
+        """Returns the sent_id of a single sentence.
+        :param position: the position of the sentence in the file, starting at 0
+        :return: the sent_id of the sentence, or an empty string if it does not have one
+        """
+        start = int(self.offsets[position])
+        sent_id = b""
+        for line in self._mmap[start : start + int(self.lengths[position])].splitlines():
+            if not line.startswith(b"#"):
+                break
+            if line.startswith(b"# sent_id"):
+                sent_id = _parse_sent_id(line)
+
+        return sent_id.decode(self.input_encoding)
+
+    def get_doc(self, positions: Union[int, Iterable[int]]) -> Doc:
+        """Parses the sentences at the given positions into a spaCy Doc.
+        :param positions: a position, or an iterable of positions of sentences in the file (starting at 0). The
+         sentences are added to the Doc in the given order
+        :return: a spacy Doc containing the requested sentences including the custom CoNLL extensions
+        """
+        positions = [positions] if isinstance(positions, (int, np.integer)) else list(positions)
+        if not positions:
+            raise ValueError("At least one sentence must be requested")
+
+        return self.parser.parse_conll_text_as_spacy("\n\n".join([self.get_conll_text(pos) for pos in positions]))
+
+    def get_doc_by_sent_id(self, sent_ids: Union[str, Iterable[str]]) -> Doc:
+        """Parses the sentences with the given sent_ids into a spaCy Doc. If a sent_id occurs more than once, the
+        first sentence with that sent_id is used.
+        :param sent_ids: a sent_id, or an iterable of sent_ids. The sentences are added to the Doc in the given order
+        :return: a spacy Doc containing the requested sentences including the custom CoNLL extensions
+        """
+        sent_ids = [sent_ids] if isinstance(sent_ids, str) else list(sent_ids)
+        return self.get_doc(self.get_positions(sent_ids))
+
+    def get_positions(self, sent_ids: Iterable[str]) -> List[int]:
+        """Looks up the positions of sentences by their sent_id. If a sent_id occurs more than once, the position of
+        the first sentence with that sent_id is returned.
+        :param sent_ids: an iterable of sent_ids
+        :return: a list of positions of sentences in the file
+        """
+        if self._sent_id_order is None:
+            # Sorting once is much more memory-efficient than a dict for millions of sentences
+            self._sent_id_order = np.argsort(self.sent_id_hashes, kind="stable")
+            self._sorted_sent_id_hashes = self.sent_id_hashes[self._sent_id_order]
+
+        sorted_hashes = self._sorted_sent_id_hashes
+        positions = []
+        for sent_id in sent_ids:
+            sent_id_hash = np.uint64(_hash_sent_id(sent_id.encode(self.input_encoding)))
+            start = np.searchsorted(sorted_hashes, sent_id_hash, side="left")
+            end = np.searchsorted(sorted_hashes, sent_id_hash, side="right")
+            # Different sent_ids may have the same hash, so the sent_id of a candidate is checked in the file. The
+            # candidates are in the order of the file because the sort is stable
+            position = next(
+                (
+                    int(self._sent_id_order[sorted_idx])
+                    for sorted_idx in range(start, end)
+                    if self.get_sent_id(int(self._sent_id_order[sorted_idx])) == sent_id
+                ),
+                None,
+            )
+            if position is None:
+                raise KeyError(f"sent_id {sent_id!r} not found in {self.input_file}")
+            positions.append(position)
+
+        return positions
+
+    def _index_is_outdated(self) -> bool:
+        stat = self.input_file.stat()
+        with np.load(self.index_file) as index:
+            # Indexes that were created by older versions contain the sent_ids themselves
+            if "sent_id_hashes" not in index.files:
+                return True
+            return int(index["file_size"]) != stat.st_size or int(index["mtime_ns"]) != stat.st_mtime_ns
+
+
+def _parse_sent_id(line: bytes) -> bytes:
+    """Gets the (encoded) sent_id from a '# sent_id = ...' line."""
+    return line.partition(b"=")[2].strip()
+
+
+def _hash_sent_id(sent_id: bytes) -> int:
+    """Gets the 64-bit hash of an (encoded) sent_id."""
+    return int.from_bytes(hashlib.blake2b(sent_id, digest_size=8).digest(), "little")
@@ -1,25 +1,38 @@
+import hashlib
+import json
+import multiprocessing
+import multiprocessing.pool
 import os
-import re
+import sys
+from collections import Counter, deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from itertools import islice
 from locale import getpreferredencoding
 from os import PathLike
 from pathlib import Path
-from typing import Dict, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from spacy import Errors, Language
 from spacy.tokens import Doc, Span, Token
 from spacy.training.converters.conllu_to_docs import get_entities
 from spacy.training.iob_utils import spans_from_biluo_tags
-from spacy_conll.utils import STANZA_AVAILABLE, UDPIPE_AVAILABLE
+from spacy.vocab import Vocab
+from spacy_conll.cache import CachedSents, ConllCache
+from spacy_conll.compression import open_file, open_file_atomic
+from spacy_conll.formatter import ConllFormatter, format_sent_header
+from spacy_conll.profiling import ConllStats, no_measure
+from spacy_conll.utils import get_torch_num_threads, init_parser, set_torch_threads
+from spacy_conll.version import __version__
 
 
-if STANZA_AVAILABLE:
-    from spacy_stanza.tokenizer import StanzaTokenizer
-
-if UDPIPE_AVAILABLE:
-    from spacy_udpipe import UDPipeTokenizer
-
-SENT_ID_RE = re.compile(r"(?<=# sent_id = )(\d+)")
+# Maximal number of consecutive lines in the cache that are read ahead while lines are being parsed. After that,
+# the lines that are being parsed are finished, so that the lines in the cache do not pile up in memory
+CACHE_READAHEAD = 10_000
+# Number of chunks per worker process that are sent to the "pool" backend ahead of time
+POOL_PREFETCH_FACTOR = 2
+# The ConllParser of a worker process of the "pool" backend
+_POOL_PARSER = None
 
 
 @dataclass(eq=False, repr=False)
@@ -29,24 +42,33 @@ class ConllParser:
 
     Constructor arguments:
     :param nlp: instantiated spaCy-like parser
+    :param cache: optional cache for the CoNLL output of input lines. Lines that are in the cache are not parsed
+     again when parsing text to CoNLL. See :py:class:`spacy_conll.cache.ConllCache`
+    :param init_kwargs: the arguments that 'nlp' was created with by `init_parser`, including 'model_or_lang' and
+     'parser'. With the "pool" backend, every worker process uses them to create its own pipeline. Without them, the
+     workers inherit 'nlp' from the main process, which is only possible on platforms that support forking
+    :param stats: optional instrumentation that records the time spent in every stage of parsing text to CoNLL, and
+     the number of lines, sentences, tokens and characters. See :py:class:`spacy_conll.profiling.ConllStats`
     """
 
     nlp: Language
+    cache: Optional[ConllCache] = None
+    init_kwargs: Optional[Dict[str, Any]] = None
+    stats: Optional[ConllStats] = None
     parser: str = field(init=False, default=None)
+    _cache_namespace: bytes = field(init=False, default=None)
 
     def __post_init__(self):
         if "conll_formatter" not in self.nlp.pipe_names:
             raise ValueError(Errors.E001.format(name="conll_formatter", opts=self.nlp.pipe_names))
 
-        # Figure out what kind of parser was provided (needed during data preparation)
-        if STANZA_AVAILABLE and isinstance(self.nlp.tokenizer, StanzaTokenizer):
+        # Figure out what kind of parser was provided (needed during data preparation). A stanza or udpipe
+        # tokenizer can only be in use if its library has already been imported, so we do not need to import it here
+        stanza_tokenizer = sys.modules.get("spacy_stanza.tokenizer")
+        udpipe = sys.modules.get("spacy_udpipe")
+        if stanza_tokenizer is not None and isinstance(self.nlp.tokenizer, stanza_tokenizer.StanzaTokenizer):
             self.parser = "stanza"
-            import torch
-
-            # Fixes some pickling issues
-            # See https://github.com/explosion/spacy-stanza/issues/34
-            torch.set_num_threads(1)
-        elif UDPIPE_AVAILABLE and isinstance(self.nlp.tokenizer, UDPipeTokenizer):
+        elif udpipe is not None and isinstance(self.nlp.tokenizer, udpipe.UDPipeTokenizer):
             self.parser = "udpipe"
         else:
             self.parser = "spacy"
@@ -60,11 +82,80 @@ class ConllParser:
         """Parses a given input file with self.parser and returns its CoNLL output.
         :param input_file: path to the input file to process
         :param input_encoding: encoding of 'input_file'
-        :param kwargs: keyword arguments that will be passed to `parse_text_as_conll`
+        :param kwargs: keyword arguments that will be passed to `iter_file_as_conll`
         """
-        text = Path(input_file).resolve().read_text(encoding=input_encoding)
+        return "\n".join(self.iter_file_as_conll(input_file, input_encoding, **kwargs))
 
-        return self.parse_text_as_conll(text, **kwargs)
+    def parse_files_as_conll(
+        self,
+        files: Iterable[Tuple[Union[PathLike, Path, str], Union[PathLike, Path, str]]],
+        input_encoding: str = getpreferredencoding(),
+        output_encoding: str = getpreferredencoding(),
+        n_process: int = 1,
+        backend: str = "pipe",
+        **kwargs,
+    ) -> List[Path]:
+        """Parses multiple input files with self.parser and writes the CoNLL output of every file to its own output
+        file. Sentence IDs start at 1 in every file. An output file only appears once it is complete, and missing
+        output directories are created. With the "pool" backend and 'n_process' > 1, whole files are distributed over
+        a single pool of worker processes that each have their own pipeline, which is much more efficient for many
+        small files than starting new processes for every file. Otherwise, the files are parsed one after the other
+        with `iter_file_as_conll`. Output files with the extension of a compression format (e.g. '.conllu.gz') are
+        compressed, see :py:func:`spacy_conll.compression.open_file`.
+        :param files: an iterable of tuples of an input file and the file to write its CoNLL output to
+        :param input_encoding: encoding of the input files
+        :param output_encoding: encoding of the output files
+        :param n_process: number of processes to use. -1 will use as many cores as available
+        :param backend: "pipe" or "pool", see `iter_lines_as_conll`
+        :param kwargs: keyword arguments that will be passed to `iter_file_as_conll`
+        :return: a list of the output files that were written
+        """
+        files = list(files)
+        if n_process == -1:
+            n_process = os.cpu_count() or 1
+
+        if backend == "pool" and n_process > 1 and len(files) > 1:
+            tasks = [
+                (input_file, output_file, input_encoding, output_encoding, kwargs) for input_file, output_file in files
+            ]
+            with self._worker_pool(min(n_process, len(files))) as pool:
+                return list(pool.imap(_parse_pool_file, tasks))
+        else:
+            kwargs = {"n_process": n_process, "backend": backend, **kwargs}
+            return [
+                self._write_conll_file(input_file, output_file, input_encoding, output_encoding, **kwargs)
+                for input_file, output_file in files
+            ]
+
+    def _write_conll_file(
+        self,
+        input_file: Union[PathLike, Path, str],
+        output_file: Union[PathLike, Path, str],
+        input_encoding: str,
+        output_encoding: str,
+        **kwargs,
+    ) -> Path:
+        """Parses an input file and writes its CoNLL output to a temporary file, which replaces 'output_file' when
+        it is complete.
+        :param input_file: path to the input file to process
+        :param output_file: path to write the CoNLL output to
+        :param input_encoding: encoding of 'input_file'
+        :param output_encoding: encoding of 'output_file'
+        :param kwargs: keyword arguments that will be passed to `iter_file_as_conll`
+        :return: the output file
+        """
+        measure = self.stats.measure if self.stats is not None else no_measure
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open_file_atomic(output_file, output_encoding) as fhout:
+            for sent_idx, conll_str in enumerate(self.iter_file_as_conll(input_file, input_encoding, **kwargs)):
+                with measure("write"):
+                    # Sentences are separated by an empty line
+                    if sent_idx > 0:
+                        fhout.write("\n")
+                    fhout.write(conll_str)
+
+        return output_file
 
     def parse_text_as_conll(
         self,
@@ -73,9 +164,132 @@ class ConllParser:
         no_force_counting: bool = False,
         ignore_pipe_errors: bool = False,
         no_split_on_newline: bool = False,
+        batch_size: Optional[int] = None,
+        bucket_window: Optional[int] = None,
+        backend: str = "pipe",
     ) -> str:
-        """Parses a given text (string) with self.parser and returns its CoNLL output.
+        """Parses a given text (string) with self.parser and returns its CoNLL output. This simply joins the sentences
+        that are generated by `iter_text_as_conll`. See that method for an explanation of the arguments.
         :param text: input text (string) to process
+        """
+        return "\n".join(
+            self.iter_text_as_conll(
+                text,
+                n_process=n_process,
+                no_force_counting=no_force_counting,
+                ignore_pipe_errors=ignore_pipe_errors,
+                no_split_on_newline=no_split_on_newline,
+                batch_size=batch_size,
+                bucket_window=bucket_window,
+                backend=backend,
+            )
+        )
+
+    def parse_texts_as_conll(
+        self,
+        texts: Sequence[str],
+        no_force_counting: bool = False,
+        no_split_on_newline: bool = False,
+        batch_size: Optional[int] = None,
+    ) -> List[str]:
+        """Parses multiple independent texts at once and returns the CoNLL output of every text, as if each of them
+        was parsed with `parse_text_as_conll`. The lines of all texts are processed together in nlp.pipe(), which is
+        much more efficient than parsing many small texts one by one. Sentence IDs start at 1 for every text.
+        :param texts: input texts (strings) to process
+        :param no_force_counting: see `iter_lines_as_conll`
+        :param no_split_on_newline: by default, the input texts will be split on newlines for faster processing. This
+               can be disabled with this option
+        :param batch_size: see `iter_lines_as_conll`
+        :return: a list with the CoNLL output of every text
+        """
+        formatter = self._get_sents_formatter()
+        force_counting = formatter.include_headers and not no_force_counting
+        conll_str_ext = formatter.ext_names["conll_str"]
+
+        lines = []
+        text_idxs = []
+        for text_idx, text in enumerate(texts):
+            text_lines = [text] if no_split_on_newline else text.splitlines()
+            lines.extend(text_lines)
+            text_idxs.extend([text_idx] * len(text_lines))
+
+        stats = self.stats
+        measure = stats.measure if stats is not None else no_measure
+        if stats is not None:
+            lines = list(stats.iter_counted_lines(lines))
+
+        texts_sents = [[] for _ in texts]
+        docs = self.nlp.pipe(lines, batch_size=batch_size, disable=["conll_formatter"])
+        if stats is not None:
+            docs = stats.iter_measured("pipe", docs)
+
+        for text_idx, doc in zip(text_idxs, docs):
+            sents = texts_sents[text_idx]
+            with measure("format"):
+                formatter(doc, sent_id_offset=len(sents) if force_counting else 0)
+                doc_sents = [sent._.get(conll_str_ext) for sent in doc.sents]
+            sents.extend(doc_sents)
+            if stats is not None:
+                stats.n_sents += len(doc_sents)
+                stats.n_tokens += len(doc)
+
+        return ["\n".join(sents) for sents in texts_sents]
+
+    def iter_file_as_conll(
+        self,
+        input_file: Union[PathLike, Path, str],
+        input_encoding: str = getpreferredencoding(),
+        no_split_on_newline: bool = False,
+        **kwargs,
+    ) -> Iterator[str]:
+        """Parses a given input file with self.parser and yields the CoNLL output of every sentence as soon as it
+        has been processed. Unless `no_split_on_newline` is given, the file is read line by line so that the full
+        file never needs to be loaded in memory. Compressed files (gzip, bz2, xz and, if `zstandard` is installed,
+        zstd) are decompressed on the fly, see :py:func:`spacy_conll.compression.open_file`.
+        :param input_file: path to the input file to process
+        :param input_encoding: encoding of 'input_file'
+        :param no_split_on_newline: by default, the input text will be split on newlines for faster processing. This
+               can be disabled with this option, in which case the whole file is read at once
+        :param kwargs: keyword arguments that will be passed to `iter_lines_as_conll`
+        """
+        input_file = Path(input_file).resolve()
+        if no_split_on_newline:
+            with open_file(input_file, encoding=input_encoding) as fhin:
+                text = fhin.read()
+            yield from self.iter_lines_as_conll([text], **kwargs)
+        else:
+            with open_file(input_file, encoding=input_encoding) as fhin:
+                # Some characters other than \n are considered line boundaries by str.splitlines. To stay consistent
+                # with `iter_text_as_conll`, we split each line once more
+                lines = (subline for line in fhin for subline in line.splitlines())
+                yield from self.iter_lines_as_conll(lines, **kwargs)
+
+    def iter_text_as_conll(self, text: str, no_split_on_newline: bool = False, **kwargs) -> Iterator[str]:
+        """Parses a given text (string) with self.parser and yields the CoNLL output of every sentence as soon as it
+        has been processed.
+        :param text: input text (string) to process
+        :param no_split_on_newline: by default, the input text will be split on newlines for faster processing. This
+               can be disabled with this option
+        :param kwargs: keyword arguments that will be passed to `iter_lines_as_conll`
+        """
+        measure = self.stats.measure if self.stats is not None else no_measure
+        with measure("split"):
+            lines = [text] if no_split_on_newline else text.splitlines()
+        yield from self.iter_lines_as_conll(lines, **kwargs)
+
+    def iter_lines_as_conll(
+        self,
+        lines: Iterable[str],
+        n_process: int = 1,
+        no_force_counting: bool = False,
+        ignore_pipe_errors: bool = False,
+        batch_size: Optional[int] = None,
+        bucket_window: Optional[int] = None,
+        backend: str = "pipe",
+    ) -> Iterator[str]:
+        """Parses the given lines with self.parser and yields the CoNLL output of every sentence. Lines are lazily
+        passed to `nlp.pipe`, so a generator can be used to process large inputs in constant memory.
+        :param lines: an iterable of strings to process, each of them will be processed as a separate Doc
         :param n_process: number of processes to use in nlp.pipe(). -1 will use as many cores as available. Might not
                work for a 'parser' other than 'spacy' depending on your environment
         :param no_force_counting: whether to  disable force counting the 'sent_id', starting from 1 and increasing for
@@ -85,17 +299,23 @@ class ConllParser:
                determine whether processing works on your system and stop execution if we think it doesn't. If you
                know what you are doing, you can ignore such pre-emptive errors, though, and run the code as-is, which
                will then throw the default Python errors when applicable
-        :param no_split_on_newline: by default, the input text will be split on newlines for faster processing. This
-               can be disabled with this option
+        :param batch_size: number of lines that are buffered and processed together in nlp.pipe(). By default, the
+               batch size of the nlp object is used
+        :param bucket_window: if given, windows of this many lines are buffered and sorted by length before they
+               are passed to nlp.pipe(), so that lines of similar length end up in the same batch. This is much more
+               efficient for parsers that pad their batches, like transformers or stanza. The output is still in
+               the original order
+        :param backend: how to use multiple processes when 'n_process' > 1. "pipe" uses nlp.pipe(n_process=...),
+               which sends the pipeline and the Docs between processes. "pool" starts a pool of worker processes that
+               each create their own pipeline (see 'init_kwargs') and only receive chunks of 'batch_size' lines and
+               return their CoNLL output, which works for every parser
         """
-        if n_process > 1 and not ignore_pipe_errors:
-            if not self.nlp.get_pipe("conll_formatter").disable_pandas:
-                raise OSError(
-                    "Due to pandas serialisation, 'n_process' > 1 is not supported when"
-                    " 'disable_pandas' is False in the ConllFormatter. Set 'n_process' to 1 or"
-                    " initialise the ConllFormatter with 'disable_pandas=True'"
-                )
+        if backend not in ("pipe", "pool"):
+            raise ValueError(f"Unexpected value {backend!r} for 'backend'. Options are: 'pipe', 'pool'")
 
+        # The formatter is not run in the worker processes of nlp.pipe (see below), so no DataFrames need to be
+        # pickled and pandas does not have to be disabled
+        if n_process > 1 and backend == "pipe" and not ignore_pipe_errors:
             # Seems that Windows only supports mp on spaCy. Both for UDPipe and Stanza the issue is
             # pickling of the models
             if os.name == "nt" and self.parser in ["udpipe", "stanza"]:
@@ -105,31 +325,335 @@ class ConllParser:
                     " error message by using the 'ignore_pipe_errors' option"
                 )
 
-        if no_split_on_newline:
-            text = [text]
+        formatter = self._get_sents_formatter()
+        include_headers = formatter.include_headers
+        force_counting = include_headers and not no_force_counting
+        conll_str_ext = formatter.ext_names["conll_str"]
+        sent_id_offset = 0
+        stats = self.stats
+        measure = stats.measure if stats is not None else no_measure
+        if stats is not None:
+            lines = stats.iter_counted_lines(lines)
+        # nlp.pipe returns separate docs, for which the formatter would restart the sentence IDs. So we run the
+        # formatter ourselves, in this process and in order, with the number of sentences seen so far as offset
+        pipe_kwargs = {"n_process": n_process, "batch_size": batch_size, "disable": ["conll_formatter"]}
+        if backend == "pool" and n_process != 1:
+            pipe_kwargs["backend"] = backend
+        if self.cache is not None:
+            docs = self._pipe_cached(lines, bucket_window, **pipe_kwargs)
         else:
-            text = text.splitlines()
+            docs = ((None, doc, 0) for doc in self._pipe(lines, bucket_window, **pipe_kwargs))
+        if stats is not None:
+            docs = stats.iter_measured("pipe", docs)
+
+        # Sentences of lines that are repeated later while they are not cached yet
+        reusable_sents = {}
+        for cache_key, doc, n_later in docs:
+            base_sent_id = sent_id_offset if force_counting else 0
+            new_sents = None
+            if isinstance(doc, Doc):
+                with measure("format"):
+                    formatter(doc, sent_id_offset=base_sent_id)
+                    sents_conll = [sent._.get(conll_str_ext) for sent in doc.sents]
+                if cache_key is not None:
+                    new_sents = self._get_cacheable_sents(doc, sents_conll, base_sent_id, include_headers)
+            else:
+                if doc is None:
+                    doc = reusable_sents[cache_key] if n_later else reusable_sents.pop(cache_key)
+                elif cache_key is not None:
+                    # Parsed by a worker process of the "pool" backend
+                    new_sents = doc
+                with measure("renumber"):
+                    sents_conll = [
+                        (format_sent_header(base_sent_id + sent_idx, text) if include_headers and text else "") + body
+                        for sent_idx, (text, body) in enumerate(doc, 1)
+                    ]
+
+            if new_sents is not None:
+                # Sentences with custom headers (e.g. from sentence metadata) cannot be renumbered
+                if all(text is not None for text, _ in new_sents):
+                    self.cache.set(cache_key, new_sents)
+                if n_later:
+                    reusable_sents[cache_key] = new_sents
+
+            if stats is not None:
+                stats.n_sents += len(sents_conll)
+                stats.n_tokens += len(doc) if isinstance(doc, Doc) else _count_conll_tokens(doc)
+
+            sent_id_offset += len(sents_conll)
+            yield from sents_conll
+
+        if self.cache is not None:
+            self.cache.commit()
+
+    def _get_sents_formatter(self) -> ConllFormatter:
+        """Gets the ConllFormatter of the pipeline and checks that it adds the `conll_str` extension to sentences,
+        which is what the output of parsing text to CoNLL is made of.
+        :return: the ConllFormatter
+        """
+        formatter = self.nlp.get_pipe("conll_formatter")
+        if "sent" not in formatter.levels or "conll_str" not in formatter.representations:
+            raise ValueError(
+                "Parsing text to CoNLL requires the sentence-level 'conll_str' extension. Include 'sent' in the"
+                " 'levels' and 'conll_str' in the 'representations' of the ConllFormatter"
+            )
 
-        conll_idx = 0
-        output = ""
-        for doc_idx, doc in enumerate(self.nlp.pipe(text, n_process=n_process)):
-            for sent in doc.sents:
-                conll_idx += 1
+        return formatter
+
+    def _pipe(
+        self, lines: Iterable[str], bucket_window: Optional[int] = None, backend: str = "pipe", **kwargs
+    ) -> Iterator[Union[Doc, CachedSents]]:
+        """Processes lines with nlp.pipe(), optionally sorted by length (see `_pipe_bucketed`), or with a pool of
+        worker processes (see `_pipe_pool`).
+        :param lines: an iterable of strings to process
+        :param bucket_window: the number of lines to sort at once, if any
+        :param backend: "pipe" or "pool", see `iter_lines_as_conll`
+        :param kwargs: keyword arguments that will be passed to nlp.pipe()
+        :return: a generator of Docs or, with the "pool" backend, of the sentences of every line (see
+         `_get_cacheable_sents`), in the order of 'lines'
+        """
+        if backend == "pool":
+            return self._pipe_pool(lines, bucket_window, kwargs["n_process"], kwargs["batch_size"])
 
-                sent_as_conll = sent._.conll_str
-                if self.nlp.get_pipe("conll_formatter").include_headers and not no_force_counting:
-                    # nlp.pipe returns different docs, meaning that the generated sentence indices
-                    # by ConllFormatter are not consecutive (they reset for each new doc)
-                    # We can do a regex replace to fix that, though.
-                    sent_as_conll = re.sub(SENT_ID_RE, str(conll_idx), sent_as_conll, 1)
+        docs = self._pipe_bucketed(lines, bucket_window, **kwargs) if bucket_window else self.nlp.pipe(lines, **kwargs)
+        n_process = kwargs.get("n_process", 1)
+        if n_process == 1 or "torch" not in sys.modules:
+            return docs
 
-                # Prepend additional newline for all except the very first string.
-                if not (doc_idx == 0 and sent.start == 0):
-                    sent_as_conll = "\n" + sent_as_conll
+        if self.parser == "stanza":
+            # Fixes some pickling issues
+            # See https://github.com/explosion/spacy-stanza/issues/34
+            num_threads = 1
+        else:
+            # Like the workers of the "pool" backend, the processes share the available cores
+            torch_threads = (self.init_kwargs or {}).get("torch_threads") or "auto"
+            num_threads = get_torch_num_threads(torch_threads, n_process)
+
+        return _iter_with_torch_threads(docs, num_threads)
+
+    def _pipe_cached(
+        self, lines: Iterable[str], bucket_window: Optional[int] = None, **kwargs
+    ) -> Iterator[Tuple[bytes, Union[Doc, CachedSents, None], int]]:
+        """Looks up lines in the cache and only processes the lines that are not in it with nlp.pipe(). The lines
+        that are not in the cache are fed to a single nlp.pipe() (or pool of worker processes), so that its
+        processes are only started once. Lines that are in the cache are yielded as soon as the lines before them
+        have been parsed. Only after `CACHE_READAHEAD` consecutive lines that are in the cache, the lines that are
+        being parsed are finished and the pipeline is restarted when it is needed again, so that lines in the cache
+        do not pile up in memory. A line that is repeated while it is being parsed is only parsed once.
+        :param lines: an iterable of strings to process
+        :param bucket_window: the number of lines to sort at once before parsing, if any
+        :param kwargs: keyword arguments that will be passed to nlp.pipe()
+        :return: a generator of tuples, in the order of 'lines', of the cache key of a line that is not in the cache
+         yet (otherwise None); its (unformatted) Doc or its sentences (when it is in the cache, or when it was parsed
+         with the "pool" backend), or None if it is a repetition of an earlier line that was not cached yet; and the
+         number of times that the line is still repeated later
+        """
+        lines_iter = iter(lines)
+        # Lines that have been read but not yielded yet, in order: the cache key, the cached sentences (if any), the
+        # line, and whether it is parsed (rather than in the cache or a repetition)
+        pending = deque()
+        # Lines that are being parsed, and the number of their repetitions in `pending`
+        parsing = set()
+        n_repeats = Counter()
+
+        def read_line(line: str) -> bool:
+            key = self._get_cache_key(line)
+            sents = self.cache.get(key)
+            if sents is not None:
+                pending.append((None, sents, line, False))
+                return False
+            elif line in parsing:
+                n_repeats[line] += 1
+                pending.append((key, None, line, False))
+                return False
+
+            parsing.add(line)
+            pending.append((key, None, line, True))
+            return True
+
+        def iter_missing_lines(first_line: str) -> Iterator[str]:
+            yield first_line
+            n_skipped = 0
+            for line in lines_iter:
+                if read_line(line):
+                    n_skipped = 0
+                    yield line
+                else:
+                    n_skipped += 1
+                    if n_skipped >= CACHE_READAHEAD:
+                        return
+
+        # Docs of the lines that are being parsed, and Docs that were already taken from it
+        docs = None
+        parsed_docs = deque()
+        while True:
+            if not pending:
+                if docs is not None:
+                    # Reading ahead happens while the pipeline waits for lines to parse
+                    doc = next(docs, None)
+                    if doc is None:
+                        docs = None
+                    else:
+                        parsed_docs.append(doc)
+                    continue
+
+                # Without pipeline, lines are read until one has to be parsed, which (re)starts the pipeline
+                n_read = 0
+                for line in lines_iter:
+                    n_read += 1
+                    if read_line(line):
+                        docs = iter(self._pipe(iter_missing_lines(line), bucket_window, **kwargs))
+                        break
+                    elif n_read >= CACHE_READAHEAD:
+                        break
+
+                if not n_read:
+                    return
+                continue
+
+            key, sents, line, is_parsed = pending.popleft()
+            if sents is not None:
+                yield None, sents, 0
+            elif is_parsed:
+                parsing.discard(line)
+                yield key, parsed_docs.popleft() if parsed_docs else next(docs), n_repeats[line]
+            else:
+                n_repeats[line] -= 1
+                yield key, None, n_repeats[line]
+                if not n_repeats[line]:
+                    del n_repeats[line]
+
+    def _get_cache_key(self, line: str) -> bytes:
+        """Gets the key of a line in the cache. Besides the line itself, it depends on the model, the configuration
+        of the pipeline (including the ConllFormatter), the tokenizer and the version of this library.
+        :param line: an input line
+        :return: the cache key of the line
+        """
+        if self._cache_namespace is None:
+            namespace = {
+                "meta": {k: self.nlp.meta.get(k) for k in ("lang", "name", "version")},
+                "config": self.nlp.config.to_str(),
+                "tokenizer": type(self.nlp.tokenizer).__qualname__,
+                "spacy_conll": __version__,
+            }
+            self._cache_namespace = hashlib.blake2b(json.dumps(namespace, sort_keys=True).encode("utf-8")).digest()
+
+        return hashlib.blake2b(
+            line.encode("utf-8", "surrogatepass"), digest_size=16, key=self._cache_namespace
+        ).digest()
+
+    @staticmethod
+    def _get_cacheable_sents(
+        doc: Doc, sents_conll: List[str], base_sent_id: int, include_headers: bool
+    ) -> CachedSents:
+        """Gets the formatted sentences of a Doc without their default headers, so that they can be renumbered.
+        :param doc: the formatted Doc
+        :param sents_conll: the CoNLL output of the sentences in the Doc
+        :param base_sent_id: the sentence ID offset that was used to format the Doc
+        :param include_headers: whether the CoNLL output contains headers
+        :return: a list of tuples of the text and the CoNLL output without header of every sentence. If a sentence
+         does not have a default header, its text is None and its output is kept as-is
+        """
+        sents = []
+        for sent_idx, (sent, sent_conll) in enumerate(zip(doc.sents, sents_conll), 1):
+            if not include_headers:
+                sents.append((sent.text, sent_conll))
+                continue
+
+            header = format_sent_header(base_sent_id + sent_idx, sent.text)
+            if sent_conll.startswith(header):
+                sents.append((sent.text, sent_conll[len(header) :]))
+            else:
+                sents.append((None, sent_conll))
+
+        return sents
+
+    def _pipe_bucketed(self, lines: Iterable[str], bucket_window: int, **kwargs) -> Iterator[Doc]:
+        """Processes lines with nlp.pipe() after sorting windows of them by length, and yields the resulting Docs in
+        the original order. Only one window of Docs needs to be kept in memory at a time.
+        :param lines: an iterable of strings to process
+        :param bucket_window: the number of lines to sort at once
+        :param kwargs: keyword arguments that will be passed to nlp.pipe()
+        :return: a generator of Docs, in the order of 'lines'
+        """
+        # nlp.pipe() may read ahead, but the size of a window is always known before its first line is passed on
+        window_sizes = deque()
+
+        def iter_sorted_lines() -> Iterator[Tuple[str, int]]:
+            lines_iter = iter(lines)
+            while True:
+                window = list(islice(lines_iter, bucket_window))
+                if not window:
+                    return
+
+                window_sizes.append(len(window))
+                for line_idx in sorted(range(len(window)), key=lambda idx: len(window[idx])):
+                    yield window[line_idx], line_idx
+
+        window_docs = {}
+        for doc, line_idx in self.nlp.pipe(iter_sorted_lines(), as_tuples=True, **kwargs):
+            window_docs[line_idx] = doc
+            if len(window_docs) == window_sizes[0]:
+                window_sizes.popleft()
+                yield from (window_docs[idx] for idx in range(len(window_docs)))
+                window_docs = {}
+
+    def _pipe_pool(
+        self, lines: Iterable[str], bucket_window: Optional[int], n_process: int, batch_size: Optional[int]
+    ) -> Iterator[CachedSents]:
+        """Processes lines in a pool of worker processes that each have their own pipeline. Only chunks of lines and
+        their CoNLL output are sent between processes, and only a few chunks per process are in flight at a time.
+        :param lines: an iterable of strings to process
+        :param bucket_window: the number of lines to sort at once in a worker, if any
+        :param n_process: number of worker processes. -1 will use as many cores as available
+        :param batch_size: number of lines per chunk. By default, the batch size of the nlp object
+        :return: a generator of the sentences of every line (see `_get_cacheable_sents`), in the order of 'lines'
+        """
+        if n_process == -1:
+            n_process = os.cpu_count() or 1
+        chunk_size = batch_size or self.nlp.batch_size
+
+        lines_iter = iter(lines)
+        pending = deque()
+        with self._worker_pool(n_process) as pool:
+            while True:
+                chunk = list(islice(lines_iter, chunk_size))
+                if chunk:
+                    pending.append(pool.apply_async(_parse_pool_chunk, (chunk, bucket_window)))
+                if pending and (not chunk or len(pending) > POOL_PREFETCH_FACTOR * n_process):
+                    yield from pending.popleft().get()
+                elif not chunk:
+                    return
+
+    @contextmanager
+    def _worker_pool(self, n_process: int) -> Iterator[multiprocessing.pool.Pool]:
+        """Starts a pool of worker processes of the "pool" backend, which is terminated when the context is exited.
+        :param n_process: number of worker processes
+        :return: the pool
+        """
+        global _POOL_PARSER
 
-                output += sent_as_conll
+        if self.init_kwargs is not None:
+            pool = multiprocessing.Pool(
+                n_process, initializer=_init_pool_worker, initargs=(self.init_kwargs, n_process)
+            )
+        elif "fork" in multiprocessing.get_all_start_methods():
+            # Forked workers share the pipeline of this process (copy-on-write). torch's thread pool does not
+            # survive forking, so forked workers use a single thread
+            _POOL_PARSER = self
+            pool = multiprocessing.get_context("fork").Pool(n_process, initializer=set_torch_threads, initargs=(1,))
+        else:
+            raise ValueError(
+                "The 'pool' backend needs the 'init_kwargs' of the ConllParser on platforms that do not support"
+                " forking processes"
+            )
 
-        return output
+        try:
+            yield pool
+        finally:
+            pool.terminate()
+            if self.init_kwargs is None:
+                _POOL_PARSER = None
 
     def parse_conll_file_as_spacy(
         self,
@@ -146,7 +670,8 @@ class ConllParser:
         :param ner_map: Map old NER tag names to new ones, '' maps to O
         :return: a spacy Doc containing all the tokens and sentences from the CoNLL file including the custom CoNLL extensions
         """
-        text = Path(input_file).resolve().read_text(encoding=input_encoding)
+        with open_file(Path(input_file).resolve(), encoding=input_encoding) as fhin:
+            text = fhin.read()
         return self.parse_conll_text_as_spacy(text, ner_tag_pattern=ner_tag_pattern, ner_map=ner_map)
 
     def parse_conll_text_as_spacy(
@@ -172,92 +697,282 @@ class ConllParser:
         :return: a spacy Doc containing all the tokens and sentences from the CoNLL file including
          the custom CoNLL extensions
         """
-        if not Token.has_extension("conll_misc_field"):
-            Token.set_extension("conll_misc_field", default="_")
-        if not Token.has_extension("conll_deps_graphs_field"):
-            Token.set_extension("conll_deps_graphs_field", default="_")
-        if not Span.has_extension("conll_metadata"):
-            Span.set_extension("conll_metadata", default=None)
-
-        docs = []
-        for chunk in text.split("\n\n"):
-            lines = [l for l in chunk.splitlines() if l and not l.startswith("#")]
-            words, spaces, tags, poses, morphs, lemmas, miscs = [], [], [], [], [], [], []
-            heads, deps, deps_graphs = [], [], []
-            for i in range(len(lines)):
-                line = lines[i]
-                parts = line.split("\t")
-
-                if any(not p for p in parts):
-                    raise ValueError(
-                        "According to the CoNLL-U Format, fields cannot be empty. See"
-                        " https://universaldependencies.org/format.html"
-                    )
-
-                id_, word, lemma, pos, tag, morph, head, dep, deps_graph, misc = parts
-
-                if any(" " in f for f in (id_, pos, tag, morph, head, dep, deps_graph)):
-                    raise ValueError(
-                        "According to the CoNLL-U Format, only FORM, LEMMA, and MISC fields can contain"
-                        " spaces. See https://universaldependencies.org/format.html"
-                    )
-
-                if "." in id_ or "-" in id_:
-                    raise NotImplementedError("Multi-word tokens and empty nodes are not supported in spacy_conll")
-
-                words.append(word)
-
-                if "SpaceAfter=No" in misc:
-                    spaces.append(False)
-                else:
-                    spaces.append(True)
-
-                id_ = int(id_) - 1
-                lemmas.append(lemma)
-                poses.append(pos)
-                tags.append(pos if tag == "_" else tag)
-                morphs.append(morph if morph != "_" else "")
-                heads.append((int(head) - 1) if head not in ("0", "_") else id_)
-                deps.append("ROOT" if dep == "root" else dep)
-                deps_graphs.append(deps_graph)
-                miscs.append(misc)
-
-            doc = Doc(
-                self.nlp.vocab,
-                words=words,
-                spaces=spaces,
-                tags=tags,
-                pos=poses,
-                morphs=morphs,
-                lemmas=lemmas,
-                heads=heads,
-                deps=deps,
+        set_conll_parse_extensions()
+        docs = [conll_chunk_to_doc(self.nlp.vocab, chunk, ner_tag_pattern, ner_map) for chunk in text.split("\n\n")]
+
+        # Add CoNLL custom extensions
+        return self.nlp.get_pipe("conll_formatter")(Doc.from_docs(docs))
+
+    def iter_conll_file_as_spacy(
+        self,
+        input_file: Union[PathLike, Path, str],
+        input_encoding: str = getpreferredencoding(),
+        group_by: Union[str, int] = "sentence",
+        ner_tag_pattern: str = "^((?:name|NE)=)?([BILU])-([A-Z_]+)|O$",
+        ner_map: Dict[str, str] = None,
+    ) -> Iterator[Doc]:
+        """Incrementally parses a given CoNLL-U file into spaCy docs. Unlike
+        :py:meth:`ConllParser.parse_conll_file_as_spacy`, the file is read line by line so that the whole corpus
+        never has to be in memory at once. Compressed files are decompressed on the fly, see
+        :py:func:`spacy_conll.compression.open_file`. See :py:meth:`ConllParser.iter_conll_lines_as_spacy`.
+        :param input_file: path to the input file to process
+        :param input_encoding: encoding of 'input_file'
+        :param group_by: how to group sentences into Docs: "sentence" (one Doc per sentence), "newdoc" (a new Doc
+         at every "# newdoc" comment) or a positive integer (a Doc per that many sentences)
+        :param ner_tag_pattern: Regex pattern for entity tag in the MISC field
+        :param ner_map: Map old NER tag names to new ones, '' maps to O
+        :return: a generator of spacy Docs including the custom CoNLL extensions
+        """
+        with open_file(Path(input_file).resolve(), encoding=input_encoding) as fhin:
+            yield from self.iter_conll_lines_as_spacy(
+                fhin, group_by=group_by, ner_tag_pattern=ner_tag_pattern, ner_map=ner_map
             )
 
-            # Set custom Token extensions
-            for i in range(len(doc)):
-                doc[i]._.conll_misc_field = miscs[i]
-                doc[i]._.conll_deps_graphs_field = deps_graphs[i]
-
-            ents = get_entities(lines, ner_tag_pattern, ner_map)
-            doc.ents = spans_from_biluo_tags(doc, ents)
-
-            # The deprel relations ensure that this CoNLL chunk is one sentence
-            # Deprel cannot therefore not be empty or each word is considered a separate sentence
-            if len(list(doc.sents)) != 1:
-                raise ValueError(
-                    "Your data is in an unexpected format. Make sure that it follows the CoNLL-U format"
-                    " requirements. See https://universaldependencies.org/format.html. Particularly make"
-                    " sure that the DEPREL field is filled in."
-                )
+    def iter_conll_lines_as_spacy(
+        self,
+        lines: Iterable[str],
+        group_by: Union[str, int] = "sentence",
+        ner_tag_pattern: str = "^((?:name|NE)=)?([BILU])-([A-Z_]+)|O$",
+        ner_map: Dict[str, str] = None,
+    ) -> Iterator[Doc]:
+        """Parses an iterable of CoNLL-U lines (e.g. an open file) into spaCy docs, yielding each Doc as soon as
+        its last sentence has been read. Sentences are separated by empty lines; superfluous empty lines are
+        ignored. See :py:meth:`ConllParser.parse_conll_text_as_spacy` for the supported CoNLL-U features.
+        :param lines: iterable of CoNLL-U lines, with or without their trailing newline
+        :param group_by: how to group sentences into Docs: "sentence" (one Doc per sentence), "newdoc" (a new Doc
+         at every "# newdoc" comment) or a positive integer (a Doc per that many sentences)
+        :param ner_tag_pattern: Regex pattern for entity tag in the MISC field
+        :param ner_map: Map old NER tag names to new ones, '' maps to O
+        :return: a generator of spacy Docs including the custom CoNLL extensions
+        """
+        set_conll_parse_extensions()
+        formatter = self.nlp.get_pipe("conll_formatter")
 
-            # Save the metadata in a custom sentence Span attribute so that the formatter can use it
-            metadata = "\n".join([l for l in chunk.splitlines() if l.startswith("#")])
-            # We really only expect one sentence
-            for sent in doc.sents:
-                sent._.conll_metadata = f"{metadata}\n" if metadata else ""
+        for chunks in group_conll_chunks(iter_conll_chunks(lines), group_by=group_by):
+            docs = [conll_chunk_to_doc(self.nlp.vocab, chunk, ner_tag_pattern, ner_map) for chunk in chunks]
+            yield formatter(docs[0] if len(docs) == 1 else Doc.from_docs(docs))
 
-            docs.append(doc)
 
-        # Add CoNLL custom extensions
-        return self.nlp.get_pipe("conll_formatter")(Doc.from_docs(docs))
+def _init_pool_worker(init_kwargs: Dict[str, Any], n_process: int):
+    """Creates the ConllParser of a worker process of the "pool" backend. Unless a fixed number of torch threads is
+    requested, the available cores are divided over the worker processes.
+    :param init_kwargs: keyword arguments for `init_parser`, including 'model_or_lang' and 'parser'
+    :param n_process: the number of worker processes
+    """
+    global _POOL_PARSER
+    # The threads are set by init_parser before the model is loaded
+    torch_threads = get_torch_num_threads(init_kwargs.get("torch_threads") or "auto", n_process)
+    _POOL_PARSER = ConllParser(init_parser(**{**init_kwargs, "torch_threads": torch_threads}))
+
+
+def _parse_pool_file(task: Tuple) -> Path:
+    """Parses a whole file in a worker process of the "pool" backend (see `ConllParser.parse_files_as_conll`).
+    :param task: tuple of the input file, the output file, their encodings and keyword arguments for
+     `ConllParser.iter_file_as_conll`
+    :return: the output file
+    """
+    input_file, output_file, input_encoding, output_encoding, kwargs = task
+    return _POOL_PARSER._write_conll_file(input_file, output_file, input_encoding, output_encoding, **kwargs)
+
+
+def _count_conll_tokens(sents: CachedSents) -> int:
+    """Counts the tokens in the CoNLL output of sentences (without their default headers).
+    :param sents: tuples of the text and the CoNLL output of sentences
+    :return: the number of tokens
+    """
+    return sum(1 for _, body in sents for line in body.splitlines() if line and not line.startswith("#"))
+
+
+def _iter_with_torch_threads(docs: Iterator[Doc], num_threads: int) -> Iterator[Doc]:
+    """Sets the number of torch threads while iterating over 'docs', and restores it afterwards. The worker processes
+    of nlp.pipe() are started during the iteration: forked processes inherit the number of threads of this process,
+    and new interpreters read it from the OMP_NUM_THREADS environment variable.
+    :param docs: an iterator of Docs, typically from nlp.pipe() with multiple processes
+    :param num_threads: the number of threads
+    """
+    import torch
+
+    prev_num_threads = torch.get_num_threads()
+    prev_omp_num_threads = os.environ.get("OMP_NUM_THREADS")
+    torch.set_num_threads(num_threads)
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    try:
+        yield from docs
+    finally:
+        torch.set_num_threads(prev_num_threads)
+        if prev_omp_num_threads is None:
+            os.environ.pop("OMP_NUM_THREADS", None)
+        else:
+            os.environ["OMP_NUM_THREADS"] = prev_omp_num_threads
+
+
+def _parse_pool_chunk(lines: List[str], bucket_window: Optional[int] = None) -> List[CachedSents]:
+    """Parses a chunk of lines in a worker process of the "pool" backend.
+    :param lines: the lines to process
+    :param bucket_window: the number of lines to sort at once, if any
+    :return: the sentences of every line without their default headers (see `ConllParser._get_cacheable_sents`)
+    """
+    formatter = _POOL_PARSER._get_sents_formatter()
+    conll_str_ext = formatter.ext_names["conll_str"]
+    chunk_sents = []
+    for doc in _POOL_PARSER._pipe(lines, bucket_window, batch_size=len(lines), disable=["conll_formatter"]):
+        formatter(doc)
+        sents_conll = [sent._.get(conll_str_ext) for sent in doc.sents]
+        chunk_sents.append(_POOL_PARSER._get_cacheable_sents(doc, sents_conll, 0, formatter.include_headers))
+
+    return chunk_sents
+
+
+def set_conll_parse_extensions():
+    """Registers the custom extensions that are needed to store CoNLL-U information that does not have a spaCy
+    counterpart, i.e. Token._.conll_misc_field, Token._.conll_deps_graphs_field and Span._.conll_metadata."""
+    if not Token.has_extension("conll_misc_field"):
+        Token.set_extension("conll_misc_field", default="_")
+    if not Token.has_extension("conll_deps_graphs_field"):
+        Token.set_extension("conll_deps_graphs_field", default="_")
+    if not Span.has_extension("conll_metadata"):
+        Span.set_extension("conll_metadata", default=None)
+
+
+def iter_conll_chunks(lines: Iterable[str]) -> Iterator[str]:
+    """Groups CoNLL-U lines into sentence chunks without reading more than one sentence ahead. Sentences are
+    separated by empty lines; consecutive empty lines do not lead to empty chunks.
+    :param lines: iterable of CoNLL-U lines, with or without their trailing newline
+    :return: a generator of sentence chunks (metadata and token lines joined by a newline)
+    """
+    chunk = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line:
+            chunk.append(line)
+        elif chunk:
+            yield "\n".join(chunk)
+            chunk = []
+
+    if chunk:
+        yield "\n".join(chunk)
+
+
+def group_conll_chunks(chunks: Iterable[str], group_by: Union[str, int] = "sentence") -> Iterator[List[str]]:
+    """Groups sentence chunks (see :py:func:`iter_conll_chunks`) into lists of chunks that should end up in the same
+    Doc.
+    :param chunks: iterable of CoNLL-U sentence chunks
+    :param group_by: "sentence" (every chunk on its own), "newdoc" (a new group at every "# newdoc" comment) or a
+     positive integer (groups of that many chunks)
+    :return: a generator of lists of chunks
+    """
+    if group_by not in ("sentence", "newdoc") and not (
+        isinstance(group_by, int) and not isinstance(group_by, bool) and group_by > 0
+    ):
+        raise ValueError(f"'group_by' must be 'sentence', 'newdoc' or a positive integer, not {group_by!r}")
+
+    group = []
+    for chunk in chunks:
+        if group_by == "sentence":
+            yield [chunk]
+            continue
+
+        if group_by == "newdoc" and group and any(l.startswith("# newdoc") for l in chunk.splitlines()):
+            yield group
+            group = []
+
+        group.append(chunk)
+        if group_by != "newdoc" and len(group) == group_by:
+            yield group
+            group = []
+
+    if group:
+        yield group
+
+
+def conll_chunk_to_doc(
+    vocab: Vocab,
+    chunk: str,
+    ner_tag_pattern: str = "^((?:name|NE)=)?([BILU])-([A-Z_]+)|O$",
+    ner_map: Dict[str, str] = None,
+) -> Doc:
+    """Converts a single CoNLL-U sentence chunk into a spaCy Doc. Only a Vocab is needed, so this can be used
+    without a full pipeline. The extensions from :py:func:`set_conll_parse_extensions` must be registered.
+    :param vocab: the Vocab to create the Doc with
+    :param chunk: CoNLL-U text of exactly one sentence, optionally with metadata lines
+    :param ner_tag_pattern: Regex pattern for entity tag in the MISC field
+    :param ner_map: Map old NER tag names to new ones, '' maps to O
+    :return: a spacy Doc of one sentence, without the formatter's CoNLL extensions
+    """
+    lines = [l for l in chunk.splitlines() if l and not l.startswith("#")]
+    words, spaces, tags, poses, morphs, lemmas, miscs = [], [], [], [], [], [], []
+    heads, deps, deps_graphs = [], [], []
+    for i in range(len(lines)):
+        line = lines[i]
+        parts = line.split("\t")
+
+        if any(not p for p in parts):
+            raise ValueError(
+                "According to the CoNLL-U Format, fields cannot be empty. See"
+                " https://universaldependencies.org/format.html"
+            )
+
+        id_, word, lemma, pos, tag, morph, head, dep, deps_graph, misc = parts
+
+        if any(" " in f for f in (id_, pos, tag, morph, head, dep, deps_graph)):
+            raise ValueError(
+                "According to the CoNLL-U Format, only FORM, LEMMA, and MISC fields can contain"
+                " spaces. See https://universaldependencies.org/format.html"
+            )
+
+        if "." in id_ or "-" in id_:
+            raise NotImplementedError("Multi-word tokens and empty nodes are not supported in spacy_conll")
+
+        words.append(word)
+
+        if "SpaceAfter=No" in misc:
+            spaces.append(False)
+        else:
+            spaces.append(True)
+
+        id_ = int(id_) - 1
+        lemmas.append(lemma)
+        poses.append(pos)
+        tags.append(pos if tag == "_" else tag)
+        morphs.append(morph if morph != "_" else "")
+        heads.append((int(head) - 1) if head not in ("0", "_") else id_)
+        deps.append("ROOT" if dep == "root" else dep)
+        deps_graphs.append(deps_graph)
+        miscs.append(misc)
+
+    doc = Doc(
+        vocab,
+        words=words,
+        spaces=spaces,
+        tags=tags,
+        pos=poses,
+        morphs=morphs,
+        lemmas=lemmas,
+        heads=heads,
+        deps=deps,
+    )
+
+    # Set custom Token extensions
+    for i in range(len(doc)):
+        doc[i]._.conll_misc_field = miscs[i]
+        doc[i]._.conll_deps_graphs_field = deps_graphs[i]
+
+    ents = get_entities(lines, ner_tag_pattern, ner_map)
+    doc.ents = spans_from_biluo_tags(doc, ents)
+
+    # The deprel relations ensure that this CoNLL chunk is one sentence
+    # Deprel cannot therefore not be empty or each word is considered a separate sentence
+    if len(list(doc.sents)) != 1:
+        raise ValueError(
+            "Your data is in an unexpected format. Make sure that it follows the CoNLL-U format"
+            " requirements. See https://universaldependencies.org/format.html. Particularly make"
+            " sure that the DEPREL field is filled in."
+        )
+
+    # Save the metadata in a custom sentence Span attribute so that the formatter can use it
+    metadata = "\n".join([l for l in chunk.splitlines() if l.startswith("#")])
+    # We really only expect one sentence
+    for sent in doc.sents:
+        sent._.conll_metadata = f"{metadata}\n" if metadata else ""
+
+    return doc
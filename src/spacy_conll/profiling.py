@@ -0,0 +1,190 @@
+import cProfile
+import io
+import pstats
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Collection, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Stages in the order in which they happen, used to sort the report
+STAGES = ("split", "pipe", "format", "renumber", "write")
+
+_NULL_CONTEXT = nullcontext()
+
+
+@dataclass
+class StageStats:
+    """Cumulative statistics of a single stage.
+
+    :param wall_time: wall-clock time in seconds
+    :param cpu_time: CPU time of this process in seconds
+    :param n_calls: number of times the stage was run
+    :param n_items: number of items (lines, Docs, sentences) that were processed
+    """
+
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    n_calls: int = 0
+    n_items: int = 0
+
+
+@dataclass(eq=False, repr=False)
+class ConllStats:
+    """Opt-in instrumentation of a ConllParser (see its `stats` argument). It records the cumulative wall-clock and
+    CPU time, and the number of calls and items of every stage of parsing text to CoNLL-U:
+
+    - split: splitting the input text into lines
+    - pipe: nlp.pipe(), i.e. the model. This includes cache lookups, reading input files (which are read lazily) and,
+      with the "pool" backend, waiting for the worker processes
+    - format: building the CoNLL-U strings of a Doc with the ConllFormatter
+    - renumber: adding sentence headers to the output of cached lines and of lines from worker processes
+    - write: writing the output to a file (only in the CLI and `ConllParser.parse_files_as_conll`)
+
+    It also counts the input lines and characters, and the output sentences and tokens.
+
+    Constructor arguments:
+    :param profile_stages: names of stages to run under cProfile. See `get_profile_report`
+    :param stage_hooks: a dictionary of stage names and functions that return a context manager, which is entered
+     every time the stage runs. This can be used to attach other profilers, like pyinstrument
+    """
+
+    profile_stages: Collection[str] = ()
+    stage_hooks: Dict[str, Callable[[], ContextManager]] = field(default_factory=dict)
+    stages: Dict[str, StageStats] = field(init=False, default_factory=dict)
+    profiles: Dict[str, cProfile.Profile] = field(init=False, default_factory=dict)
+    n_lines: int = field(init=False, default=0)
+    n_chars: int = field(init=False, default=0)
+    n_sents: int = field(init=False, default=0)
+    n_tokens: int = field(init=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(n_lines={self.n_lines}, n_sents={self.n_sents}, n_tokens={self.n_tokens},"
+            f" stages={list(self.stages)})"
+        )
+
+    @contextmanager
+    def measure(self, stage: str, n_items: int = 1) -> Iterator[None]:
+        """Context manager that adds the time spent in its body to a stage.
+        :param stage: name of the stage
+        :param n_items: number of items that are processed in the body
+        """
+        with ExitStack() as stack:
+            if stage in self.stage_hooks:
+                stack.enter_context(self.stage_hooks[stage]())
+            profile = self._get_profile(stage)
+            if profile is not None:
+                profile.enable()
+                stack.callback(profile.disable)
+
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            try:
+                yield
+            finally:
+                stats = self.stages.setdefault(stage, StageStats())
+                stats.wall_time += time.perf_counter() - wall_start
+                stats.cpu_time += time.process_time() - cpu_start
+                stats.n_calls += 1
+                stats.n_items += n_items
+
+    def iter_measured(self, stage: str, iterable: Iterable) -> Iterator:
+        """Yields the items of an iterable and adds the time spent in getting every item to a stage. This is meant for
+        lazy iterables like nlp.pipe(), which do their work while they are iterated over.
+        :param stage: name of the stage
+        :param iterable: the iterable
+        """
+        iterator = iter(iterable)
+        while True:
+            exhausted = False
+            with self.measure(stage):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+
+            if exhausted:
+                # The last call did not produce an item
+                self.stages[stage].n_items -= 1
+                return
+
+            yield item
+
+    def iter_counted_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Yields input lines and counts them and their characters.
+        :param lines: the input lines
+        """
+        for line in lines:
+            self.n_lines += 1
+            self.n_chars += len(line)
+            yield line
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns all statistics as a (JSON-serializable) dictionary.
+        :return: a dictionary with the counts and the statistics of every stage
+        """
+        return {
+            "n_lines": self.n_lines,
+            "n_chars": self.n_chars,
+            "n_sents": self.n_sents,
+            "n_tokens": self.n_tokens,
+            "stages": {stage: vars(stats).copy() for stage, stats in self._sorted_stages()},
+        }
+
+    def get_report(self) -> str:
+        """Returns a human-readable table of the statistics of every stage and the counts.
+        :return: the report
+        """
+        total_wall_time = sum(stats.wall_time for stats in self.stages.values())
+        lines = [f"{'stage':<10} {'calls':>10} {'items':>10} {'wall (s)':>10} {'cpu (s)':>10} {'wall %':>7}"]
+        for stage, stats in self._sorted_stages():
+            share = 100 * stats.wall_time / total_wall_time if total_wall_time else 0.0
+            lines.append(
+                f"{stage:<10} {stats.n_calls:>10,} {stats.n_items:>10,} {stats.wall_time:>10.3f}"
+                f" {stats.cpu_time:>10.3f} {share:>6.1f}%"
+            )
+
+        tokens_per_sec = self.n_tokens / total_wall_time if total_wall_time else 0.0
+        lines.append(
+            f"{self.n_lines:,} lines, {self.n_chars:,} characters, {self.n_sents:,} sentences and {self.n_tokens:,}"
+            f" tokens in {total_wall_time:.3f} s ({tokens_per_sec:,.0f} tokens/s)"
+        )
+        return "\n".join(lines)
+
+    def get_profile_report(self, sort_by: str = "cumulative", limit: int = 20) -> str:
+        """Returns the cProfile statistics of the stages in 'profile_stages'.
+        :param sort_by: the key to sort functions by, see `pstats.Stats.sort_stats`
+        :param limit: maximal number of functions per stage
+        :return: the report
+        """
+        reports = []
+        for stage, profile in self.profiles.items():
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats(sort_by).print_stats(limit)
+            reports.append(f"cProfile of stage '{stage}':\n{stream.getvalue()}")
+
+        return "\n".join(reports)
+
+    def _get_profile(self, stage: str) -> Optional[cProfile.Profile]:
+        if stage not in self.profile_stages:
+            return None
+
+        if stage not in self.profiles:
+            self.profiles[stage] = cProfile.Profile()
+
+        return self.profiles[stage]
+
+    def _sorted_stages(self) -> List[Tuple[str, StageStats]]:
+        return sorted(
+            self.stages.items(), key=lambda item: STAGES.index(item[0]) if item[0] in STAGES else len(STAGES)
+        )
+
+
+def no_measure(stage: str, n_items: int = 1) -> ContextManager:
+    """Stand-in for `ConllStats.measure` when instrumentation is disabled, which costs next to nothing.
+    :param stage: name of the stage
+    :param n_items: number of items that are processed
+    :return: a context manager that does nothing
+    """
+    return _NULL_CONTEXT
@@ -0,0 +1,183 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from spacy_conll.parser import ConllParser
+from spacy_conll.utils import init_parser
+
+
+# Options of ConllParser.parse_text_as_conll that clients may pass along with their text
+PARSE_OPTIONS = ("no_force_counting", "no_split_on_newline", "batch_size", "bucket_window")
+# Default time in seconds that clients wait to connect and for every read of the response
+DEFAULT_SERVER_TIMEOUT = 120.0
+
+
+def parse_address(address: str) -> Tuple[int, Any]:
+    """Parses a server address, which is either "host:port" for a TCP socket or the path to a Unix socket.
+    :param address: the address
+    :return: a tuple of the socket family and the address in the form that the socket module expects
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and os.path.sep not in host:
+        return socket.AF_INET, (host or "localhost", int(port))
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError(f"Unix sockets are not supported on this platform. Use 'host:port' instead of {address}")
+
+    return socket.AF_UNIX, address
+
+
+class ConllRequestHandler(socketserver.StreamRequestHandler):
+    """Handles the requests of a single connection. Every request and every response is one line of JSON. A request
+    contains the arguments for `init_parser` ("init"), the text to parse ("text") and optionally options for
+    `ConllParser.parse_text_as_conll` ("options"). A response contains either the CoNLL output ("conll") or an error
+    message ("error")."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = {"conll": self.server.parse(request)}
+            except Exception as exc:
+                response = {"error": f"{exc.__class__.__name__}: {exc}"}
+
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class ConllServerMixin:
+    """Keeps a ConllParser for every distinct configuration that has been requested, so that models only need to
+    be loaded once."""
+
+    daemon_threads = True
+    # Many clients may connect at the same time, e.g. from a shell loop that runs in parallel
+    request_queue_size = 128
+
+    def init_parsers(self):
+        self.parsers = {}
+        self.parsers_lock = threading.Lock()
+        self.loading_locks = {}
+
+    def get_parser(self, init_kwargs: Dict[str, Any]) -> Tuple[ConllParser, threading.Lock]:
+        """Gets the parser for the given `init_parser` arguments, and loads it if it is not available yet.
+        :param init_kwargs: keyword arguments for `init_parser`, including 'model_or_lang' and 'parser'
+        :return: a tuple of the parser and the lock that must be held while using it
+        """
+        key = json.dumps(init_kwargs, sort_keys=True)
+        if key in self.parsers:
+            return self.parsers[key]
+
+        with self.parsers_lock:
+            loading_lock = self.loading_locks.setdefault(key, threading.Lock())
+
+        # Only clients that request the same parser wait while it is loaded
+        with loading_lock:
+            if key not in self.parsers:
+                self.parsers[key] = (ConllParser(init_parser(**init_kwargs)), threading.Lock())
+
+        return self.parsers[key]
+
+    def parse(self, request: Dict[str, Any]) -> str:
+        """Parses the text of a request.
+        :param request: a request with "init", "text" and optionally "options"
+        :return: the CoNLL output
+        """
+        options = request.get("options") or {}
+        unknown_options = set(options) - set(PARSE_OPTIONS)
+        if unknown_options:
+            raise ValueError(f"Unknown options {unknown_options}. Valid options are {PARSE_OPTIONS}")
+
+        parser, lock = self.get_parser(request["init"])
+        with lock:
+            return parser.parse_text_as_conll(request["text"], **options)
+
+
+class ConllTCPServer(ConllServerMixin, socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class ConllUnixServer(ConllServerMixin, socketserver.ThreadingUnixStreamServer):
+        pass
+
+
+def create_conll_server(address: str) -> socketserver.BaseServer:
+    """Creates a server that keeps parsers in memory and parses text for clients (see `parse_with_server`).
+    Call `serve_forever()` on the result to start serving. Note that there is no authentication, so only bind to
+    localhost or to a Unix socket with suitable permissions.
+    :param address: "host:port" for a TCP socket or the path to a Unix socket. An existing file at that path is
+     replaced
+    :return: the server
+    """
+    family, address = parse_address(address)
+    if family == socket.AF_INET:
+        server = ConllTCPServer(address, ConllRequestHandler)
+    else:
+        if os.path.exists(address):
+            os.remove(address)
+        server = ConllUnixServer(address, ConllRequestHandler)
+
+    server.init_parsers()
+    return server
+
+
+def parse_with_server(
+    address: str,
+    text: str,
+    init_kwargs: Dict[str, Any],
+    options: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = DEFAULT_SERVER_TIMEOUT,
+) -> Optional[str]:
+    """Lets a server (see `create_conll_server`) parse a text.
+    :param address: "host:port" for a TCP socket or the path to a Unix socket
+    :param text: the text to parse
+    :param init_kwargs: keyword arguments for `init_parser`, including 'model_or_lang' and 'parser'
+    :param options: options for `ConllParser.parse_text_as_conll`, see `PARSE_OPTIONS`
+    :param timeout: timeout in seconds for the connection and the response, or None to wait indefinitely. Note that
+     the server only responds when it has parsed the whole text
+    :return: the CoNLL output, or None if no server is running at the given address, or if the connection fails or
+     times out
+    """
+    family, address = parse_address(address)
+    request = {"init": init_kwargs, "text": text, "options": options or {}}
+    try:
+        with socket.socket(family, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            _connect(sock, address, timeout)
+            with sock.makefile("rwb") as fh:
+                fh.write(json.dumps(request).encode("utf-8") + b"\n")
+                fh.flush()
+                line = fh.readline()
+    except OSError:
+        # Includes timeouts, and servers that are not running or not reachable
+        return None
+
+    if not line:
+        # The server closed the connection without responding, e.g. because it was stopped
+        return None
+
+    response = json.loads(line)
+
+    if "error" in response:
+        raise RuntimeError(f"The server could not parse the text: {response['error']}")
+
+    return response["conll"]
+
+
+def _connect(sock: socket.socket, address: Any, timeout: Optional[float]):
+    """Connects a socket. With a timeout, connecting to a Unix socket whose backlog is full fails immediately rather
+    than waiting, so that is retried until the timeout has passed."""
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    while True:
+        try:
+            sock.connect(address)
+            return
+        except BlockingIOError:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise
+            time.sleep(0.01)
@@ -1,4 +1,7 @@
-from typing import Dict, List, Optional
+import os
+import sys
+from importlib.util import find_spec
+from typing import Dict, List, Optional, Union
 
 import spacy
 from spacy.language import Language
@@ -6,26 +9,12 @@ from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
 
-try:
-    import pandas as pd  # noqa: F401
-
-    PD_AVAILABLE = True
-except ImportError:
-    PD_AVAILABLE = False
-
-try:
-    import spacy_stanza  # noqa: F401
-
-    STANZA_AVAILABLE = True
-except ImportError:
-    STANZA_AVAILABLE = False
-
-try:
-    import spacy_udpipe  # noqa: F401
-
-    UDPIPE_AVAILABLE = True
-except ImportError:
-    UDPIPE_AVAILABLE = False
+# Only check whether the optional dependencies are installed. Importing them (especially spacy_stanza, which
+# imports torch) is slow, so they are only imported when they are actually used
+PD_AVAILABLE = find_spec("pandas") is not None
+STANZA_AVAILABLE = find_spec("spacy_stanza") is not None
+UDPIPE_AVAILABLE = find_spec("spacy_udpipe") is not None
+TORCH_AVAILABLE = find_spec("torch") is not None
 
 
 def init_parser(
@@ -36,6 +25,8 @@ def init_parser(
     disable_sbd: bool = False,
     exclude_spacy_components: Optional[List[str]] = None,
     parser_opts: Optional[Dict] = None,
+    torch_threads: Optional[Union[int, str]] = None,
+    torch_interop_threads: Optional[int] = None,
     **kwargs,
 ) -> Language:
     """Initialise a spacy-wrapped parser given a language or model and some options.
@@ -66,11 +57,21 @@ def init_parser(
     :param parser_opts: will be passed to the core pipeline. For spacy, it will be passed to its
            `.load()` initialisations, for stanza `pipeline_opts` is passed to its `.load_pipeline()`
            initialisations. UDPipe does not have any keyword arguments
+    :param torch_threads: number of threads that torch uses within an operation, or "auto" to use all available
+           cores. Only has an effect if the parser uses torch, like stanza. See :py:func:`set_torch_threads`. The
+           thread settings are applied before the model is loaded, which imports torch if it is installed
+    :param torch_interop_threads: number of threads that torch uses to run independent operations in parallel.
+           Only has an effect if the parser uses torch. See :py:func:`set_torch_threads`
     :param kwargs: options to be passed to the ConllFormatter initialisation
     :return: an initialised Language object; the parser
     """
     parser_opts = {} if parser_opts is None else parser_opts
 
+    # torch only accepts the number of interop threads before it has done any parallel work, e.g. loading a model
+    if (torch_threads is not None or torch_interop_threads is not None) and TORCH_AVAILABLE:
+        import torch  # noqa: F401
+    set_torch_threads(torch_threads, torch_interop_threads)
+
     if parser == "spacy":
         exclude = ["senter", "sentencizer"] if disable_sbd or is_tokenized else []
         exclude = exclude + exclude_spacy_components if exclude_spacy_components is not None else exclude
@@ -108,6 +109,43 @@ def init_parser(
     return nlp
 
 
+def set_torch_threads(
+    num_threads: Optional[Union[int, str]] = None, num_interop_threads: Optional[int] = None, n_process: int = 1
+):
+    """Sets the number of threads that torch uses in this process. Does nothing if torch has not been imported (i.e.
+    if the parser does not use torch).
+    :param num_threads: number of threads within an operation, or "auto" to divide the available cores evenly over
+           'n_process' processes. None keeps the current setting
+    :param num_interop_threads: number of threads to run independent operations in parallel. torch only allows to
+           set this once per process, before any parallel work has been done. None keeps the current setting
+    :param n_process: number of processes that share the available cores, used when 'num_threads' is "auto"
+    """
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return
+
+    num_threads = get_torch_num_threads(num_threads, n_process)
+    if num_threads is not None:
+        torch.set_num_threads(num_threads)
+    if num_interop_threads is not None and torch.get_num_interop_threads() != num_interop_threads:
+        torch.set_num_interop_threads(num_interop_threads)
+
+
+def get_torch_num_threads(num_threads: Optional[Union[int, str]], n_process: int = 1) -> Optional[int]:
+    """Resolves the number of torch threads within an operation per process.
+    :param num_threads: number of threads, or "auto" to divide the available cores evenly over 'n_process' processes
+    :param n_process: number of processes that share the available cores. -1 means as many processes as cores
+    :return: the number of threads, or None if 'num_threads' is None
+    """
+    if num_threads == "auto":
+        n_cores = os.cpu_count() or 1
+        return max(1, n_cores // (n_cores if n_process == -1 else max(1, n_process)))
+    elif isinstance(num_threads, str):
+        raise ValueError(f"Unexpected value {num_threads!r} for 'num_threads'. Use an integer or 'auto'")
+
+    return num_threads
+
+
 def merge_dicts_strict(d1: Dict, d2: Dict) -> Dict:
     """Merge two dicts in a strict manner, i.e. the second dict overwrites keys
     of the first dict but all keys in the second dict have to be present in
@@ -1,6 +1,8 @@
+import threading
 from pathlib import Path
 
 import pytest
+import spacy
 from spacy import Vocab
 from spacy.tokens import Doc, Token
 from spacy.tokens.underscore import Underscore
@@ -9,6 +11,7 @@ from spacy_conll import init_parser
 # flow inspired by https://stackoverflow.com/a/61486898/1150683
 # pass (uninvoked) function as a parameter to fixtures
 from spacy_conll.parser import ConllParser
+from spacy_conll.server import create_conll_server
 
 
 PARSERS = {}
@@ -63,6 +66,29 @@ def spacy_conllparser():
     return ConllParser(get_parser("spacy", include_headers=True))
 
 
+def get_blank_parser(**kwargs):
+    # Does not require a pretrained model: tokenization and rule-based sentence segmentation only
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("conll_formatter", config=kwargs, last=True)
+    return nlp
+
+
+@pytest.fixture
+def blank_conllparser():
+    return ConllParser(get_blank_parser(include_headers=True))
+
+
+@pytest.fixture
+def blank_parser():
+    return get_blank_parser(include_headers=True)
+
+
+@pytest.fixture(params=[True, False])
+def blank_lazy_parser(request):
+    yield get_blank_parser(include_headers=True, lazy=True, memoize=request.param)
+
+
 @pytest.fixture
 def spacy_ext_names():
     return init_parser(
@@ -178,6 +204,33 @@ def spacy_doc(spacy_vocab):
     )
 
 
+@pytest.fixture
+def spacy_annotated_doc(spacy_vocab):
+    # Two sentences with syntactic annotations, so that no pretrained model is needed
+    return Doc(
+        spacy_vocab,
+        words=["I", "like", "cookies", ".", "Me", "too", "!"],
+        spaces=[True, True, False, True, True, False, False],
+        lemmas=["I", "like", "cookie", ".", "I", "too", "!"],
+        pos=["PRON", "VERB", "NOUN", "PUNCT", "PRON", "ADV", "PUNCT"],
+        tags=["PRP", "VBP", "NNS", ".", "PRP", "RB", "."],
+        morphs=["Case=Nom|Person=1", "Tense=Pres", "Number=Plur", "", "Case=Acc", "", ""],
+        heads=[1, 1, 1, 1, 4, 4, 4],
+        deps=["nsubj", "ROOT", "dobj", "punct", "root", "advmod", "punct"],
+    )
+
+
 @pytest.fixture
 def spacy_token(spacy_vocab, spacy_doc):
     return Token(spacy_vocab, spacy_doc, 1)
+
+
+@pytest.fixture
+def conll_server_address(tmp_path):
+    address = str(tmp_path.joinpath("conll.sock"))
+    server = create_conll_server(address)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield address
+    server.shutdown()
+    server.server_close()
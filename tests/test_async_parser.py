@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+import pytest
+from spacy_conll import init_parser
+from spacy_conll.async_parser import AsyncConllParser
+from spacy_conll.parser import ConllParser
+
+
+TEXTS = [f"Sentence number {idx}.\nAnother sentence." for idx in range(20)]
+
+
+@pytest.fixture
+def blank_conllparser():
+    return ConllParser(init_parser("blank:en", "spacy", disable_sbd=True, include_headers=True))
+
+
+def test_parse_texts_as_conll(blank_conllparser):
+    texts = TEXTS + ["", "Hello there."]
+    assert blank_conllparser.parse_texts_as_conll(texts) == [
+        blank_conllparser.parse_text_as_conll(text) for text in texts
+    ]
+
+
+@pytest.mark.parametrize("max_batch_size,max_queue_size", [(1, 1), (4, 2), (32, 1024)])
+def test_async_parse(blank_conllparser, max_batch_size, max_queue_size):
+    async def parse_all():
+        async with AsyncConllParser(
+            blank_conllparser, max_batch_size=max_batch_size, max_queue_size=max_queue_size
+        ) as async_parser:
+            return await asyncio.gather(*[async_parser.parse(text) for text in TEXTS])
+
+    assert asyncio.run(parse_all()) == [blank_conllparser.parse_text_as_conll(text) for text in TEXTS]
+
+
+def test_async_iter_parse(blank_conllparser):
+    async def aiter_texts():
+        for text in TEXTS:
+            yield text
+
+    async def parse_all(texts):
+        async with AsyncConllParser(blank_conllparser, max_queue_size=3) as async_parser:
+            return [conll async for conll in async_parser.iter_parse(texts)]
+
+    expected = [blank_conllparser.parse_text_as_conll(text) for text in TEXTS]
+    assert asyncio.run(parse_all(TEXTS)) == expected
+    assert asyncio.run(parse_all(aiter_texts())) == expected
+
+
+def test_async_parse_batches(blank_conllparser, monkeypatch):
+    batch_sizes = []
+    parse_texts_as_conll = blank_conllparser.parse_texts_as_conll
+
+    def parse_texts_spy(texts, **kwargs):
+        batch_sizes.append(len(texts))
+        return parse_texts_as_conll(texts, **kwargs)
+
+    monkeypatch.setattr(blank_conllparser, "parse_texts_as_conll", parse_texts_spy)
+
+    async def parse_all():
+        async with AsyncConllParser(blank_conllparser, max_batch_size=8, max_wait=1.0) as async_parser:
+            return await asyncio.gather(*[async_parser.parse(text) for text in TEXTS])
+
+    asyncio.run(parse_all())
+    assert sum(batch_sizes) == len(TEXTS)
+    assert max(batch_sizes) == 8
+    assert len(batch_sizes) < len(TEXTS)
+
+
+def test_async_parse_error(blank_conllparser, monkeypatch):
+    def fail(texts, **kwargs):
+        raise RuntimeError("parse error")
+
+    monkeypatch.setattr(blank_conllparser, "parse_texts_as_conll", fail)
+
+    async def parse_one():
+        async with AsyncConllParser(blank_conllparser) as async_parser:
+            return await async_parser.parse("Hello")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(parse_one())
+
+
+def test_async_parse_after_close(blank_conllparser):
+    async def close_and_parse():
+        async_parser = AsyncConllParser(blank_conllparser)
+        await async_parser.parse("Hello")
+        await async_parser.aclose()
+        # Closing twice is fine
+        await async_parser.aclose()
+        return await async_parser.parse("Hello")
+
+    with pytest.raises(RuntimeError, match="closed"):
+        asyncio.run(close_and_parse())
+
+
+def test_async_close_does_not_block(blank_conllparser, monkeypatch):
+    parse_texts_as_conll = blank_conllparser.parse_texts_as_conll
+
+    def slow_parse_texts(texts, **kwargs):
+        time.sleep(0.3)
+        return parse_texts_as_conll(texts, **kwargs)
+
+    monkeypatch.setattr(blank_conllparser, "parse_texts_as_conll", slow_parse_texts)
+
+    async def close_while_parsing():
+        async_parser = AsyncConllParser(blank_conllparser)
+        task = asyncio.ensure_future(async_parser.parse("Hello"))
+        await asyncio.sleep(0.05)
+
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        await async_parser.aclose()
+        ticker.cancel()
+        task.cancel()
+        return ticks
+
+    # The event loop keeps running while the worker thread finishes the batch
+    assert asyncio.run(close_while_parsing()) > 5
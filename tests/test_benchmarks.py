@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+BENCHMARKS = Path(__file__).parents[1].joinpath("benchmarks", "run_benchmarks.py")
+
+
+def run_benchmarks(*args) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(BENCHMARKS), "--sizes", "300", "--repeat", "1", *args], capture_output=True, text=True
+    )
+
+
+def test_benchmarks(tmp_path: Path):
+    results_file = tmp_path.joinpath("results.json")
+    proc = run_benchmarks("--output", str(results_file))
+    assert proc.returncode == 0, proc.stderr
+
+    results = json.loads(results_file.read_text(encoding="utf-8"))["results"]
+    assert {name.split("[")[0] for name in results} == {"formatter", "reader", "parse_text_as_conll", "cli"}
+    for result in results.values():
+        assert result["n_tokens"] == 300
+        assert result["tokens_per_sec"] > 0
+        assert result["peak_memory_mib"] > 0
+
+
+def test_benchmarks_baseline(tmp_path: Path):
+    baseline_file = tmp_path.joinpath("baseline.json")
+    proc = run_benchmarks("--cases", "formatter[pandas=False", "--no_memory", "--output", str(baseline_file))
+    assert proc.returncode == 0, proc.stderr
+
+    # Tiny benchmarks are noisy, so only fail for very large differences
+    proc = run_benchmarks(
+        "--cases", "formatter[pandas=False", "--no_memory", "--baseline", str(baseline_file), "--tolerance", "0.9"
+    )
+    assert proc.returncode == 0, proc.stderr
+
+    # A baseline that is impossible to reach
+    baseline = json.loads(baseline_file.read_text(encoding="utf-8"))
+    for result in baseline["results"].values():
+        result["tokens_per_sec"] *= 1000
+    baseline_file.write_text(json.dumps(baseline), encoding="utf-8")
+    proc = run_benchmarks("--cases", "formatter[pandas=False", "--no_memory", "--baseline", str(baseline_file))
+    assert proc.returncode == 1
+    assert "Regressions compared to the baseline" in proc.stderr
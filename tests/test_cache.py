@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+from spacy_conll.cache import ConllCache
+from spacy_conll.parser import ConllParser
+
+
+LINES = ["I like cookies. Me too!", "What about you?", "I like cookies. Me too!", "Nope.", "What about you?"] * 3
+
+
+def test_conll_cache_lru():
+    cache = ConllCache(maxsize=2)
+    cache.set(b"a", [("A", "1\tA\n")])
+    cache.set(b"b", [("B", "1\tB\n")])
+    assert cache.get(b"a") == [("A", "1\tA\n")]
+    # "b" is now the least recently used item
+    cache.set(b"c", [("C", "1\tC\n")])
+    assert len(cache) == 2
+    assert cache.get(b"b") is None
+    assert cache.get(b"c") is not None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_conll_cache_sqlite(tmp_path: Path):
+    path = tmp_path.joinpath("cache.sqlite")
+    with ConllCache(maxsize=0, path=path) as cache:
+        cache.set(b"a", [("A", "1\tA\n")])
+
+    with ConllCache(path=path) as cache:
+        assert cache.get(b"a") == [("A", "1\tA\n")]
+        assert cache.get(b"b") is None
+
+
+@pytest.mark.parametrize("no_force_counting", [False, True])
+def test_conllparser_cache(blank_conllparser: ConllParser, tmp_path: Path, no_force_counting):
+    expected = list(blank_conllparser.iter_lines_as_conll(LINES, no_force_counting=no_force_counting))
+
+    cache = ConllCache(maxsize=2, path=tmp_path.joinpath("cache.sqlite"))
+    parser = ConllParser(blank_conllparser.nlp, cache=cache)
+    assert list(parser.iter_lines_as_conll(LINES, no_force_counting=no_force_counting)) == expected
+    # Only the distinct lines are parsed, repetitions come from the cache
+    assert cache.misses == len(set(LINES))
+    assert cache.hits == len(LINES) - len(set(LINES))
+
+    # All lines are now in the on-disk cache, and the sentence IDs must still be consecutive
+    assert list(parser.iter_lines_as_conll(LINES, no_force_counting=no_force_counting)) == expected
+    assert cache.hits == 2 * len(LINES) - len(set(LINES))
+    cache.close()
+
+
+@pytest.mark.parametrize("readahead", [3, 10_000])
+def test_conllparser_cache_single_pipe(blank_conllparser: ConllParser, monkeypatch, readahead: int):
+    lines = [f"Sentence number {idx}." for idx in range(40)]
+    parser = ConllParser(blank_conllparser.nlp, cache=ConllCache())
+    # Every other line is in the cache
+    list(parser.iter_lines_as_conll(lines[::2]))
+
+    pipe_calls = []
+    pipe = parser._pipe
+
+    def pipe_spy(lines, *args, **kwargs):
+        pipe_calls.append(lines)
+        return pipe(lines, *args, **kwargs)
+
+    monkeypatch.setattr(parser, "_pipe", pipe_spy)
+    monkeypatch.setattr("spacy_conll.parser.CACHE_READAHEAD", readahead)
+    # A run of 8 lines that are in the cache
+    lines = lines[:10] + lines[:2] * 4 + lines[10:]
+    assert list(parser.iter_lines_as_conll(lines)) == list(blank_conllparser.iter_lines_as_conll(lines))
+    # The pipeline is only restarted after a long run of lines that are in the cache
+    assert len(pipe_calls) == (2 if readahead == 3 else 1)
+
+
+def test_conllparser_cache_key(blank_conllparser: ConllParser):
+    parser = ConllParser(blank_conllparser.nlp, cache=ConllCache())
+    assert parser._get_cache_key(LINES[0]) == parser._get_cache_key(LINES[2])
+    assert parser._get_cache_key(LINES[0]) != parser._get_cache_key(LINES[1])
@@ -0,0 +1,220 @@
+import os
+from argparse import Namespace
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from spacy_conll import init_parser
+from spacy_conll.cli.parse import find_input_files, parse
+from spacy_conll.parser import ConllParser
+
+
+def get_cli_args(**kwargs):
+    args = {
+        "input_file": None,
+        "input_encoding": "utf-8",
+        "input_str": None,
+        "output_file": None,
+        "output_encoding": "utf-8",
+        "atomic_output": False,
+        "model_or_lang": "blank:en",
+        "parser": "spacy",
+        "disable_sbd": True,
+        "is_tokenized": False,
+        "include_headers": True,
+        "no_force_counting": False,
+        "n_process": 1,
+        "verbose": False,
+        "ignore_pipe_errors": False,
+        "no_split_on_newline": False,
+        "batch_size": None,
+        "bucket_window": None,
+        "cache_size": 0,
+        "cache_file": None,
+        "server": None,
+        "server_timeout": 120.0,
+        "backend": "pipe",
+        "torch_threads": None,
+        "torch_interop_threads": None,
+        "inputs": None,
+        "manifest": None,
+        "input_pattern": "*.txt",
+        "output_dir": None,
+        "output_suffix": ".conllu",
+        "force": False,
+        "profile": False,
+        "cprofile_stages": None,
+        "fields": None,
+    }
+    args.update(kwargs)
+    return Namespace(**args)
+
+
+@pytest.mark.parametrize("batch_size,bucket_window", [(None, None), (2, 3)])
+def test_cli_file_to_file(tmp_path: Path, batch_size, bucket_window):
+    input_file = Path(__file__).parent.joinpath("test.txt")
+    output_file = tmp_path.joinpath("output.conllu")
+    parse(
+        get_cli_args(
+            input_file=str(input_file),
+            output_file=str(output_file),
+            batch_size=batch_size,
+            bucket_window=bucket_window,
+        )
+    )
+
+    parser = ConllParser(init_parser("blank:en", "spacy", disable_sbd=True, include_headers=True))
+    expected = parser.parse_file_as_conll(input_file, input_encoding="utf-8")
+    assert output_file.read_text(encoding="utf-8") == expected
+
+
+@pytest.mark.parametrize("atomic_output", [True, False])
+def test_cli_output_file_on_error(tmp_path: Path, monkeypatch, atomic_output: bool):
+    def failing_iter_file_as_conll(self, *args, **kwargs):
+        yield "1\tI\n"
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(ConllParser, "iter_file_as_conll", failing_iter_file_as_conll)
+    input_file = Path(__file__).parent.joinpath("test.txt")
+    output_file = tmp_path.joinpath("output.conllu")
+    output_file.write_text("previous output", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        parse(get_cli_args(input_file=str(input_file), output_file=str(output_file), atomic_output=atomic_output))
+
+    # With 'atomic_output', the previous output is untouched. Otherwise, sentences are written as they are parsed
+    expected = "previous output" if atomic_output else "1\tI\n"
+    assert output_file.read_text(encoding="utf-8") == expected
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+def test_cli_str_to_stdout(monkeypatch):
+    fhout = StringIO()
+    monkeypatch.setattr("spacy_conll.cli.parse.stdout", fhout)
+    parse(get_cli_args(input_str="I like cookies.\nWhat about you?"))
+    output = fhout.getvalue()
+    assert output.count("# sent_id") == 2
+    assert "\n\n# sent_id = 2\n" in output
+
+
+def test_cli_cache(tmp_path: Path, monkeypatch):
+    cache_file = tmp_path.joinpath("cache.sqlite")
+    outputs = []
+    for _ in range(2):
+        fhout = StringIO()
+        monkeypatch.setattr("spacy_conll.cli.parse.stdout", fhout)
+        parse(get_cli_args(input_str="I like cookies.\nWhat about you?\nI like cookies.", cache_file=str(cache_file)))
+        outputs.append(fhout.getvalue())
+
+    assert cache_file.exists()
+    assert outputs[0] == outputs[1]
+    assert "\n\n# sent_id = 3\n" in outputs[1]
+
+
+def test_cli_server(tmp_path: Path, monkeypatch, conll_server_address):
+    outputs = []
+    for server in (None, conll_server_address, str(tmp_path.joinpath("missing.sock"))):
+        fhout = StringIO()
+        monkeypatch.setattr("spacy_conll.cli.parse.stdout", fhout)
+        parse(get_cli_args(input_str="I like cookies.\nWhat about you?", server=server))
+        outputs.append(fhout.getvalue())
+
+    assert outputs[0] == outputs[1] == outputs[2]
+
+
+def test_cli_profile(monkeypatch):
+    fhout = StringIO()
+    fherr = StringIO()
+    monkeypatch.setattr("spacy_conll.cli.parse.stdout", fhout)
+    monkeypatch.setattr("spacy_conll.cli.parse.stderr", fherr)
+    parse(get_cli_args(input_str="I like cookies.\nWhat about you?", profile=True, cprofile_stages=["format"]))
+    err = fherr.getvalue()
+    for stage in ("split", "pipe", "format", "write"):
+        assert f"\n{stage} " in err
+    assert "2 lines, 30 characters, 2 sentences and 8 tokens" in err
+    assert "cProfile of stage 'format'" in err
+    assert fhout.getvalue().count("# sent_id") == 2
+
+
+def test_cli_fields(monkeypatch):
+    fhout = StringIO()
+    monkeypatch.setattr("spacy_conll.cli.parse.stdout", fhout)
+    parse(get_cli_args(input_str="I like cookies.", include_headers=False, fields=["FORM"]))
+    assert fhout.getvalue().splitlines()[1] == "2\tlike\t_\t_\t_\t_\t_\t_\t_\t_"
+
+
+def test_cli_pool(tmp_path: Path):
+    input_file = Path(__file__).parent.joinpath("test.txt")
+    outputs = []
+    for backend, n_process in (("pipe", 1), ("pool", 2)):
+        output_file = tmp_path.joinpath(f"{backend}.conllu")
+        args = get_cli_args(input_file=str(input_file), output_file=str(output_file))
+        args.backend, args.n_process = backend, n_process
+        parse(args)
+        outputs.append(output_file.read_text(encoding="utf-8"))
+
+    assert outputs[0] == outputs[1]
+
+
+@pytest.fixture
+def batch_input_dir(tmp_path: Path) -> Path:
+    input_dir = tmp_path.joinpath("corpus")
+    input_dir.joinpath("sub").mkdir(parents=True)
+    input_dir.joinpath("a.txt").write_text("I like cookies.\nWhat about you?", encoding="utf-8")
+    input_dir.joinpath("sub", "b.txt").write_text("Hello there.\nGeneral Kenobi.", encoding="utf-8")
+    input_dir.joinpath("sub", "ignored.md").write_text("Not parsed.", encoding="utf-8")
+    return input_dir
+
+
+@pytest.mark.parametrize("backend,n_process", [("pipe", 1), ("pool", 2)])
+def test_cli_batch_dir(tmp_path: Path, batch_input_dir: Path, backend, n_process):
+    output_dir = tmp_path.joinpath("output")
+    args = get_cli_args(inputs=[str(batch_input_dir)], output_dir=str(output_dir))
+    args.backend, args.n_process = backend, n_process
+    parse(args)
+
+    assert sorted(path.relative_to(output_dir).as_posix() for path in output_dir.rglob("*")) == [
+        "a.conllu",
+        "sub",
+        "sub/b.conllu",
+    ]
+    parser = ConllParser(init_parser("blank:en", "spacy", disable_sbd=True, include_headers=True))
+    for rel_path in ("a", "sub/b"):
+        # Sentence IDs restart in every file
+        expected = parser.parse_file_as_conll(batch_input_dir.joinpath(f"{rel_path}.txt"), input_encoding="utf-8")
+        assert output_dir.joinpath(f"{rel_path}.conllu").read_text(encoding="utf-8") == expected
+
+
+def test_cli_batch_skip_up_to_date(tmp_path: Path, batch_input_dir: Path, capsys):
+    output_dir = tmp_path.joinpath("output")
+    args = get_cli_args(inputs=[str(batch_input_dir)], output_dir=str(output_dir), verbose=True)
+    parse(args)
+    assert "Parsed 2 files, skipped 0 files" in capsys.readouterr().out
+
+    parse(args)
+    assert "Parsed 0 files, skipped 2 files" in capsys.readouterr().out
+
+    # Make the input newer than its output
+    output_file = output_dir.joinpath("a.conllu")
+    os.utime(output_file, ns=(0, 0))
+    parse(args)
+    assert "Parsed 1 files, skipped 1 files" in capsys.readouterr().out
+
+    args.force = True
+    parse(args)
+    assert "Parsed 2 files, skipped 0 files" in capsys.readouterr().out
+
+
+def test_find_input_files(tmp_path: Path, batch_input_dir: Path):
+    files = find_input_files([str(batch_input_dir.joinpath("**", "*.txt"))])
+    assert [rel_path.as_posix() for _, rel_path in files] == ["a.txt", "sub/b.txt"]
+
+    files = find_input_files([str(batch_input_dir.joinpath("sub", "b.txt"))])
+    assert [rel_path.as_posix() for _, rel_path in files] == ["b.txt"]
+
+    manifest = tmp_path.joinpath("manifest.txt")
+    manifest.write_text("corpus/a.txt\n\ncorpus/sub/b.txt\n", encoding="utf-8")
+    files = find_input_files([], manifest=str(manifest))
+    assert [rel_path.as_posix() for _, rel_path in files] == ["a.txt", "sub/b.txt"]
+
+    with pytest.raises(FileNotFoundError):
+        find_input_files([str(tmp_path.joinpath("missing.txt"))])
@@ -0,0 +1,136 @@
+import gzip
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from spacy.tokens import DocBin
+from spacy.vocab import Vocab
+from spacy_conll.cli.parse import parse
+from spacy_conll.compression import get_compression, open_file, open_file_atomic, strip_compression_suffix
+from spacy_conll.convert import convert_conll_file_to_docbin
+from spacy_conll.index import build_conll_index
+from spacy_conll.parser import ConllParser
+from test_cli import get_cli_args
+
+
+CONLL_SAMPLE = Path(__file__).parent.joinpath("en_ewt-ud-dev.conllu-sample.txt")
+TEXT = "I like cookies.\nWhat about you?\nMe too!\n"
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "xz", "zstd"])
+def test_open_file(tmp_path: Path, compression: str):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+
+    ext = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz", "zstd": ".zst"}[compression]
+    pfout = tmp_path.joinpath(f"text.txt{ext}")
+    with open_file(pfout, "w", encoding="utf-8") as fhout:
+        fhout.write(TEXT)
+
+    assert get_compression(pfout) == compression
+    assert pfout.read_bytes() != TEXT.encode("utf-8")
+    with open_file(pfout, encoding="utf-8") as fhin:
+        assert list(fhin) == TEXT.splitlines(keepends=True)
+
+    # Without the extension, the compression is detected from the first bytes
+    pfin = pfout.rename(tmp_path.joinpath("text.txt"))
+    assert get_compression(pfin) is None
+    assert get_compression(pfin, sniff=True) == compression
+    with open_file(pfin, encoding="utf-8") as fhin:
+        assert fhin.read() == TEXT
+
+
+def test_open_file_invalid(tmp_path: Path):
+    with pytest.raises(ValueError):
+        open_file(tmp_path.joinpath("text.txt"), "a")
+    with pytest.raises(ValueError):
+        open_file(tmp_path.joinpath("text.txt"), "w", compression="zip")
+
+
+def test_open_file_atomic(tmp_path: Path):
+    pfout = tmp_path.joinpath("text.txt.gz")
+    pfout.write_text("previous", encoding="utf-8")
+    os.chmod(pfout, 0o640)
+    # Concurrent writers each get their own temporary file, and the last one to finish wins
+    with open_file_atomic(pfout, "utf-8") as fhout:
+        fhout.write(TEXT)
+        with open_file_atomic(pfout, "utf-8") as other_fhout:
+            other_fhout.write("other")
+        with open_file(pfout, encoding="utf-8") as fhin:
+            assert fhin.read() == "other"
+
+    with open_file(pfout, encoding="utf-8") as fhin:
+        assert fhin.read() == TEXT
+    assert stat.S_IMODE(pfout.stat().st_mode) == 0o640
+    assert list(tmp_path.iterdir()) == [pfout]
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="Named pipes are not supported on this platform")
+def test_open_file_atomic_fifo(tmp_path: Path):
+    fifo = tmp_path.joinpath("text.txt")
+    os.mkfifo(fifo)
+    with ThreadPoolExecutor(1) as executor:
+        text = executor.submit(fifo.read_text, encoding="utf-8")
+        with open_file_atomic(fifo, "utf-8") as fhout:
+            fhout.write(TEXT)
+        assert text.result(timeout=10) == TEXT
+
+    assert stat.S_ISFIFO(fifo.stat().st_mode)
+    assert list(tmp_path.iterdir()) == [fifo]
+
+
+def test_strip_compression_suffix():
+    assert strip_compression_suffix("corpus/text.txt.gz") == Path("corpus/text.txt")
+    assert strip_compression_suffix("corpus/text.txt") == Path("corpus/text.txt")
+
+
+def test_parse_compressed_file(blank_conllparser: ConllParser, tmp_path: Path):
+    pfin = tmp_path.joinpath("text.txt.gz")
+    with gzip.open(pfin, "wt", encoding="utf-8") as fhout:
+        fhout.write(TEXT)
+
+    expected = blank_conllparser.parse_text_as_conll(TEXT)
+    assert blank_conllparser.parse_file_as_conll(pfin, "utf-8") == expected
+    assert blank_conllparser.parse_file_as_conll(
+        pfin, "utf-8", no_split_on_newline=True
+    ) == blank_conllparser.parse_text_as_conll(TEXT, no_split_on_newline=True)
+
+    pfout = tmp_path.joinpath("text.conllu.xz")
+    blank_conllparser.parse_files_as_conll([(pfin, pfout)], "utf-8", "utf-8")
+    with open_file(pfout, encoding="utf-8") as fhin:
+        assert fhin.read() == expected
+
+
+def test_parse_compressed_conll_file(blank_conllparser: ConllParser, tmp_path: Path):
+    pfin = tmp_path.joinpath("sample.conllu.bz2")
+    with open_file(pfin, "w", encoding="utf-8") as fhout:
+        fhout.write(CONLL_SAMPLE.read_text(encoding="utf-8"))
+
+    expected = blank_conllparser.parse_conll_file_as_spacy(CONLL_SAMPLE, "utf-8")
+    assert blank_conllparser.parse_conll_file_as_spacy(pfin, "utf-8").text == expected.text
+    docs = list(blank_conllparser.iter_conll_file_as_spacy(pfin, "utf-8"))
+    assert [doc.text for doc in docs] == [doc.text for doc in blank_conllparser.iter_conll_file_as_spacy(CONLL_SAMPLE)]
+
+    pfout = tmp_path.joinpath("sample.spacy")
+    assert convert_conll_file_to_docbin(pfin, pfout, "utf-8", n_process=2) == len(docs)
+    assert [doc.text for doc in DocBin().from_disk(pfout).get_docs(Vocab())] == [doc.text for doc in docs]
+
+    with pytest.raises(ValueError):
+        build_conll_index(pfin, input_encoding="utf-8")
+
+
+def test_cli_compressed(tmp_path: Path):
+    pfin = tmp_path.joinpath("input.txt.gz")
+    with gzip.open(pfin, "wt", encoding="utf-8") as fhout:
+        fhout.write(TEXT)
+
+    pfout = tmp_path.joinpath("output.conllu.gz")
+    parse(get_cli_args(input_file=str(pfin), output_file=str(pfout)))
+    with gzip.open(pfout, "rt", encoding="utf-8") as fhin:
+        assert fhin.read().count("# sent_id") == 3
+
+    output_dir = tmp_path.joinpath("output")
+    parse(get_cli_args(inputs=[str(tmp_path)], input_pattern="*.txt.gz", output_dir=str(output_dir)))
+    assert output_dir.joinpath("input.conllu").read_text(encoding="utf-8").count("# sent_id") == 3
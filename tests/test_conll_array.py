@@ -0,0 +1,35 @@
+import numpy as np
+from spacy.tokens import Doc
+from spacy_conll.formatter import CONLL_FIELD_NAMES, ConllFormatter, get_conll_array_row, get_conll_array_sent
+
+
+def test_conll_array(spacy_annotated_doc: Doc):
+    formatter = ConllFormatter(include_array=True, disable_pandas=True)
+    doc = formatter(spacy_annotated_doc)
+
+    assert doc.has_extension("conll_array")
+    conll_array = doc._.conll_array
+    assert CONLL_FIELD_NAMES == list(conll_array.keys())
+    assert conll_array["ID"].dtype == np.int32
+    assert conll_array["HEAD"].dtype == np.int32
+    assert conll_array["DEPREL"].dtype == np.uint64
+    assert conll_array["ID"].tolist() == [1, 2, 3, 4, 1, 2, 3]
+    assert conll_array["HEAD"].tolist() == [2, 0, 2, 2, 0, 1, 1]
+    assert doc.vocab.strings[conll_array["FEATS"][3]] == "_"
+
+
+def test_conll_array_decode(spacy_annotated_doc: Doc):
+    formatter = ConllFormatter(include_array=True, disable_pandas=True, conversion_maps={"DEPREL": {"nsubj": "subj"}})
+    doc = formatter(spacy_annotated_doc)
+
+    for token in doc:
+        assert get_conll_array_row(doc, token.i) == token._.conll
+    for sent_idx, sent in enumerate(doc.sents):
+        assert get_conll_array_sent(doc, sent_idx) == sent._.conll
+
+    assert get_conll_array_row(doc, 0)["DEPREL"] == "subj"
+
+
+def test_conll_array_disabled(spacy_annotated_doc: Doc):
+    doc = ConllFormatter(disable_pandas=True)(spacy_annotated_doc)
+    assert not doc.has_extension("conll_array")
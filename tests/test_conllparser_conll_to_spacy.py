@@ -1,8 +1,13 @@
 from pathlib import Path
+from types import GeneratorType
 
+import pytest
 from spacy_conll.parser import ConllParser
 
 
+CONLL_SAMPLE = Path(__file__).parent.joinpath("en_ewt-ud-dev.conllu-sample.txt")
+
+
 def test_conllf_to_spacy(spacy_conllparser: ConllParser, conll_testfile: Path):
     doc = spacy_conllparser.parse_conll_file_as_spacy(conll_testfile, input_encoding="utf-8")
 
@@ -20,3 +25,33 @@ def test_conllstr_to_spacy(spacy_conllparser: ConllParser, conll_testfile: Path)
     assert doc.has_annotation("DEP")
     assert doc.has_annotation("TAG")
     assert doc.has_annotation("MORPH")
+
+
+def test_iter_conllf_to_spacy(blank_conllparser: ConllParser):
+    docs = blank_conllparser.iter_conll_file_as_spacy(CONLL_SAMPLE, input_encoding="utf-8")
+    assert isinstance(docs, GeneratorType)
+
+    docs = list(docs)
+    full_doc = blank_conllparser.parse_conll_file_as_spacy(CONLL_SAMPLE, input_encoding="utf-8")
+
+    assert len(docs) == 2
+    assert all(len(list(doc.sents)) == 1 for doc in docs)
+    assert [doc._.conll_str for doc in docs] == [sent._.conll_str for sent in full_doc.sents]
+
+
+@pytest.mark.parametrize("group_by,n_docs", [("sentence", 4), ("newdoc", 2), (3, 2), (4, 1)])
+def test_iter_conll_lines_to_spacy_group_by(blank_conllparser: ConllParser, group_by, n_docs):
+    # Two "documents" of two sentences each, with some superfluous empty lines in between
+    text = CONLL_SAMPLE.read_text(encoding="utf-8")
+    lines = (text.strip() + "\n\n\n" + text).splitlines(keepends=True)
+    docs = list(blank_conllparser.iter_conll_lines_as_spacy(lines, group_by=group_by))
+
+    assert len(docs) == n_docs
+    assert sum(len(list(doc.sents)) for doc in docs) == 4
+    assert all(doc.has_annotation("DEP") for doc in docs)
+
+
+@pytest.mark.parametrize("group_by", ["doc", 0, -1, True])
+def test_iter_conll_lines_to_spacy_invalid_group_by(blank_conllparser: ConllParser, group_by):
+    with pytest.raises(ValueError):
+        list(blank_conllparser.iter_conll_lines_as_spacy([], group_by=group_by))
@@ -0,0 +1,78 @@
+from pathlib import Path
+from types import GeneratorType
+
+import pytest
+from spacy.tokens import Doc
+from spacy_conll import ConllFormatter, init_parser
+from spacy_conll.parser import ConllParser
+
+
+def test_iter_text_as_conll(blank_conllparser: ConllParser):
+    text = Path(__file__).parent.joinpath("test.txt").read_text(encoding="utf-8")
+    sents = blank_conllparser.iter_text_as_conll(text)
+    assert isinstance(sents, GeneratorType)
+
+    sents = list(sents)
+    # Force counting makes sure that sentence IDs are consecutive across lines
+    for sent_id, sent in enumerate(sents, 1):
+        assert sent.startswith(f"# sent_id = {sent_id}\n")
+
+    assert "\n".join(sents) == blank_conllparser.parse_text_as_conll(text)
+
+
+def test_iter_file_as_conll(blank_conllparser: ConllParser):
+    path = Path(__file__).parent.joinpath("test.txt")
+    sents = list(blank_conllparser.iter_file_as_conll(path, input_encoding="utf-8"))
+
+    assert len(sents) == 5
+    assert "\n".join(sents) == blank_conllparser.parse_text_as_conll(path.read_text(encoding="utf-8"))
+    assert "\n".join(sents) == blank_conllparser.parse_file_as_conll(path, input_encoding="utf-8")
+
+
+def test_iter_text_as_conll_n_process():
+    # The formatter runs in the main process, so sentence IDs are consecutive regardless of the number of processes,
+    # and pandas does not have to be disabled
+    nlp = init_parser("blank:en", "spacy", disable_sbd=True, include_headers=True)
+    parser = ConllParser(nlp)
+    text = Path(__file__).parent.joinpath("test.txt").read_text(encoding="utf-8")
+
+    sents = list(parser.iter_text_as_conll(text, n_process=2))
+    for sent_id, sent in enumerate(sents, 1):
+        assert sent.startswith(f"# sent_id = {sent_id}\n")
+    assert sents == list(parser.iter_text_as_conll(text))
+
+
+@pytest.mark.parametrize("with_init_kwargs", [True, False])
+def test_iter_text_as_conll_pool(with_init_kwargs):
+    init_kwargs = {"model_or_lang": "blank:en", "parser": "spacy", "disable_sbd": True, "include_headers": True}
+    parser = ConllParser(init_parser(**init_kwargs), init_kwargs=init_kwargs if with_init_kwargs else None)
+    text = Path(__file__).parent.joinpath("test.txt").read_text(encoding="utf-8")
+
+    sents = list(parser.iter_text_as_conll(text, n_process=2, backend="pool", batch_size=2))
+    for sent_id, sent in enumerate(sents, 1):
+        assert sent.startswith(f"# sent_id = {sent_id}\n")
+    assert sents == list(parser.iter_text_as_conll(text))
+
+
+def test_iter_text_as_conll_invalid_backend(blank_conllparser: ConllParser):
+    with pytest.raises(ValueError):
+        blank_conllparser.parse_text_as_conll("Hello", backend="threads")
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_formatter_sent_id_offset(spacy_annotated_doc: Doc, lazy):
+    formatter = ConllFormatter(include_headers=True, disable_pandas=True, lazy=lazy)
+    doc = formatter(spacy_annotated_doc, sent_id_offset=10)
+
+    assert [sent._.conll_str.split("\n")[0] for sent in doc.sents] == ["# sent_id = 11", "# sent_id = 12"]
+    assert doc._.conll_str.startswith("# sent_id = 11\n")
+
+
+@pytest.mark.parametrize("bucket_window", [1, 3, 100])
+def test_iter_lines_as_conll_bucketed(blank_conllparser: ConllParser, bucket_window):
+    # Lines of very different lengths, which are reordered for parsing but must be returned in the original order
+    lines = [" ".join(["word"] * n_words) + "." for n_words in (30, 1, 12, 3, 50, 2, 7)]
+    expected = list(blank_conllparser.iter_lines_as_conll(lines))
+    sents = list(blank_conllparser.iter_lines_as_conll(lines, batch_size=2, bucket_window=bucket_window))
+
+    assert sents == expected
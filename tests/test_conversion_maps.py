@@ -1,3 +1,8 @@
+import pytest
+from spacy.tokens import Doc
+from spacy_conll.formatter import ConllFormatter
+
+
 def test_conversion_map_pronoun(spacy_conversion_map_doc):
     pronoun = spacy_conversion_map_doc[0]
     # Verify that -PRON- was changed to PRON
@@ -5,3 +10,38 @@ def test_conversion_map_pronoun(spacy_conversion_map_doc):
     # lemma is the third column
     assert pronoun._.conll_str.split("\t")[2] == "he"
     assert pronoun._.conll_pd["LEMMA"] == "he"
+
+
+@pytest.mark.parametrize("field_name", ["DEPREL", "deprel", "dep_rel"])
+def test_conversion_map_field_names(spacy_annotated_doc: Doc, field_name):
+    # Conversion maps can use the default or the custom field name, case-insensitively
+    formatter = ConllFormatter(conversion_maps={field_name: {"nsubj": "subj"}}, field_names={"DEPREL": "dep_rel"})
+    doc = formatter(spacy_annotated_doc)
+
+    assert doc[0]._.conll["dep_rel"] == "subj"
+    assert doc[0]._.conll_str.split("\t")[7] == "subj"
+    assert doc[1]._.conll["dep_rel"] == "ROOT"
+    assert formatter._get_token_conll(doc[0])["dep_rel"] == "subj"
+
+
+def test_conversion_map_multiple_fields(spacy_annotated_doc: Doc):
+    conversion_maps = {
+        "UPOS": {"PRON": "PRN"},
+        "FEATS": {"_": "None"},
+        "MISC": {"SpaceAfter=No": "NoSpace"},
+        "HEAD": {0: -1},
+    }
+    doc = ConllFormatter(conversion_maps=conversion_maps, disable_pandas=True)(spacy_annotated_doc)
+
+    assert [token._.conll["UPOS"] for token in doc] == ["PRN", "VERB", "NOUN", "PUNCT", "PRN", "ADV", "PUNCT"]
+    assert [token._.conll["FEATS"] for token in doc][3:] == ["None", "Case=Acc", "None", "None"]
+    assert doc[2]._.conll["MISC"] == "NoSpace"
+    assert doc[1]._.conll["HEAD"] == -1
+
+
+def test_conversion_map_invalid_field_name(spacy_annotated_doc: Doc):
+    # Maps of unknown fields are ignored, so that existing configurations keep working
+    with pytest.warns(UserWarning, match="Unknown field name POS"):
+        formatter = ConllFormatter(conversion_maps={"POS": {"PRON": "PRN"}, "UPOS": {"VERB": "V"}})
+    doc = formatter(spacy_annotated_doc)
+    assert [token._.conll["UPOS"] for token in doc][:2] == ["PRON", "V"]
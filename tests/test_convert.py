@@ -0,0 +1,103 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+from spacy.tokens import DocBin
+from spacy.vocab import Vocab
+from spacy_conll.cli.convert import convert
+from spacy_conll.convert import _iter_shard_lines, convert_conll_file_to_docbin, find_conll_shard_offsets
+from spacy_conll.parser import ConllParser
+
+
+CONLL_SAMPLE = Path(__file__).parent.joinpath("en_ewt-ud-dev.conllu-sample.txt")
+
+
+@pytest.fixture
+def large_conll_file(tmp_path):
+    # Ten "documents" of two sentences each
+    text = CONLL_SAMPLE.read_text(encoding="utf-8").strip()
+    pfin = tmp_path.joinpath("large.conllu")
+    pfin.write_text("\n\n".join([text] * 10) + "\n", encoding="utf-8")
+    return pfin
+
+
+@pytest.mark.parametrize("newdoc", [False, True])
+def test_find_conll_shard_offsets(large_conll_file: Path, newdoc):
+    offsets = find_conll_shard_offsets(large_conll_file, 4, newdoc=newdoc)
+    assert len(offsets) == 4
+    assert offsets[0][0] == 0
+    assert offsets[-1][1] == large_conll_file.stat().st_size
+
+    data = large_conll_file.read_bytes()
+    for (start, end), (next_start, _) in zip(offsets, offsets[1:]):
+        assert end == next_start
+        # Every shard starts with a new sentence
+        assert data[next_start - 2 : next_start] == b"\n\n"
+        if newdoc:
+            assert data[next_start:].startswith(b"# newdoc")
+
+    # The shards are read line by line, and together they contain all lines of the file
+    lines = [line for start, end in offsets for line in _iter_shard_lines(large_conll_file, start, end, "utf-8")]
+    assert "".join(lines) == data.decode("utf-8")
+
+
+@pytest.mark.parametrize("n_process,group_by,n_docs", [(1, "sentence", 20), (2, "sentence", 20), (2, "newdoc", 10)])
+def test_convert_conll_file_to_docbin(
+    blank_conllparser: ConllParser, large_conll_file: Path, tmp_path: Path, n_process, group_by, n_docs
+):
+    pfout = tmp_path.joinpath("large.spacy")
+    assert convert_conll_file_to_docbin(large_conll_file, pfout, "utf-8", group_by=group_by, n_process=n_process) == (
+        n_docs
+    )
+
+    docs = list(DocBin().from_disk(pfout).get_docs(Vocab()))
+    assert len(docs) == n_docs
+
+    # The CoNLL-U specific information in the user data must survive the conversion
+    expected = blank_conllparser.parse_conll_file_as_spacy(large_conll_file, input_encoding="utf-8")
+    formatter = blank_conllparser.nlp.get_pipe("conll_formatter")
+    assert [sent._.conll_str for doc in docs for sent in formatter(doc).sents] == [
+        sent._.conll_str for sent in expected.sents
+    ]
+    assert [token._.conll_deps_graphs_field for doc in docs for token in doc] == [
+        token._.conll_deps_graphs_field for token in expected
+    ]
+
+
+def test_convert_cli(large_conll_file: Path, tmp_path: Path):
+    pfout = tmp_path.joinpath("large.spacy")
+    args = Namespace(
+        input_file=str(large_conll_file),
+        output_file=str(pfout),
+        input_encoding="utf-8",
+        group_by="4",
+        n_process=1,
+        n_shards=None,
+        no_merge=False,
+        verbose=False,
+    )
+    convert(args)
+
+    assert len(DocBin().from_disk(pfout)) == 5
+
+
+def test_convert_conll_file_to_docbin_no_merge(large_conll_file: Path, tmp_path: Path):
+    expected_file = tmp_path.joinpath("large.spacy")
+    convert_conll_file_to_docbin(large_conll_file, expected_file, "utf-8")
+    expected = DocBin().from_disk(expected_file).get_docs(Vocab())
+
+    output_dir = tmp_path.joinpath("large")
+    n_docs = convert_conll_file_to_docbin(
+        large_conll_file, output_dir, "utf-8", n_process=2, n_shards=4, merge_shards=False
+    )
+    assert n_docs == 20
+
+    # Every shard has its own DocBin, which sort in the order of the input file
+    shard_files = sorted(output_dir.glob("*.spacy"))
+    assert len(shard_files) == 4
+    docs = [doc for shard_file in shard_files for doc in DocBin().from_disk(shard_file).get_docs(Vocab())]
+    assert [doc.to_json() for doc in docs] == [doc.to_json() for doc in expected]
+
+    # Shards of an earlier conversion are not overwritten
+    with pytest.raises(FileExistsError):
+        convert_conll_file_to_docbin(large_conll_file, output_dir, "utf-8", merge_shards=False)
@@ -0,0 +1,47 @@
+import pytest
+from spacy.tokens import Doc
+from spacy_conll.formatter import CONLL_FIELD_NAMES, ConllFormatter, get_conll_array_sent
+
+
+def test_fields_fill(spacy_annotated_doc: Doc):
+    doc = ConllFormatter(fields=["form", "UPOS", "HEAD", "deprel"])(spacy_annotated_doc)
+    # ID is always included, the other fields are `_`
+    assert doc[1]._.conll_str == "2\tlike\t_\tVERB\t_\t_\t0\tROOT\t_\t_\n"
+    assert list(doc[1]._.conll.values()) == [2, "like", "_", "VERB", "_", "_", 0, "ROOT", "_", "_"]
+    assert list(doc.sents)[1]._.conll_pd["DEPREL"].tolist() == ["root", "advmod", "punct"]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_fields_drop(spacy_annotated_doc: Doc, lazy: bool):
+    formatter = ConllFormatter(
+        fields=["FEATS", "LEMMA"], drop_unselected_fields=True, lazy=lazy, field_names={"FEATS": "feats"}
+    )
+    doc = formatter(spacy_annotated_doc)
+    assert doc[0]._.conll_str == "I\tCase=Nom|Person=1\n"
+    assert list(doc[2]._.conll.items()) == [("LEMMA", "cookie"), ("feats", "Number=Plur")]
+    assert list(doc._.conll_pd.columns) == ["LEMMA", "feats"]
+    assert list(doc.sents)[1]._.conll_str == "I\tCase=Acc\ntoo\t_\n!\t_\n"
+
+
+def test_fields_all(spacy_annotated_doc: Doc):
+    expected = ConllFormatter(disable_pandas=True)(spacy_annotated_doc.copy())._.conll_str
+    formatter = ConllFormatter(disable_pandas=True, fields=list(reversed(CONLL_FIELD_NAMES)))
+    assert formatter(spacy_annotated_doc)._.conll_str == expected
+
+
+def test_fields_conversion_maps_and_array(spacy_annotated_doc: Doc):
+    formatter = ConllFormatter(
+        fields=["UPOS"],
+        conversion_maps={"UPOS": {"VERB": "V"}, "LEMMA": {"cookie": "biscuit"}},
+        include_array=True,
+        drop_unselected_fields=True,
+    )
+    doc = formatter(spacy_annotated_doc)
+    assert [token._.conll_str for token in doc][:2] == ["PRON\n", "V\n"]
+    assert list(doc._.conll_array) == ["ID", "UPOS"]
+    assert [token["UPOS"] for token in get_conll_array_sent(doc, 0)] == ["PRON", "V", "NOUN", "PUNCT"]
+
+
+def test_invalid_fields():
+    with pytest.raises(KeyError):
+        ConllFormatter(fields=["WORD"])
@@ -1,6 +1,6 @@
 from collections import OrderedDict
 
-from spacy.tokens import Token
+from spacy.tokens import Doc, Token
 from spacy_conll.formatter import ConllFormatter
 
 
@@ -24,3 +24,43 @@ def test_set_token_conll(spacy_token: Token):
     assert (
         formatter._set_token_conll(spacy_token)._.get("conll_str") == "1\tworld\t_\t_\t_\t_\t2\t_\t_\tSpaceAfter=No\n"
     )
+
+
+def test_conll_columns(spacy_annotated_doc: Doc):
+    """The vectorized extraction of all fields in a Doc should be identical to extracting them token by token"""
+    formatter = ConllFormatter(disable_pandas=True)
+    formatter(spacy_annotated_doc)
+
+    sents = list(spacy_annotated_doc.sents)
+    columns = formatter._get_conll_columns(sents)
+    for token, row in zip(spacy_annotated_doc, zip(*columns)):
+        assert tuple(formatter._get_token_conll(token, token.i - token.sent.start + 1).values()) == row
+
+    assert spacy_annotated_doc[4]._.conll["HEAD"] == 0
+    assert spacy_annotated_doc[5]._.conll["HEAD"] == 1
+    assert spacy_annotated_doc._.conll_str == (
+        "1\tI\tI\tPRON\tPRP\tCase=Nom|Person=1\t2\tnsubj\t_\t_\n"
+        "2\tlike\tlike\tVERB\tVBP\tTense=Pres\t0\tROOT\t_\t_\n"
+        "3\tcookies\tcookie\tNOUN\tNNS\tNumber=Plur\t2\tdobj\t_\tSpaceAfter=No\n"
+        "4\t.\t.\tPUNCT\t.\t_\t2\tpunct\t_\t_\n"
+        "\n"
+        "1\tMe\tI\tPRON\tPRP\tCase=Acc\t0\troot\t_\t_\n"
+        "2\ttoo\ttoo\tADV\tRB\t_\t1\tadvmod\t_\tSpaceAfter=No\n"
+        "3\t!\t!\tPUNCT\t.\t_\t1\tpunct\t_\tSpaceAfter=No\n"
+    )
+
+
+def test_conll_pd(spacy_annotated_doc: Doc):
+    formatter = ConllFormatter()
+    doc = formatter(spacy_annotated_doc)
+
+    doc_conll_pd = doc._.conll_pd
+    assert len(doc_conll_pd) == len(doc)
+    for sent in doc.sents:
+        sent_conll_pd = sent._.conll_pd
+        assert list(sent_conll_pd.index) == list(range(len(sent)))
+        assert sent_conll_pd.equals(doc_conll_pd.iloc[sent.start : sent.end].reset_index(drop=True))
+
+    for token in doc:
+        assert token._.conll_pd.name is None
+        assert token._.conll_pd.to_dict() == token._.conll
@@ -0,0 +1,24 @@
+import re
+import subprocess
+import sys
+
+
+def test_no_optional_imports():
+    # Optional dependencies should only be imported when they are used
+    code = (
+        "import sys; import spacy_conll;"
+        " print(','.join(m for m in ('pandas', 'spacy_stanza', 'stanza', 'spacy_udpipe') if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == ""
+
+
+def test_import_time():
+    # Import spaCy first so that we only measure the time that it takes to import spacy_conll itself
+    code = "import spacy; import spacy_conll"
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    ).stderr
+    # Lines look like "import time:       575 |     370463 | spacy_conll", with times in microseconds
+    cumulative_us = int(re.search(r"^import time:\s*\d+ \|\s*(\d+) \| spacy_conll$", stderr, flags=re.MULTILINE)[1])
+    assert cumulative_us < 1_000_000
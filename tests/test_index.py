@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from spacy_conll.index import ConllIndex, build_conll_index, get_conll_index_file
+from spacy_conll.parser import ConllParser
+
+
+CONLL_SAMPLE = Path(__file__).parent.joinpath("en_ewt-ud-dev.conllu-sample.txt")
+
+
+@pytest.fixture
+def indexed_conll_file(tmp_path):
+    # Ten copies of the two sample sentences, with unique sent_ids and some superfluous empty lines
+    text = CONLL_SAMPLE.read_text(encoding="utf-8").strip()
+    chunks = [text.replace("-000", f"-{copy_idx}-000") for copy_idx in range(10)]
+    pfin = tmp_path.joinpath("sample.conllu")
+    pfin.write_text("\n\n\n".join(chunks) + "\n", encoding="utf-8")
+    return pfin
+
+
+def test_build_conll_index(indexed_conll_file: Path):
+    index_file = build_conll_index(indexed_conll_file, input_encoding="utf-8")
+    assert index_file == get_conll_index_file(indexed_conll_file)
+    assert index_file.exists()
+
+
+def test_conll_index_get_doc(blank_conllparser: ConllParser, indexed_conll_file: Path):
+    expected = list(blank_conllparser.iter_conll_file_as_spacy(indexed_conll_file, input_encoding="utf-8"))
+
+    with ConllIndex(indexed_conll_file, blank_conllparser, input_encoding="utf-8") as index:
+        assert len(index) == 20
+        assert get_conll_index_file(indexed_conll_file).exists()
+
+        doc = index.get_doc(7)
+        assert doc._.conll_str == expected[7]._.conll_str
+
+        doc = index.get_doc([19, 0])
+        assert [sent._.conll_str for sent in doc.sents] == [expected[19]._.conll_str, expected[0]._.conll_str]
+
+
+def test_conll_index_get_doc_by_sent_id(blank_conllparser: ConllParser, indexed_conll_file: Path):
+    with ConllIndex(indexed_conll_file, blank_conllparser, input_encoding="utf-8") as index:
+        sent_id = "weblog-blogspot.com_nominations_20041117172713_ENG_20041117_172713-3-0002"
+        doc = index.get_doc_by_sent_id(sent_id)
+        assert f"# sent_id = {sent_id}\n" in doc._.conll_str
+        assert index.get_positions([sent_id]) == [7]
+
+        with pytest.raises(KeyError):
+            index.get_doc_by_sent_id("does-not-exist")
+
+
+def test_conll_index_outdated(blank_conllparser: ConllParser, indexed_conll_file: Path):
+    build_conll_index(indexed_conll_file, input_encoding="utf-8")
+
+    # Changing the CoNLL-U file should trigger a rebuild of the index
+    text = CONLL_SAMPLE.read_text(encoding="utf-8").strip()
+    indexed_conll_file.write_text(text + "\n", encoding="utf-8")
+    with ConllIndex(indexed_conll_file, blank_conllparser, input_encoding="utf-8") as index:
+        assert len(index) == 2
+
+
+def test_conll_index_sent_id_hashes(blank_conllparser: ConllParser, indexed_conll_file: Path, monkeypatch):
+    with ConllIndex(indexed_conll_file, blank_conllparser, input_encoding="utf-8") as index:
+        # Only hashes of the sent_ids are stored, which are read from the file when needed
+        assert index.sent_id_hashes.dtype == np.uint64
+        assert index.get_sent_id(7) == "weblog-blogspot.com_nominations_20041117172713_ENG_20041117_172713-3-0002"
+
+    # If all sent_ids have the same hash, the right sentence is still found
+    monkeypatch.setattr("spacy_conll.index._hash_sent_id", lambda sent_id: 0)
+    build_conll_index(indexed_conll_file, input_encoding="utf-8")
+    with ConllIndex(indexed_conll_file, blank_conllparser, input_encoding="utf-8") as index:
+        assert index.get_positions([index.get_sent_id(position) for position in range(20)]) == list(range(20))
+        with pytest.raises(KeyError):
+            index.get_positions(["does-not-exist"])
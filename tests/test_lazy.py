@@ -0,0 +1,100 @@
+import gc
+import pickle
+
+from pandas import CategoricalDtype, DataFrame, Series
+from spacy.language import Language
+from spacy.tokens import Doc, Token
+from spacy_conll.formatter import _LAZY_FORMATTERS, LAZY_FORMATTER_KEY, ConllFormatter, _get_lazy_formatter
+
+
+def multi_sent():
+    return "A cookie is a baked food. It usually contains flour. It may include other ingredients such as raisins."
+
+
+def test_lazy_extensions_are_getters(blank_lazy_parser: Language):
+    doc = blank_lazy_parser(multi_sent())
+    # Nothing is computed until the extensions are accessed, only the formatter is stored
+    assert list(doc.user_data) == [LAZY_FORMATTER_KEY]
+
+    assert isinstance(doc._.conll_str, str)
+    assert isinstance(doc._.conll, list)
+    assert isinstance(doc._.conll_pd, DataFrame)
+    for sent in doc.sents:
+        assert isinstance(sent._.conll_pd, DataFrame)
+    for token in doc:
+        assert isinstance(token._.conll, dict)
+        assert isinstance(token._.conll_pd, Series)
+
+    formatter = blank_lazy_parser.get_pipe("conll_formatter")
+    assert (len(doc.user_data) > 1) == formatter.memoize
+
+
+def test_lazy_equals_eager(blank_lazy_parser: Language, blank_parser: Language):
+    # Extensions are registered globally, so first collect the non-lazy values
+    eager_doc = blank_parser(multi_sent())
+    eager_conll_str = eager_doc._.conll_str
+    eager_conll = eager_doc._.conll
+    eager_conll_pd = eager_doc._.conll_pd
+    eager_sents_conll_str = [sent._.conll_str for sent in eager_doc.sents]
+    eager_tokens_conll_str = [token._.conll_str for token in eager_doc]
+
+    lazy_doc = blank_lazy_parser(multi_sent())
+    # Access the lazy Doc first: the Doc-level representation should not depend on lower levels
+    assert lazy_doc._.conll_str == eager_conll_str
+    assert lazy_doc._.conll == eager_conll
+    assert lazy_doc._.conll_pd.equals(eager_conll_pd)
+    assert [sent._.conll_str for sent in lazy_doc.sents] == eager_sents_conll_str
+    assert [token._.conll_str for token in lazy_doc] == eager_tokens_conll_str
+
+    # Arbitrary spans do not get CoNLL properties
+    assert lazy_doc[0:2]._.conll_str is None
+
+
+def test_lazy_formatters_with_other_configs(spacy_annotated_doc: Doc):
+    first = ConllFormatter(include_headers=True, lazy=True)
+    second = ConllFormatter(lazy=True, conversion_maps={"UPOS": {"PRON": "X"}})
+    first_doc = first(spacy_annotated_doc.copy())
+    second_doc = second(spacy_annotated_doc.copy())
+
+    # Every Doc uses the settings of the formatter that processed it
+    assert first_doc._.conll_str.startswith("# sent_id = 1\n")
+    assert first_doc[0]._.conll["UPOS"] == "PRON"
+    assert not second_doc._.conll_str.startswith("#")
+    assert second_doc[0]._.conll["UPOS"] == "X"
+
+    # Creating an eager formatter does not affect Docs that were processed by a lazy one
+    eager_doc = ConllFormatter(disable_pandas=True)(spacy_annotated_doc.copy())
+    assert second_doc._.conll_str is not None
+    assert second_doc[0]._.conll["UPOS"] == "X"
+    assert eager_doc[0]._.conll["UPOS"] == "PRON"
+
+    # Processing a Doc again replaces the settings of the previous formatter
+    assert second(first_doc)._.conll_str == second_doc._.conll_str
+
+
+def test_lazy_pickled_doc(spacy_annotated_doc: Doc):
+    formatter = ConllFormatter(
+        lazy=True,
+        memoize=False,
+        conversion_maps={"HEAD": {0: -1}},
+        pd_dtypes={"UPOS": CategoricalDtype(["ADV", "NOUN", "PRON", "PUNCT", "VERB"])},
+    )
+    doc_bytes = pickle.dumps(formatter(spacy_annotated_doc))
+    formatter_id = formatter._id
+    # The formatter is not kept alive by the Docs it processed, as if the Doc is unpickled in another process
+    del formatter
+    gc.collect()
+    assert formatter_id not in _LAZY_FORMATTERS
+
+    doc = pickle.loads(doc_bytes)
+    assert doc[1]._.conll["HEAD"] == -1
+    assert doc._.conll_pd["UPOS"].dtype == CategoricalDtype(["ADV", "NOUN", "PRON", "PUNCT", "VERB"])
+    # The formatter is recreated only once
+    assert _get_lazy_formatter(doc) is _get_lazy_formatter(doc)
+
+
+def test_lazy_keeps_other_extensions(spacy_annotated_doc: Doc):
+    Token.set_extension("conll", getter=lambda token: "custom")
+    doc = ConllFormatter(lazy=True)(spacy_annotated_doc)
+    assert doc[0]._.conll == "custom"
+    assert doc[0]._.conll_str.startswith("1\tI\t")
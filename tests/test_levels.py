@@ -0,0 +1,81 @@
+import pickle
+
+import pytest
+from pandas import Series
+from spacy.tokens import Doc, Token
+from spacy_conll import init_parser
+from spacy_conll.formatter import ConllFormatter
+from spacy_conll.parser import ConllParser
+
+
+def test_default_levels():
+    formatter = ConllFormatter()
+    assert formatter.levels == ["doc", "sent", "token"]
+    assert formatter.representations == ["conll", "conll_str", "conll_pd"]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_doc_level_only(spacy_annotated_doc: Doc, lazy: bool):
+    # Extensions are registered globally, so first collect the values of all levels
+    doc = ConllFormatter(include_headers=True)(spacy_annotated_doc.copy())
+    full_conll_str = doc._.conll_str
+    full_size = len(pickle.dumps(doc.user_data))
+
+    formatter = ConllFormatter(include_headers=True, lazy=lazy, levels=["doc"], representations=["conll_str"])
+    doc = formatter(spacy_annotated_doc)
+
+    assert doc._.conll_str == full_conll_str
+    assert list(doc.sents)[0]._.conll_str is None
+    assert doc[0]._.conll_str is None
+    # Only a handful of values are stored in the Doc
+    assert len(doc.user_data) <= 2
+    assert len(pickle.dumps(doc.user_data)) < full_size / 5
+
+
+def test_sent_level_str(spacy_annotated_doc: Doc):
+    doc = ConllFormatter(include_headers=True)(spacy_annotated_doc.copy())
+    sents_conll_str = [sent._.conll_str for sent in doc.sents]
+
+    doc = ConllFormatter(include_headers=True, levels=["sent"], representations=["conll_str"])(spacy_annotated_doc)
+    assert [sent._.conll_str for sent in doc.sents] == sents_conll_str
+    assert doc._.conll_str is None
+    assert doc[0]._.conll_str is None
+
+
+def test_token_level_pd(spacy_annotated_doc: Doc):
+    doc = ConllFormatter(levels=["token"], representations=["conll_pd"])(spacy_annotated_doc)
+    assert isinstance(doc[2]._.conll_pd, Series)
+    assert doc[2]._.conll_pd["LEMMA"] == "cookie"
+    assert not Doc.has_extension("conll_pd")
+    assert not Token.has_extension("conll")
+
+
+def test_representations_dicts(spacy_annotated_doc: Doc):
+    doc = ConllFormatter(representations=["conll"])(spacy_annotated_doc)
+    assert len(doc._.conll) == 2
+    assert len(list(doc.sents)[1]._.conll) == 3
+    assert doc[2]._.conll["LEMMA"] == "cookie"
+    assert not Doc.has_extension("conll_str")
+    assert not Doc.has_extension("conll_pd")
+
+
+def test_parser_levels():
+    text = "I like cookies.\nWhat about you?"
+    expected = ConllParser(
+        init_parser("blank:en", "spacy", disable_sbd=True, include_headers=True)
+    ).parse_text_as_conll(text)
+
+    nlp = init_parser(
+        "blank:en", "spacy", disable_sbd=True, include_headers=True, levels=["sent"], representations=["conll_str"]
+    )
+    assert ConllParser(nlp).parse_text_as_conll(text) == expected
+
+    nlp = init_parser("blank:en", "spacy", disable_sbd=True, levels=["doc"])
+    with pytest.raises(ValueError):
+        ConllParser(nlp).parse_text_as_conll(text)
+
+
+@pytest.mark.parametrize("option", ["levels", "representations"])
+def test_invalid_levels(option: str):
+    with pytest.raises(ValueError):
+        ConllFormatter(**{option: ["paragraph"]})
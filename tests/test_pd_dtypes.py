@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from pandas import CategoricalDtype
+from spacy.tokens import Doc
+from spacy_conll.formatter import PD_DTYPES_PRESETS, UD_UPOS_TAGS, ConllFormatter
+
+
+def test_pd_dtypes_compact(spacy_annotated_doc: Doc):
+    doc = ConllFormatter(pd_dtypes="compact", field_names={"UPOS": "upostag"})(spacy_annotated_doc)
+    dtypes = doc._.conll_pd.dtypes
+    assert isinstance(dtypes["upostag"], CategoricalDtype)
+    assert isinstance(dtypes["DEPREL"], CategoricalDtype)
+    assert dtypes["ID"].itemsize == 1
+    assert dtypes["HEAD"].itemsize == 1
+
+    for sent in doc.sents:
+        assert isinstance(sent._.conll_pd.dtypes["DEPREL"], CategoricalDtype)
+
+    for token in doc:
+        assert token._.conll_pd.to_dict() == token._.conll
+
+
+def test_pd_dtypes_dict(spacy_annotated_doc: Doc):
+    doc = ConllFormatter(pd_dtypes={"FORM": "string", "HEAD": "int32"})(spacy_annotated_doc)
+    dtypes = doc._.conll_pd.dtypes
+    assert dtypes["FORM"] == "string"
+    assert dtypes["HEAD"] == "int32"
+
+
+def test_pd_dtypes_concat(spacy_annotated_doc: Doc):
+    categories = {
+        "XPOS": [".", "NNS", "PRP", "RB", "VBP"],
+        "DEPREL": ["ROOT", "advmod", "dobj", "nsubj", "punct", "root"],
+        "FEATS": ["_", "Case=Acc", "Case=Nom|Person=1", "Number=Plur", "Tense=Pres"],
+    }
+    formatter = ConllFormatter(pd_dtypes={**PD_DTYPES_PRESETS["compact"], **categories})
+    first_doc = formatter(spacy_annotated_doc.copy())
+    # The second Doc has other values in every column
+    second_doc = formatter(spacy_annotated_doc[:3].as_doc())
+    conll_pd = pd.concat([first_doc._.conll_pd, second_doc._.conll_pd], ignore_index=True)
+    for field_name in ["UPOS", "XPOS", "DEPREL", "FEATS", "MISC"]:
+        assert isinstance(conll_pd.dtypes[field_name], CategoricalDtype)
+    assert list(conll_pd.dtypes["UPOS"].categories) == UD_UPOS_TAGS + ["SPACE", "_"]
+
+    # Values that are not in the categories are added to them
+    doc = ConllFormatter(pd_dtypes={"UPOS": ["NOUN"]})(spacy_annotated_doc)
+    assert list(doc._.conll_pd.dtypes["UPOS"].categories) == ["NOUN", "ADV", "PRON", "PUNCT", "VERB"]
+    assert not doc._.conll_pd["UPOS"].isna().any()
+
+
+def test_pd_dtypes_invalid():
+    with pytest.raises(ValueError):
+        ConllFormatter(pd_dtypes="tiny")
+
+    with pytest.raises(KeyError):
+        ConllFormatter(pd_dtypes={"upostag": "category"})
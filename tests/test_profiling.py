@@ -0,0 +1,66 @@
+import pytest
+from spacy_conll.cache import ConllCache
+from spacy_conll.parser import ConllParser
+from spacy_conll.profiling import ConllStats
+
+
+TEXT = "I like cookies.\nWhat about you?\nI like cookies."
+
+
+def test_stats_default(blank_conllparser):
+    assert blank_conllparser.stats is None
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_stats_stages(blank_conllparser, use_cache):
+    stats = ConllStats()
+    parser = ConllParser(blank_conllparser.nlp, cache=ConllCache() if use_cache else None, stats=stats)
+    assert parser.parse_text_as_conll(TEXT) == blank_conllparser.parse_text_as_conll(TEXT)
+
+    assert (stats.n_lines, stats.n_chars, stats.n_sents, stats.n_tokens) == (3, 45, 3, 12)
+    assert stats.stages["split"].n_calls == 1
+    assert stats.stages["pipe"].n_items == 3
+    assert stats.stages["format"].n_items == (2 if use_cache else 3)
+    if use_cache:
+        # The repeated line comes from the cache and only needs new headers
+        assert stats.stages["renumber"].n_items == 1
+    assert all(stage.wall_time >= 0 and stage.cpu_time >= 0 for stage in stats.stages.values())
+
+    stats_dict = stats.to_dict()
+    assert stats_dict["n_tokens"] == 12
+    assert list(stats_dict["stages"])[:2] == ["split", "pipe"]
+    assert "3 lines, 45 characters, 3 sentences and 12 tokens" in stats.get_report()
+
+
+def test_stats_parse_texts(blank_conllparser):
+    stats = ConllStats()
+    parser = ConllParser(blank_conllparser.nlp, stats=stats)
+    parser.parse_texts_as_conll([TEXT, "Hello there."])
+    assert (stats.n_lines, stats.n_sents, stats.n_tokens) == (4, 4, 15)
+    assert stats.stages["pipe"].n_items == 4
+
+
+def test_stats_write(blank_conllparser, tmp_path):
+    input_file = tmp_path.joinpath("input.txt")
+    input_file.write_text(TEXT, encoding="utf-8")
+    stats = ConllStats()
+    parser = ConllParser(blank_conllparser.nlp, stats=stats)
+    parser.parse_files_as_conll([(input_file, tmp_path.joinpath("output.conllu"))], "utf-8", "utf-8")
+    assert stats.stages["write"].n_items == 3
+
+
+def test_stats_profile_and_hooks(blank_conllparser):
+    entered = []
+
+    class Hook:
+        def __enter__(self):
+            entered.append("format")
+
+        def __exit__(self, *args):
+            return False
+
+    stats = ConllStats(profile_stages=["format"], stage_hooks={"format": Hook})
+    ConllParser(blank_conllparser.nlp, stats=stats).parse_text_as_conll(TEXT)
+    assert entered == ["format"] * 3
+    assert list(stats.profiles) == ["format"]
+    assert "cProfile of stage 'format'" in stats.get_profile_report(limit=5)
@@ -0,0 +1,92 @@
+import socket
+import threading
+import time
+
+import pytest
+from spacy_conll import init_parser
+from spacy_conll.parser import ConllParser
+from spacy_conll.server import ConllServerMixin, parse_address, parse_with_server
+
+
+INIT_KWARGS = {"model_or_lang": "blank:en", "parser": "spacy", "disable_sbd": True, "include_headers": True}
+
+
+def test_parse_address():
+    assert parse_address("localhost:8080")[1] == ("localhost", 8080)
+    assert parse_address(":8080")[1] == ("localhost", 8080)
+    assert parse_address("/tmp/conll.sock")[1] == "/tmp/conll.sock"
+
+
+def test_server_parse(conll_server_address):
+    text = "I like cookies.\nWhat about you?"
+    parser = ConllParser(init_parser("blank:en", "spacy", disable_sbd=True, include_headers=True))
+
+    assert parse_with_server(conll_server_address, text, INIT_KWARGS) == parser.parse_text_as_conll(text)
+    # Second request uses the parser that is already loaded
+    assert parse_with_server(conll_server_address, text, INIT_KWARGS) == parser.parse_text_as_conll(text)
+    assert parse_with_server(
+        conll_server_address, text, INIT_KWARGS, {"no_split_on_newline": True}
+    ) == parser.parse_text_as_conll(text, no_split_on_newline=True)
+
+
+def test_server_concurrent_requests(conll_server_address):
+    texts = [f"Sentence number {idx}.\nAnother one." for idx in range(8)]
+    results = [None] * len(texts)
+
+    def request(idx):
+        results[idx] = parse_with_server(conll_server_address, texts[idx], INIT_KWARGS)
+
+    threads = [threading.Thread(target=request, args=(idx,)) for idx in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for idx, conll in enumerate(results):
+        assert f"# text = Sentence number {idx}." in conll
+
+
+def test_server_error(conll_server_address):
+    with pytest.raises(RuntimeError):
+        parse_with_server(conll_server_address, "Hello", INIT_KWARGS, {"n_process": 2})
+
+
+def test_no_server(tmp_path):
+    assert parse_with_server(str(tmp_path.joinpath("missing.sock")), "Hello", INIT_KWARGS) is None
+
+
+def test_server_timeout(tmp_path):
+    # The connection is queued, but the server never responds
+    address = str(tmp_path.joinpath("stuck.sock"))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stuck_server:
+        stuck_server.bind(address)
+        stuck_server.listen()
+        assert parse_with_server(address, "Hello", INIT_KWARGS, timeout=0.1) is None
+
+
+def test_server_loads_parsers_independently(monkeypatch):
+    loading = threading.Event()
+    loaded = threading.Event()
+
+    def init_slow_parser(model_or_lang, **kwargs):
+        if model_or_lang == "slow":
+            loading.set()
+            loaded.wait(5)
+            model_or_lang = "blank:en"
+        return init_parser(model_or_lang, **kwargs)
+
+    monkeypatch.setattr("spacy_conll.server.init_parser", init_slow_parser)
+    server = ConllServerMixin()
+    server.init_parsers()
+
+    slow_thread = threading.Thread(target=server.get_parser, args=({**INIT_KWARGS, "model_or_lang": "slow"},))
+    slow_thread.start()
+    loading.wait(5)
+    # Other parsers can be loaded and used while a parser is being loaded
+    start = time.perf_counter()
+    server.get_parser(INIT_KWARGS)
+    assert time.perf_counter() - start < 2
+    assert not loaded.is_set()
+    loaded.set()
+    slow_thread.join()
+    assert len(server.parsers) == 2
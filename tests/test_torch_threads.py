@@ -0,0 +1,93 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+import spacy
+from spacy_conll import init_parser
+from spacy_conll.parser import ConllParser
+from spacy_conll.utils import get_torch_num_threads, set_torch_threads
+
+
+@pytest.fixture
+def fake_torch(monkeypatch):
+    torch = SimpleNamespace(num_threads=8, num_interop_threads=8)
+    torch.get_num_threads = lambda: torch.num_threads
+    torch.set_num_threads = lambda n: setattr(torch, "num_threads", n)
+    torch.get_num_interop_threads = lambda: torch.num_interop_threads
+    torch.set_num_interop_threads = lambda n: setattr(torch, "num_interop_threads", n)
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    return torch
+
+
+def test_set_torch_threads(fake_torch):
+    set_torch_threads(3, 2)
+    assert (fake_torch.num_threads, fake_torch.num_interop_threads) == (3, 2)
+
+    # None keeps the current settings
+    set_torch_threads()
+    assert (fake_torch.num_threads, fake_torch.num_interop_threads) == (3, 2)
+
+
+@pytest.mark.parametrize("n_process", [1, 2, 4 * (os.cpu_count() or 1)])
+def test_set_torch_threads_auto(fake_torch, n_process):
+    set_torch_threads("auto", n_process=n_process)
+    assert fake_torch.num_threads == max(1, (os.cpu_count() or 1) // n_process)
+
+
+def test_set_torch_threads_invalid(fake_torch):
+    with pytest.raises(ValueError):
+        set_torch_threads("all")
+
+
+def test_set_torch_threads_without_torch(monkeypatch):
+    monkeypatch.delitem(sys.modules, "torch", raising=False)
+    # Does not import torch
+    set_torch_threads(2, 2)
+    assert "torch" not in sys.modules
+
+
+def test_init_parser_torch_threads(fake_torch):
+    init_parser("blank:en", "spacy", torch_threads=2, torch_interop_threads=1)
+    assert (fake_torch.num_threads, fake_torch.num_interop_threads) == (2, 1)
+
+
+def test_init_parser_torch_threads_before_loading(fake_torch, monkeypatch):
+    load = spacy.load
+    threads_at_load = []
+
+    def load_spy(*args, **kwargs):
+        threads_at_load.append((fake_torch.num_threads, fake_torch.num_interop_threads))
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(spacy, "load", load_spy)
+    init_parser("blank:en", "spacy", torch_threads=2, torch_interop_threads=1)
+    assert threads_at_load == [(2, 1)]
+
+
+def test_get_torch_num_threads():
+    n_cores = os.cpu_count() or 1
+    assert get_torch_num_threads(None) is None
+    assert get_torch_num_threads(3, n_process=2) == 3
+    assert get_torch_num_threads("auto", n_process=2) == max(1, n_cores // 2)
+    assert get_torch_num_threads("auto", n_process=-1) == 1
+
+
+@pytest.mark.parametrize("torch_threads,expected", [(None, max(1, (os.cpu_count() or 1) // 2)), (3, 3)])
+def test_pipe_torch_threads(fake_torch, monkeypatch, torch_threads, expected):
+    init_kwargs = {"model_or_lang": "blank:en", "parser": "spacy", "disable_sbd": True, "torch_threads": torch_threads}
+    parser = ConllParser(init_parser(**init_kwargs), init_kwargs=init_kwargs)
+    fake_torch.num_threads = 8
+    pipe = parser.nlp.pipe
+    threads_in_pipe = []
+
+    def pipe_spy(lines, **kwargs):
+        # Like nlp.pipe(), processes are only started when the iteration starts
+        threads_in_pipe.append((fake_torch.num_threads, os.environ.get("OMP_NUM_THREADS")))
+        yield from pipe(lines, **{**kwargs, "n_process": 1})
+
+    monkeypatch.setattr(parser.nlp, "pipe", pipe_spy)
+    # The processes of nlp.pipe() divide the cores among them, like the workers of the "pool" backend
+    list(parser.iter_lines_as_conll(["Hello."], n_process=2, ignore_pipe_errors=True))
+    assert threads_in_pipe == [(expected, str(expected))]
+    assert fake_torch.num_threads == 8